@@ -1,77 +1,178 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request, jsonify, stream_with_context
+import atexit
 import json
-from datetime import datetime
+import os
+import threading
+
+import web_api
+from live_results import ResultsBroadcaster, ResultsCache, STREAM_MAX_RATE
+from pipeline import ingest_ndjson
+from voting_system import VotingSystem
 
 app = Flask(__name__)
 
-# Données de démonstration
-candidats = {
-    "candidat_A": {"nom": "Alice Martin", "parti": "Parti Progrès"},
-    "candidat_B": {"nom": "Bob Dupont", "parti": "Union Démocratique"},
-    "candidat_C": {"nom": "Charlie Leroy", "parti": "Écologie Active"}
-}
+DEBUG = os.environ.get('FLASK_DEBUG') == '1'
+# Base partagée par tous les workers: SQLite (WAL) pour que plusieurs processus
+# voient les mêmes électeurs, réservations et décomptes
+DB_FILE = os.environ.get('VOTE_DB', 'votes_web.db')
+# Mises à jour par seconde au plus sur /resultats/stream
+STREAM_RATE = float(os.environ.get('RESULTS_STREAM_RATE', STREAM_MAX_RATE))
+
+_system = None
+_results_cache = None
+_broadcaster = None
+_pipeline = None
+_system_lock = threading.Lock()
+
+
+def get_system():
+    """
+    Système de vote du processus (créé au premier appel, après un éventuel fork
+    du serveur). Les threads du worker le partagent; les bulletins sont validés
+    par groupes (un commit par groupe).
+    """
+    global _system, _results_cache, _broadcaster
+    if _system is None:
+        with _system_lock:
+            if _system is None:
+                system = VotingSystem(db_file=DB_FILE, backend='sqlite', group_commit=True,
+                                      hash_algorithm=os.environ.get('VOTE_HASH_ALGORITHM'))
+                atexit.register(system.close)
+                _results_cache = ResultsCache(system)
+                _broadcaster = ResultsBroadcaster(_results_cache, max_rate=STREAM_RATE)
+                atexit.register(_broadcaster.close)
+                _system = system
+    return _system
+
+
+def get_results_cache():
+    """Cache des résultats publiés du processus (voir live_results)"""
+    get_system()
+    return _results_cache
+
+
+def get_broadcaster():
+    """Diffuseur des résultats en direct du processus, partagé par tous les abonnés"""
+    get_system()
+    return _broadcaster
+
+
+def get_pipeline():
+    """
+    Pipeline d'ingestion du processus pour les envois groupés (créé au premier
+    envoi: pool de processus de vérification, VOTE_VERIFY_WORKERS processus)
+    """
+    global _pipeline
+    system = get_system()
+    if _pipeline is None:
+        with _system_lock:
+            if _pipeline is None:
+                workers = int(os.environ.get('VOTE_VERIFY_WORKERS', 0)) or None
+                _pipeline = system.create_pipeline(workers=workers)
+                atexit.register(_pipeline.close)
+    return _pipeline
+
+
+def _respond(response):
+    """(statut, données JSON) de web_api -> réponse Flask"""
+    status, data = response
+    return jsonify(data), status
+
+
+def _page(template):
+    return render_template(template, **web_api.page_context(get_system(), template))
 
-votes = {"candidat_A": 0, "candidat_B": 0, "candidat_C": 0, "blanc": 0}
 
 @app.route('/')
 def accueil():
     """Page d'accueil"""
-    return render_template('index.html', 
-                         candidats=candidats,
-                         total_votes=sum(votes.values()))
+    return _page('index.html')
+
+@app.route('/vote')
+def page_vote():
+    """Page de vote"""
+    return _page('vote.html')
+
+@app.route('/results')
+def page_results():
+    """Page des résultats"""
+    return _page('results.html')
+
+@app.route('/admin')
+def page_admin():
+    """Page d'administration"""
+    return _page('admin.html')
 
 @app.route('/voter', methods=['POST'])
 def voter():
-    """Endpoint pour voter"""
-    try:
-        data = request.json
-        candidat = data.get('candidat')
-        
-        if candidat in votes:
-            votes[candidat] += 1
-            return jsonify({
-                "success": True,
-                "message": "Vote enregistré avec succès",
-                "transaction_id": f"TX{datetime.now().timestamp()}"
-            })
-        else:
-            votes['blanc'] += 1
-            return jsonify({
-                "success": True,
-                "message": "Vote blanc enregistré"
-            })
-            
-    except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 400
+    """
+    Endpoint pour voter avec un bulletin signé par le client
+    Corps: {hashed_id, vote_message, vote_hash, signature} (signature en base64)
+    """
+    return _respond(web_api.submit_signed_vote(get_system(), request.get_json(silent=True)))
+
+@app.route('/voter/batch', methods=['POST'])
+def voter_batch():
+    """
+    Envoi groupé de bulletins signés (bureaux de vote hors ligne)
+    Corps: NDJSON, un bulletin {hashed_id, vote_message, vote_hash, signature} par ligne,
+    lu au fur et à mesure. Réponse NDJSON diffusée: un statut par ligne, dans l'ordre,
+    puis le bilan {done, accepted, rejected}.
+    """
+    statuses = ingest_ndjson(get_pipeline(), request.stream)
+    body = (json.dumps(status, ensure_ascii=False) + '\n' for status in statuses)
+    return app.response_class(stream_with_context(body), mimetype='application/x-ndjson')
 
 @app.route('/resultats')
 def resultats():
-    """Afficher les résultats"""
-    return jsonify({
-        "resultats": votes,
-        "total": sum(votes.values()),
-        "timestamp": datetime.now().isoformat()
-    })
+    """Afficher les résultats (304 si If-None-Match porte l'ETag courant)"""
+    status, body, headers = web_api.published_results(get_results_cache(),
+                                                      request.headers.get('If-None-Match'))
+    return app.response_class(body, status=status, mimetype='application/json', headers=headers)
+
+@app.route('/resultats/stream')
+def resultats_stream():
+    """
+    Résultats en direct (Server-Sent Events): état complet puis un écart par
+    nouvelle version du décompte. Reprise après coupure avec Last-Event-ID.
+    """
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('lastEventId')
+    return app.response_class(
+        get_broadcaster().stream(last_event_id),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/api/vote', methods=['POST'])
+def api_vote():
+    """Vote signé côté serveur avec la clé privée de l'électeur: {voter_id, private_key, candidate}"""
+    return _respond(web_api.vote(get_system(), request.get_json(silent=True)))
+
+@app.route('/api/register', methods=['POST'])
+def api_register():
+    """Enregistre un électeur: {voter_id} -> clé privée à remettre à l'électeur"""
+    return _respond(web_api.register(get_system(), request.get_json(silent=True)))
+
+@app.route('/api/add_candidate', methods=['POST'])
+def api_add_candidate():
+    """Ajoute un candidat: {candidate_name}"""
+    return _respond(web_api.add_candidate(get_system(), request.get_json(silent=True)))
+
+@app.route('/api/stats')
+def api_stats():
+    """Statistiques de l'élection"""
+    return _respond(web_api.stats(get_system()))
+
+@app.route('/api/verify')
+def api_verify():
+    """Contrôle d'intégrité (compteurs, un bulletin par électeur, racine de Merkle)"""
+    return _respond(web_api.verify(get_system()))
 
 @app.route('/api/demonstration')
 def demonstration():
     """Mode démonstration API"""
-    return jsonify({
-        "etapes": [
-            "1. Initialisation du système sécurisé",
-            "2. Authentification biométrique",
-            "3. Vote chiffré",
-            "4. Enregistrement blockchain",
-            "5. Calcul décentralisé"
-        ],
-        "simulation": {
-            "electeurs": 1000,
-            "votes_valides": 950,
-            "votes_blancs": 50,
-            "participations": "95%"
-        }
-    })
+    return _respond(web_api.demonstration())
 
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 8080))
-    app.run(host='0.0.0.0', port=port, debug=DEBUG)
+    app.run(host='0.0.0.0', port=port, debug=DEBUG, threaded=True)
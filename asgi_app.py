@@ -0,0 +1,462 @@
+"""
+Frontal web asyncio (ASGI) du système de vote, mêmes routes que app.py
+Validation et réponses JSON partagées avec app.py (web_api); seuls les flux
+(résultats en direct, envois groupés) sont écrits ici pour la boucle asyncio.
+La boucle ne fait jamais de calcul cryptographique ni d'écriture:
+- bulletins signés: vérification dans le pool de processus du pipeline
+  d'ingestion, la réponse attend la validation groupée (durable) sans bloquer
+- enregistrement, vote signé côté serveur, lectures de la base: pool de threads
+- résultats en direct: le diffuseur de live_results réveille la boucle à chaque
+  diffusion, un abonné SSE ne coûte qu'une tâche en attente
+Un processus tient ainsi de nombreux clients lents et abonnés SSE pendant que
+la vérification occupe tous les cœurs.
+
+Usage (n'importe quel serveur ASGI 3, non inclus dans requirements.txt):
+    pip install -r requirements-asgi.txt
+    uvicorn asgi_app:app --host 0.0.0.0 --port 8080
+    hypercorn asgi_app:app --bind 0.0.0.0:8080
+"""
+
+import asyncio
+import json
+import os
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from urllib.parse import parse_qsl
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+import web_api
+from live_results import KEEPALIVE, ResultsBroadcaster, ResultsCache, STREAM_MAX_RATE
+from pipeline import BATCH_WINDOW, parse_ballot_line
+from voting_system import VotingSystem
+
+DB_FILE = os.environ.get('VOTE_DB', 'votes_web.db')
+STREAM_RATE = float(os.environ.get('RESULTS_STREAM_RATE', STREAM_MAX_RATE))
+# Threads pour les appels bloquants (base, génération de clés, vote signé côté serveur)
+IO_THREADS = int(os.environ.get('VOTE_IO_THREADS', 32))
+# Taille maximale d'un corps JSON (les envois groupés sont lus en flux, sans limite)
+MAX_JSON_BODY = 1 << 20
+
+_templates = Environment(
+    loader=FileSystemLoader(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')),
+    autoescape=select_autoescape(['html'])
+)
+_executor = ThreadPoolExecutor(max_workers=IO_THREADS, thread_name_prefix='vote-io')
+
+_system = None
+_results_cache = None
+_broadcaster = None
+_publications = None
+_pipeline = None
+_system_lock = threading.Lock()
+
+
+class Publications:
+    """Réveil des abonnés SSE de la boucle à chaque diffusion du décompte"""
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.event = asyncio.Event()
+
+    def notify(self):
+        """Appelé par le fil de diffusion"""
+        self.loop.call_soon_threadsafe(self._wake)
+
+    def _wake(self):
+        event, self.event = self.event, asyncio.Event()
+        event.set()
+
+
+def _start():
+    """Crée le système de vote du processus (bloquant: exécuté dans le pool de threads)"""
+    global _system, _results_cache, _broadcaster
+    with _system_lock:
+        if _system is None:
+            system = VotingSystem(db_file=DB_FILE, backend='sqlite', group_commit=True,
+                                  hash_algorithm=os.environ.get('VOTE_HASH_ALGORITHM'))
+            _results_cache = ResultsCache(system)
+            _broadcaster = ResultsBroadcaster(_results_cache, max_rate=STREAM_RATE)
+            _system = system
+    return _system
+
+
+def _start_pipeline():
+    """Pipeline d'ingestion du processus (pool de processus de vérification)"""
+    global _pipeline
+    with _system_lock:
+        if _pipeline is None:
+            workers = int(os.environ.get('VOTE_VERIFY_WORKERS', 0)) or None
+            _pipeline = _system.create_pipeline(workers=workers)
+    return _pipeline
+
+
+def _shutdown():
+    """Termine les bulletins en cours puis ferme la base"""
+    if _broadcaster is not None:
+        _broadcaster.close()
+    if _pipeline is not None:
+        _pipeline.close()
+    if _system is not None:
+        _system.close()
+
+
+async def _run(function, *args, **kwargs):
+    """Exécute un appel bloquant dans le pool de threads"""
+    return await asyncio.get_running_loop().run_in_executor(_executor, partial(function, *args, **kwargs))
+
+
+async def get_system():
+    """Système de vote du processus (créé au démarrage ou au premier appel)"""
+    global _publications
+    if _system is None:
+        await _run(_start)
+    if _publications is None:
+        _publications = Publications(asyncio.get_running_loop())
+        _broadcaster.add_listener(_publications.notify)
+    return _system
+
+
+async def get_pipeline():
+    await get_system()
+    if _pipeline is None:
+        await _run(_start_pipeline)
+    return _pipeline
+
+
+class Request:
+    """Requête HTTP ASGI: en-têtes, paramètres et corps lu à la demande"""
+
+    def __init__(self, scope, receive):
+        self.scope = scope
+        self.receive = receive
+        self.method = scope['method']
+        self.path = scope['path']
+        self.headers = {name.decode('latin-1').lower(): value.decode('latin-1')
+                        for name, value in scope.get('headers', [])}
+        self.query = dict(parse_qsl(scope.get('query_string', b'').decode('latin-1')))
+
+    async def stream(self):
+        """Morceaux du corps au fur et à mesure de leur arrivée"""
+        while True:
+            message = await self.receive()
+            if message['type'] == 'http.disconnect':
+                return
+            if message.get('body'):
+                yield message['body']
+            if not message.get('more_body'):
+                return
+
+    async def lines(self):
+        """Lignes du corps (octets, sans le saut de ligne) lues en flux"""
+        buffer = b''
+        async for chunk in self.stream():
+            buffer += chunk
+            *complete, buffer = buffer.split(b'\n')
+            for line in complete:
+                yield line
+        if buffer:
+            yield buffer
+
+    async def json(self):
+        """Corps JSON (None si absent, invalide ou trop grand)"""
+        body = b''
+        async for chunk in self.stream():
+            body += chunk
+            if len(body) > MAX_JSON_BODY:
+                return None
+        try:
+            return json.loads(body)
+        except ValueError:
+            return None
+
+
+class Response:
+    def __init__(self, body=b'', status=200, content_type='application/json', headers=None):
+        self.body = body.encode('utf-8') if isinstance(body, str) else body
+        self.status = status
+        self.headers = dict(headers or {})
+        if content_type:
+            self.headers['Content-Type'] = content_type
+
+    def _raw_headers(self):
+        return [(name.lower().encode('latin-1'), str(value).encode('latin-1'))
+                for name, value in self.headers.items()]
+
+    async def __call__(self, send, receive):
+        headers = self._raw_headers() + [(b'content-length', str(len(self.body)).encode('latin-1'))]
+        await send({'type': 'http.response.start', 'status': self.status, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': self.body})
+
+
+class StreamingResponse(Response):
+    """
+    Réponse envoyée au fur et à mesure (chunks: itérateur asynchrone d'octets)
+    watch_disconnect: arrête le flux dès que le client se déconnecte (flux sans fin)
+    """
+
+    def __init__(self, chunks, status=200, content_type='application/json', headers=None,
+                 watch_disconnect=False):
+        super().__init__(b'', status, content_type, headers)
+        self.chunks = chunks
+        self.watch_disconnect = watch_disconnect
+
+    async def _stream(self, send):
+        async for chunk in self.chunks:
+            await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+        await send({'type': 'http.response.body', 'body': b''})
+
+    async def __call__(self, send, receive):
+        await send({'type': 'http.response.start', 'status': self.status, 'headers': self._raw_headers()})
+        if not self.watch_disconnect:
+            await self._stream(send)
+            return
+        streaming = asyncio.ensure_future(self._stream(send))
+        disconnected = asyncio.ensure_future(_wait_disconnect(receive))
+        done, pending = await asyncio.wait({streaming, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        if streaming in done:
+            streaming.result()
+
+
+async def _wait_disconnect(receive):
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+
+def json_response(data, status=200, headers=None):
+    return Response(json.dumps(data, ensure_ascii=False), status, headers=headers)
+
+
+def _respond(status, data):
+    """(statut, données JSON) de web_api -> réponse"""
+    return json_response(data, status)
+
+
+async def _page(template):
+    context = await _run(web_api.page_context, await get_system(), template)
+    return Response(_templates.get_template(template).render(**context), content_type='text/html; charset=utf-8')
+
+
+async def accueil(request):
+    """Page d'accueil"""
+    return await _page('index.html')
+
+
+async def page_vote(request):
+    """Page de vote"""
+    return await _page('vote.html')
+
+
+async def page_results(request):
+    """Page des résultats"""
+    return await _page('results.html')
+
+
+async def page_admin(request):
+    """Page d'administration"""
+    return await _page('admin.html')
+
+
+async def _submit_ballot(pipeline, ballot):
+    """
+    Confie un bulletin signé au pipeline (vérification dans un processus, écriture groupée)
+    Retourne: future asyncio -> (success, message), résolue une fois le bulletin sur disque
+    """
+    try:
+        future = pipeline.submit(*ballot, timeout=0)
+    except queue.Full:
+        # File d'entrée pleine: attente hors de la boucle
+        future = await _run(pipeline.submit, *ballot)
+    return asyncio.wrap_future(future)
+
+
+async def voter(request):
+    """
+    Vote avec un bulletin signé par le client
+    Corps: {hashed_id, vote_message, vote_hash, signature} (signature en base64)
+    """
+    values, error = web_api.signed_ballot(await request.json())
+    if error:
+        return _respond(*error)
+    success, message = await (await _submit_ballot(await get_pipeline(), values))
+    return _respond(*web_api.result(success, message))
+
+
+async def voter_batch(request):
+    """
+    Envoi groupé de bulletins signés (voir pipeline.ingest_ndjson)
+    Corps NDJSON lu en flux; réponse NDJSON: un statut par ligne, dans l'ordre, puis le bilan.
+    """
+    pipeline = await get_pipeline()
+
+    async def statuses():
+        in_flight = deque()
+        counts = {True: 0, False: 0}
+
+        def status(line_number, result):
+            success, message = result
+            counts[success] += 1
+            return (json.dumps({'line': line_number, 'success': success, 'message': message},
+                               ensure_ascii=False) + '\n').encode('utf-8')
+
+        line_number = 0
+        async for line in request.lines():
+            line_number += 1
+            if not line.strip():
+                continue
+            ballot, error = parse_ballot_line(line)
+            if error:
+                result = asyncio.get_running_loop().create_future()
+                result.set_result((False, error))
+            else:
+                result = await _submit_ballot(pipeline, ballot)
+            in_flight.append((line_number, result))
+            while in_flight and (in_flight[0][1].done() or len(in_flight) >= BATCH_WINDOW):
+                number, result = in_flight.popleft()
+                yield status(number, await result)
+
+        while in_flight:
+            number, result = in_flight.popleft()
+            yield status(number, await result)
+        yield (json.dumps({'done': True, 'accepted': counts[True], 'rejected': counts[False]}) + '\n').encode('utf-8')
+
+    return StreamingResponse(statuses(), content_type='application/x-ndjson')
+
+
+async def resultats(request):
+    """Afficher les résultats (304 si If-None-Match porte l'ETag courant)"""
+    await get_system()
+    status, body, headers = await _run(web_api.published_results, _results_cache,
+                                       request.headers.get('if-none-match'))
+    return Response(body, status, content_type='application/json' if status == 200 else None, headers=headers)
+
+
+async def resultats_stream(request):
+    """
+    Résultats en direct (Server-Sent Events): état complet puis un écart par
+    nouvelle version du décompte. Reprise après coupure avec Last-Event-ID.
+    """
+    await get_system()
+    broadcaster = _broadcaster
+    last_event_id = request.headers.get('last-event-id') or request.query.get('lastEventId')
+    cursor, backlog = await _run(broadcaster.resume, last_event_id)
+
+    async def events():
+        nonlocal cursor
+        with broadcaster.subscription():
+            yield broadcaster.retry_field()
+            for chunk in backlog:
+                yield chunk
+            while not broadcaster.closed:
+                # Événement pris avant de lire l'historique: aucune diffusion manquée
+                published = _publications.event
+                cursor, chunks = broadcaster.pending(cursor)
+                if chunks:
+                    for chunk in chunks:
+                        yield chunk
+                    continue
+                try:
+                    await asyncio.wait_for(published.wait(), broadcaster.heartbeat)
+                except asyncio.TimeoutError:
+                    yield KEEPALIVE
+
+    return StreamingResponse(events(), content_type='text/event-stream',
+                             headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+                             watch_disconnect=True)
+
+
+async def _api(action, request):
+    """Action de web_api sur le corps JSON, exécutée dans le pool de threads"""
+    data = await request.json()
+    return _respond(*await _run(action, await get_system(), data))
+
+
+async def api_vote(request):
+    """Vote signé côté serveur avec la clé privée de l'électeur: {voter_id, private_key, candidate}"""
+    return await _api(web_api.vote, request)
+
+
+async def api_register(request):
+    """Enregistre un électeur: {voter_id} -> clé privée à remettre à l'électeur"""
+    return await _api(web_api.register, request)
+
+
+async def api_add_candidate(request):
+    """Ajoute un candidat: {candidate_name}"""
+    return await _api(web_api.add_candidate, request)
+
+
+async def api_stats(request):
+    """Statistiques de l'élection"""
+    return _respond(*await _run(web_api.stats, await get_system()))
+
+
+async def api_verify(request):
+    """Contrôle d'intégrité (compteurs, un bulletin par électeur, racine de Merkle)"""
+    return _respond(*await _run(web_api.verify, await get_system()))
+
+
+async def demonstration(request):
+    """Mode démonstration API"""
+    return _respond(*web_api.demonstration())
+
+
+ROUTES = {
+    ('GET', '/'): accueil,
+    ('GET', '/vote'): page_vote,
+    ('GET', '/results'): page_results,
+    ('GET', '/admin'): page_admin,
+    ('POST', '/voter'): voter,
+    ('POST', '/voter/batch'): voter_batch,
+    ('GET', '/resultats'): resultats,
+    ('GET', '/resultats/stream'): resultats_stream,
+    ('POST', '/api/vote'): api_vote,
+    ('POST', '/api/register'): api_register,
+    ('POST', '/api/add_candidate'): api_add_candidate,
+    ('GET', '/api/stats'): api_stats,
+    ('GET', '/api/verify'): api_verify,
+    ('GET', '/api/demonstration'): demonstration,
+}
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            try:
+                await get_system()
+            except Exception as e:
+                await send({'type': 'lifespan.startup.failed', 'message': str(e)})
+                return
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await _run(_shutdown)
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def app(scope, receive, send):
+    """Application ASGI 3"""
+    if scope['type'] == 'lifespan':
+        await _lifespan(receive, send)
+        return
+    if scope['type'] != 'http':
+        return
+    request = Request(scope, receive)
+    handler = ROUTES.get((request.method, request.path))
+    if handler is None:
+        allowed = [method for method, path in ROUTES if path == request.path]
+        if allowed:
+            response = json_response({"message": "Méthode non autorisée"}, 405,
+                                     headers={'Allow': ', '.join(allowed)})
+        else:
+            response = json_response({"message": "Page introuvable"}, 404)
+    else:
+        response = await handler(request)
+    await response(send, receive)
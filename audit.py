@@ -0,0 +1,210 @@
+"""
+Audit post-électoral: re-vérification complète du registre des votes
+Chaque bulletin est re-haché et sa signature revérifiée avec la clé publique
+enregistrée de l'électeur. Le travail est réparti sur un pool de processus.
+
+Usage: python audit.py votes.json [--workers N] [--checkpoint audit.ckpt] [--report audit.json]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime
+
+from database import open_database
+from hash import DEFAULT_HASH_ALGORITHM
+from signature import DEFAULT_SIGNATURE_SCHEME
+from verification import verify_ballot
+
+
+def _verify_chunk(start, ballots, hash_algorithm):
+    """
+    Vérifie un lot de bulletins (exécuté dans un processus du pool)
+    Entrée: ballots = liste de (voter_hash, vote_message, vote_hash, signature_b64,
+                                public_key_pem, signature_scheme)
+    Retourne: (start, nombre vérifié, liste des échecs)
+    """
+    failures = []
+    for offset, (voter_hash, vote_message, vote_hash, signature_b64,
+                 public_key_pem, signature_scheme) in enumerate(ballots):
+        valid, reason = verify_ballot(vote_message, vote_hash, signature_b64, public_key_pem,
+                                      hash_algorithm, signature_scheme or DEFAULT_SIGNATURE_SCHEME)
+        if not valid:
+            failures.append({'index': start + offset, 'voter_hash': voter_hash, 'reason': reason})
+    return start, len(ballots), failures
+
+
+def _print_progress(checked, total):
+    percentage = (checked / total * 100) if total else 100
+    print(f"🔍 Audit: {checked}/{total} bulletins vérifiés ({percentage:.1f}%)")
+
+
+class LedgerAudit:
+    """Re-vérification parallèle et reprenable du registre des votes"""
+
+    def __init__(self, db, hash_algorithm='sha256', workers=None, chunk_size=500,
+                 checkpoint_file=None, progress=_print_progress):
+        """
+        Entrée:
+            - db: base de données (VotingDatabase ou SQLiteVotingDatabase)
+            - hash_algorithm (str): Algorithme de hachage de l'élection
+            - workers (int): Nombre de processus (défaut: tous les cœurs)
+            - chunk_size (int): Nombre de bulletins par tâche
+            - checkpoint_file (str): Fichier de reprise (None: pas de reprise)
+            - progress (callable): Appelée avec (vérifiés, total) après chaque lot
+        """
+        self.db = db
+        self.hash_algorithm = hash_algorithm
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.checkpoint_file = checkpoint_file
+        self.progress = progress
+        self.completed_chunks = set()
+        self.failures = []
+        self.checked = 0
+
+    def _load_checkpoint(self):
+        if not self.checkpoint_file or not os.path.exists(self.checkpoint_file):
+            return
+        with open(self.checkpoint_file, 'r', encoding='utf-8') as f:
+            checkpoint = json.load(f)
+        # Les lots enregistrés ne sont valables qu'avec le même découpage
+        self.chunk_size = checkpoint['chunk_size']
+        self.completed_chunks = set(checkpoint['completed_chunks'])
+        self.failures = checkpoint['failures']
+        self.checked = checkpoint['checked']
+        print(f"↩️  Reprise de l'audit: {self.checked} bulletins déjà vérifiés")
+
+    def _save_checkpoint(self):
+        if not self.checkpoint_file:
+            return
+        tmp_file = self.checkpoint_file + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                'chunk_size': self.chunk_size,
+                'completed_chunks': sorted(self.completed_chunks),
+                'failures': self.failures,
+                'checked': self.checked
+            }, f)
+        os.replace(tmp_file, self.checkpoint_file)
+
+    def _chunks(self):
+        """Découpe le registre en lots (start, bulletins), en sautant les lots déjà faits"""
+        chunk = []
+        start = 0
+        for index, vote in enumerate(self.db.iter_votes()):
+            if index % self.chunk_size == 0:
+                if chunk:
+                    yield start, chunk
+                chunk = []
+                start = index
+            if start in self.completed_chunks:
+                continue
+            chunk.append((
+                vote['voter_hash'], vote['vote_message'], vote['vote_hash'],
+                vote['signature'], self.db.get_public_key(vote['voter_hash']),
+                self.db.get_signature_scheme(vote['voter_hash'])
+            ))
+        if chunk:
+            yield start, chunk
+
+    def run(self):
+        """
+        Lance l'audit complet
+        Retourne: rapport (dict) lisible par machine
+        """
+        started_at = datetime.now()
+        start_time = time.perf_counter()
+        self._load_checkpoint()
+        total = self.db.get_vote_count()
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            pending = set()
+            for start, chunk in self._chunks():
+                pending.add(pool.submit(_verify_chunk, start, chunk, self.hash_algorithm))
+                # Nombre borné de lots en vol: le registre n'est jamais chargé en entier
+                if len(pending) >= self.workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    self._collect(done, total)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                self._collect(done, total)
+
+        self.failures.sort(key=lambda failure: failure['index'])
+        report = {
+            'started_at': started_at.isoformat(),
+            'finished_at': datetime.now().isoformat(),
+            'duration_seconds': round(time.perf_counter() - start_time, 3),
+            'hash_algorithm': self.hash_algorithm,
+            'total_votes': total,
+            'checked': self.checked,
+            'valid': self.checked - len(self.failures),
+            'failed': len(self.failures),
+            'integrity_ok': not self.failures and self.checked == total,
+            'failures': self.failures
+        }
+        if self.checkpoint_file and os.path.exists(self.checkpoint_file):
+            os.remove(self.checkpoint_file)
+        return report
+
+    def _collect(self, done, total):
+        for future in done:
+            start, count, failures = future.result()
+            self.completed_chunks.add(start)
+            self.failures.extend(failures)
+            self.checked += count
+        self._save_checkpoint()
+        if self.progress:
+            self.progress(self.checked, total)
+
+
+def audit_ledger(db, hash_algorithm='sha256', workers=None, chunk_size=500,
+                 checkpoint_file=None, report_file=None, progress=_print_progress):
+    """
+    Re-vérifie tous les bulletins du registre et retourne le rapport d'audit
+    Le rapport est aussi écrit en JSON dans report_file s'il est fourni.
+    """
+    report = LedgerAudit(db, hash_algorithm, workers, chunk_size,
+                         checkpoint_file, progress).run()
+    if report_file:
+        with open(report_file, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=4, ensure_ascii=False)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Audit complet du registre des votes")
+    parser.add_argument('db_file', help="Base de données (votes.json ou votes.db)")
+    parser.add_argument('--workers', type=int, default=None, help="Nombre de processus")
+    parser.add_argument('--chunk-size', type=int, default=500, help="Bulletins par lot")
+    parser.add_argument('--checkpoint', default=None, help="Fichier de reprise")
+    parser.add_argument('--report', default='audit_report.json', help="Rapport JSON des échecs")
+    parser.add_argument('--hash', default=None, help="Algorithme de hachage (défaut: celui de l'élection)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db_file):
+        print(f"❌ Base introuvable: {args.db_file}")
+        sys.exit(1)
+
+    db = open_database(args.db_file)
+    hash_algorithm = args.hash or db.get_setting('hash_algorithm', DEFAULT_HASH_ALGORITHM)
+    report = audit_ledger(db, hash_algorithm, args.workers, args.chunk_size,
+                          args.checkpoint, args.report)
+
+    print("\n" + "="*60)
+    print("RAPPORT D'AUDIT")
+    print("="*60)
+    print(f"Bulletins vérifiés: {report['checked']}/{report['total_votes']}")
+    print(f"Valides: {report['valid']}")
+    print(f"Échecs: {report['failed']}")
+    print(f"Durée: {report['duration_seconds']} s")
+    print(f"Rapport écrit dans: {args.report}")
+    print("="*60)
+    sys.exit(0 if report['integrity_ok'] else 1)
+
+
+if __name__ == '__main__':
+    main()
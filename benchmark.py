@@ -0,0 +1,197 @@
+"""
+Mesures de performance du système de vote
+
+Usage:
+    python benchmark.py signatures [--iterations N]
+    python benchmark.py memory [--voters N]
+    python benchmark.py hashes [--count N]
+"""
+
+import argparse
+import base64
+import hashlib
+import os
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from compact_store import BallotStore, VoterStore, pem_to_der, der_to_pem
+from hash import HASH_ALGORITHMS, HashFunctions
+from signature import DEFAULT_SIGNATURE_SCHEME, SIGNATURE_SCHEMES, get_signature_scheme
+
+
+def _rate(function, iterations):
+    """Exécute function(i) iterations fois et retourne le nombre d'opérations par seconde"""
+    start = time.perf_counter()
+    for i in range(iterations):
+        function(i)
+    elapsed = time.perf_counter() - start
+    return iterations / elapsed if elapsed > 0 else float('inf')
+
+
+def bench_signatures(iterations=50):
+    """
+    Compare génération de clés, signature et vérification pour chaque schéma
+    Retourne: dict {schéma: {keygen_per_s, sign_per_s, verify_per_s, public_key_bytes, signature_bytes}}
+    """
+    message = "a" * 64  # même taille qu'un hash de vote SHA-256 en hexadécimal
+    results = {}
+    for name in SIGNATURE_SCHEMES:
+        scheme = get_signature_scheme(name)
+        keygen_iterations = max(1, iterations // 5) if name == 'rsa-pss' else iterations
+        key_pairs = []
+        keygen_rate = _rate(lambda i: key_pairs.append(scheme.generate_key_pair()), keygen_iterations)
+        private_key_pem, public_key_pem = key_pairs[0]
+        signatures = []
+        sign_rate = _rate(lambda i: signatures.append(scheme.sign(message, private_key_pem)), iterations)
+        verify_rate = _rate(lambda i: scheme.verify(message, signatures[i], public_key_pem), iterations)
+        results[name] = {
+            'keygen_per_s': keygen_rate,
+            'sign_per_s': sign_rate,
+            'verify_per_s': verify_rate,
+            'public_key_bytes': len(public_key_pem),
+            'signature_bytes': len(base64.b64encode(signatures[0]))
+        }
+    return results
+
+
+def bench_hashes(count=100000):
+    """
+    Débit de chaque algorithme de hachage sur des IDs d'électeurs
+    - single_per_s: un appel HashFunctions.hash par ID
+    - batch_per_s: HashFunctions.hash_many sur toute la série
+    - memoized_per_s: hash_voter_id sur des IDs déjà vus (cache LRU)
+    Retourne: dict {algorithme: {single_per_s, batch_per_s, memoized_per_s}}
+    """
+    voter_ids = [f"electeur-{i:08d}" for i in range(count)]
+    warm_ids = voter_ids[:1000]
+    results = {}
+    for name in HASH_ALGORITHMS:
+        single_rate = _rate(lambda i: HashFunctions.hash(voter_ids[i], name), count)
+        start = time.perf_counter()
+        HashFunctions.hash_many(voter_ids, name)
+        elapsed = time.perf_counter() - start
+        HashFunctions.clear_cache()
+        for voter_id in warm_ids:
+            HashFunctions.hash_voter_id(voter_id, name)
+        memoized_rate = _rate(lambda i: HashFunctions.hash_voter_id(warm_ids[i % 1000], name), count)
+        results[name] = {
+            'single_per_s': single_rate,
+            'batch_per_s': count / elapsed if elapsed > 0 else float('inf'),
+            'memoized_per_s': memoized_rate
+        }
+    HashFunctions.clear_cache()
+    return results
+
+
+def _traced(build):
+    """Octets alloués (et encore référencés) par build()"""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = build()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del kept
+    return after - before
+
+
+def bench_memory(voters=20000):
+    """
+    Mémoire des électeurs et des bulletins: dicts de l'instantané JSON vs compact_store
+    Les données sont synthétiques mais au format réel (clé publique du schéma par défaut,
+    signature de même taille, hashs SHA-256, horodatages ISO).
+    Retourne: dict {'voters': {...}, 'ballots': {...}} en octets par élément
+    """
+    scheme = get_signature_scheme(DEFAULT_SIGNATURE_SCHEME)
+    private_key_pem, public_key_pem = scheme.generate_key_pair()
+    signature_size = len(scheme.sign("a" * 64, private_key_pem))
+    der = pem_to_der(public_key_pem)
+    start = datetime(2026, 1, 1, 8)
+
+    def voter(i):
+        # Clé distincte par électeur: octets du milieu de la clé remplacés
+        key = der[:40] + hashlib.sha256(str(i).encode()).digest() + der[72:]
+        return (hashlib.sha256(f"voter-{i}".encode()).hexdigest(), der_to_pem(key),
+                (start + timedelta(microseconds=7919 * i + 1)).isoformat(), DEFAULT_SIGNATURE_SCHEME)
+
+    def ballot(i):
+        return {
+            'voter_hash': hashlib.sha256(f"voter-{i}".encode()).hexdigest(),
+            'vote_hash': hashlib.sha256(f"Je vote {i % 5}".encode()).hexdigest(),
+            'signature': base64.b64encode(os.urandom(signature_size)).decode('ascii'),
+            'timestamp': (start + timedelta(microseconds=7919 * i + 1)).isoformat(),
+            'candidate_id': i % 5
+        }
+
+    def voter_dicts():
+        data = {}
+        for i in range(voters):
+            hashed_id, pem, date, name = voter(i)
+            data[hashed_id] = {'public_key': pem, 'has_voted': i % 2 == 0,
+                               'registration_date': date, 'signature_scheme': name}
+        return data
+
+    def voter_store():
+        store = VoterStore()
+        for i in range(voters):
+            store.add(*voter(i), has_voted=i % 2 == 0)
+        return store
+
+    def ballot_store():
+        store = BallotStore()
+        for i in range(voters):
+            store.append(ballot(i))
+        return store
+
+    results = {}
+    for kind, before, after in (('voters', voter_dicts, voter_store),
+                                ('ballots', lambda: [ballot(i) for i in range(voters)], ballot_store)):
+        before_bytes = _traced(before) / voters
+        after_bytes = _traced(after) / voters
+        results[kind] = {'dict_bytes': before_bytes, 'compact_bytes': after_bytes,
+                         'ratio': before_bytes / after_bytes if after_bytes else float('inf')}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mesures de performance du système de vote")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    signatures = subparsers.add_parser('signatures', help="Comparer les schémas de signature")
+    signatures.add_argument('--iterations', type=int, default=50)
+
+    memory = subparsers.add_parser('memory', help="Mémoire par électeur et par bulletin")
+    memory.add_argument('--voters', type=int, default=20000)
+
+    hashes = subparsers.add_parser('hashes', help="Comparer les algorithmes de hachage")
+    hashes.add_argument('--count', type=int, default=100000)
+
+    args = parser.parse_args()
+
+    if args.command == 'signatures':
+        results = bench_signatures(args.iterations)
+        print(f"{'Schéma':<12} {'keygen/s':>10} {'sign/s':>10} {'verify/s':>10} "
+              f"{'clé PEM':>9} {'sig b64':>9}")
+        print("-" * 65)
+        for name, r in results.items():
+            print(f"{name:<12} {r['keygen_per_s']:>10.1f} {r['sign_per_s']:>10.1f} "
+                  f"{r['verify_per_s']:>10.1f} {r['public_key_bytes']:>9} {r['signature_bytes']:>9}")
+    elif args.command == 'memory':
+        results = bench_memory(args.voters)
+        print(f"📊 {args.voters} électeurs / bulletins (octets par élément)")
+        print(f"{'':<10} {'dicts':>10} {'compact':>10} {'gain':>7}")
+        print("-" * 40)
+        for kind, r in results.items():
+            print(f"{kind:<10} {r['dict_bytes']:>10.0f} {r['compact_bytes']:>10.0f} {r['ratio']:>6.1f}x")
+    elif args.command == 'hashes':
+        results = bench_hashes(args.count)
+        print(f"{'Algorithme':<12} {'unitaire/s':>12} {'lot/s':>12} {'mémorisé/s':>12}")
+        print("-" * 52)
+        for name, r in results.items():
+            print(f"{name:<12} {r['single_per_s']:>12.0f} {r['batch_per_s']:>12.0f} {r['memoized_per_s']:>12.0f}")
+
+
+if __name__ == '__main__':
+    main()
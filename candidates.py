@@ -0,0 +1,74 @@
+from hash import HashFunctions
+from vote import Voter
+
+
+class CandidateCatalog:
+    """
+    Catalogue des candidats de l'élection
+    - Identifiants entiers stables: un nom reçoit l'ID suivant à sa première apparition
+      et le garde (ajout seul), ce qui permet de ne stocker que l'ID dans chaque bulletin
+    - Recherche en O(1) par nom et par message de vote
+    - Message et hash de vote précalculés par candidat
+    """
+
+    def __init__(self, names=(), active=None):
+        """
+        Entrée:
+            - names (list): noms dans l'ordre de leurs IDs
+            - active (list): candidats proposés dans l'élection courante (défaut: tous)
+        """
+        self.names = []       # ID -> nom
+        self.ids = {}         # nom -> ID
+        self.messages = []    # ID -> "Je vote <candidat>"
+        self._by_message = {}
+        self._hashes = {}     # (ID, algorithme) -> hash du message
+        self._active = set()
+        for name in names:
+            self.add(name)
+        self.set_active(self.names if active is None else active)
+
+    def __len__(self):
+        return len(self.names)
+
+    def add(self, name):
+        """Ajoute un candidat s'il est inconnu; retourne son ID"""
+        candidate_id = self.ids.get(name)
+        if candidate_id is None:
+            candidate_id = len(self.names)
+            self.names.append(name)
+            self.ids[name] = candidate_id
+            message = Voter.create_vote_message(name)
+            self.messages.append(message)
+            self._by_message[message] = candidate_id
+        return candidate_id
+
+    def set_active(self, names):
+        """Définit les candidats de l'élection courante (ajoutés au catalogue au besoin)"""
+        self._active = {self.add(name) for name in names}
+
+    def id_of(self, name):
+        """ID d'un candidat de l'élection courante (None si invalide)"""
+        candidate_id = self.ids.get(name)
+        return candidate_id if candidate_id in self._active else None
+
+    def id_for_message(self, vote_message):
+        """ID du candidat désigné par un message de vote (None si aucun)"""
+        candidate_id = self._by_message.get(vote_message)
+        return candidate_id if candidate_id in self._active else None
+
+    def name_of(self, candidate_id):
+        """Nom du candidat d'ID candidate_id (candidats retirés compris)"""
+        return self.names[candidate_id]
+
+    def vote_message(self, candidate_id):
+        """Message de vote précalculé du candidat"""
+        return self.messages[candidate_id]
+
+    def vote_hash(self, candidate_id, hash_algorithm='sha256'):
+        """Hash du message de vote du candidat (calculé une fois par algorithme)"""
+        key = (candidate_id, hash_algorithm)
+        vote_hash = self._hashes.get(key)
+        if vote_hash is None:
+            vote_hash = HashFunctions.hash_vote(self.messages[candidate_id], hash_algorithm)
+            self._hashes[key] = vote_hash
+        return vote_hash
@@ -0,0 +1,311 @@
+"""
+Stockage compact en mémoire des électeurs et des bulletins (backend JSON)
+Colonnes contiguës au lieu d'un dict par électeur / par bulletin:
+- IDs hachés et hashs de vote: 32 octets bruts au lieu de 64 caractères hexadécimaux
+- clés publiques: DER au lieu de PEM; signatures: octets au lieu de base64
+- has_voted: un bit par électeur; horodatages: microsecondes depuis 1970
+Les vues PEM / hexadécimal / ISO ne sont construites qu'à la demande. Une
+valeur dont l'encodage compact ne redonne pas exactement l'original est gardée
+telle quelle, pour que l'instantané réécrit reste identique.
+"""
+
+import base64
+import binascii
+from array import array
+from datetime import datetime, timedelta
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_PEM_BEGIN = '-----BEGIN PUBLIC KEY-----\n'
+_PEM_END = '-----END PUBLIC KEY-----\n'
+_EMPTY_DIGEST = bytes(32)
+
+
+def _digest(value):
+    """Hash hexadécimal de 32 octets -> octets (None s'il ne se réencode pas à l'identique)"""
+    if not isinstance(value, str) or len(value) != 64:
+        return None
+    try:
+        digest = bytes.fromhex(value)
+    except ValueError:
+        return None
+    return digest if digest.hex() == value else None
+
+
+def pem_to_der(pem):
+    """Clé publique PEM -> DER (None si le PEM n'est pas sous la forme standard)"""
+    if not isinstance(pem, str) or not pem.startswith(_PEM_BEGIN) or not pem.endswith(_PEM_END):
+        return None
+    try:
+        der = base64.b64decode(pem[len(_PEM_BEGIN):-len(_PEM_END)], validate=False)
+    except (binascii.Error, ValueError):
+        return None
+    return der if der_to_pem(der) == pem else None
+
+
+def der_to_pem(der):
+    """Clé publique DER -> PEM (lignes de 64 caractères, comme cryptography)"""
+    encoded = base64.b64encode(der).decode('ascii')
+    lines = ''.join(encoded[i:i + 64] + '\n' for i in range(0, len(encoded), 64))
+    return _PEM_BEGIN + lines + _PEM_END
+
+
+def _micros(timestamp):
+    """Horodatage ISO -> microsecondes depuis 1970 (None s'il ne se réécrit pas à l'identique)"""
+    if not isinstance(timestamp, str):
+        return None
+    try:
+        micros = (datetime.fromisoformat(timestamp) - _EPOCH) // _MICROSECOND
+    except (ValueError, TypeError):
+        return None
+    return micros if _iso(micros) == timestamp else None
+
+
+def _iso(micros):
+    return (_EPOCH + micros * _MICROSECOND).isoformat()
+
+
+def _signature_bytes(signature_b64):
+    """Signature base64 -> octets (None si elle ne se réencode pas à l'identique)"""
+    if not isinstance(signature_b64, str):
+        return None
+    try:
+        signature = base64.b64decode(signature_b64, validate=True)
+    except (binascii.Error, ValueError):
+        return None
+    return signature if base64.b64encode(signature).decode('ascii') == signature_b64 else None
+
+
+class VoterView:
+    """Vue d'un électeur (construite à la demande, PEM compris)"""
+
+    __slots__ = ('hashed_id', 'public_key', 'has_voted', 'registration_date', 'signature_scheme')
+
+    def __init__(self, hashed_id, public_key, has_voted, registration_date, signature_scheme):
+        self.hashed_id = hashed_id
+        self.public_key = public_key
+        self.has_voted = has_voted
+        self.registration_date = registration_date
+        self.signature_scheme = signature_scheme
+
+
+class VoterStore:
+    """Électeurs inscrits en colonnes, indexés par ID haché"""
+
+    def __init__(self):
+        self._rows = {}              # digest (ou ID non hexadécimal) -> ligne
+        self._ids = bytearray()      # 32 octets par ligne
+        self._keys = []              # DER (bytes) ou PEM d'origine (str)
+        self._voted = bytearray()    # bitmap has_voted
+        self._dates = array('q')     # microsecondes depuis 1970
+        self._schemes = bytearray()  # code du schéma de signature
+        self._scheme_names = []
+        self._irregular = {}         # ligne -> {champ: valeur d'origine}
+        self.voted_count = 0
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, hashed_id):
+        return self.row(hashed_id) is not None
+
+    def row(self, hashed_id):
+        """Ligne d'un électeur (None si inconnu)"""
+        return self._rows.get(_digest(hashed_id) or hashed_id)
+
+    def add(self, hashed_id, public_key_pem, registration_date, signature_scheme, has_voted=False):
+        """Ajoute un électeur (ou remplace celui qui a le même ID); retourne sa ligne"""
+        digest = _digest(hashed_id)
+        key = digest or hashed_id
+        row = self._rows.get(key)
+        if row is None:
+            row = len(self._keys)
+            self._rows[key] = row
+            self._ids += digest or _EMPTY_DIGEST
+            self._keys.append(None)
+            self._dates.append(0)
+            self._schemes.append(0)
+            if row // 8 >= len(self._voted):
+                self._voted.append(0)
+        elif self.has_voted(row):
+            self._clear_voted(row)
+        irregular = {}
+        if digest is None:
+            irregular['hashed_id'] = hashed_id
+        self._keys[row] = pem_to_der(public_key_pem) or public_key_pem
+        micros = _micros(registration_date)
+        if micros is None:
+            irregular['registration_date'] = registration_date
+        self._dates[row] = micros or 0
+        if signature_scheme not in self._scheme_names:
+            self._scheme_names.append(signature_scheme)
+        self._schemes[row] = self._scheme_names.index(signature_scheme)
+        if irregular:
+            self._irregular[row] = irregular
+        else:
+            self._irregular.pop(row, None)
+        if has_voted:
+            self.set_voted(row)
+        return row
+
+    def has_voted(self, row):
+        return bool(self._voted[row >> 3] & (1 << (row & 7)))
+
+    def set_voted(self, row):
+        """Marque la ligne comme ayant voté; retourne True si elle ne l'était pas"""
+        if self.has_voted(row):
+            return False
+        self._voted[row >> 3] |= 1 << (row & 7)
+        self.voted_count += 1
+        return True
+
+    def _clear_voted(self, row):
+        self._voted[row >> 3] &= ~(1 << (row & 7)) & 0xFF
+        self.voted_count -= 1
+
+    def count_voted(self):
+        """Recompte le bitmap (contrôle de cohérence)"""
+        return int.from_bytes(self._voted, 'little').bit_count()
+
+    def hashed_id(self, row):
+        irregular = self._irregular.get(row)
+        if irregular and 'hashed_id' in irregular:
+            return irregular['hashed_id']
+        return self._ids[row * 32:(row + 1) * 32].hex()
+
+    def public_key(self, row):
+        key = self._keys[row]
+        return der_to_pem(key) if isinstance(key, bytes) else key
+
+    def registration_date(self, row):
+        irregular = self._irregular.get(row)
+        if irregular and 'registration_date' in irregular:
+            return irregular['registration_date']
+        return _iso(self._dates[row])
+
+    def signature_scheme(self, row):
+        return self._scheme_names[self._schemes[row]]
+
+    def view(self, row):
+        return VoterView(self.hashed_id(row), self.public_key(row), self.has_voted(row),
+                         self.registration_date(row), self.signature_scheme(row))
+
+    def items(self):
+        """Parcourt (hashed_id, dict) au format de l'instantané JSON"""
+        for row in range(len(self)):
+            yield self.hashed_id(row), {
+                'public_key': self.public_key(row),
+                'has_voted': self.has_voted(row),
+                'registration_date': self.registration_date(row),
+                'signature_scheme': self.signature_scheme(row)
+            }
+
+
+class BallotStore:
+    """Bulletins en colonnes, dans l'ordre d'arrivée (ligne = index de feuille de Merkle)"""
+
+    def __init__(self):
+        self._rows = {}                  # digest de l'électeur -> ligne de son bulletin
+        self._voters = bytearray()       # 32 octets par ligne
+        self._hashes = bytearray()       # 32 octets par ligne
+        self._signatures = []            # octets (ou base64 d'origine)
+        self._candidates = array('i')    # ID du catalogue des candidats
+        self._timestamps = array('q')    # microsecondes depuis 1970
+        self._stations = array('H')      # code du bureau de vote (0: aucun)
+        self._station_names = [None]
+        self._irregular = {}             # ligne -> {champ: valeur d'origine}
+
+    def __len__(self):
+        return len(self._candidates)
+
+    def append(self, vote_record):
+        """
+        Ajoute un bulletin compact
+        Entrée: vote_record (dict): voter_hash, vote_hash, signature, candidate_id, timestamp,
+                et vote_message / station s'ils sont présents
+        Retourne: ligne du bulletin
+        """
+        row = len(self._candidates)
+        irregular = {}
+        voter_digest = _digest(vote_record['voter_hash'])
+        if voter_digest is None:
+            irregular['voter_hash'] = vote_record['voter_hash']
+        vote_digest = _digest(vote_record['vote_hash'])
+        if vote_digest is None:
+            irregular['vote_hash'] = vote_record['vote_hash']
+        micros = _micros(vote_record['timestamp'])
+        if micros is None:
+            irregular['timestamp'] = vote_record['timestamp']
+        if 'vote_message' in vote_record:
+            irregular['vote_message'] = vote_record['vote_message']
+        station = vote_record.get('station')
+        if station not in self._station_names:
+            self._station_names.append(station)
+
+        self._rows[voter_digest or vote_record['voter_hash']] = row
+        self._voters += voter_digest or _EMPTY_DIGEST
+        self._hashes += vote_digest or _EMPTY_DIGEST
+        self._signatures.append(_signature_bytes(vote_record['signature']) or vote_record['signature'])
+        self._timestamps.append(micros or 0)
+        self._stations.append(self._station_names.index(station))
+        if irregular:
+            self._irregular[row] = irregular
+        # Colonne ajoutée en dernier: len() ne compte que des lignes complètes
+        self._candidates.append(vote_record['candidate_id'])
+        return row
+
+    def row_of(self, voter_hash):
+        """Ligne du bulletin d'un électeur (None s'il n'a pas voté)"""
+        return self._rows.get(_digest(voter_hash) or voter_hash)
+
+    def _field(self, row, name):
+        irregular = self._irregular.get(row)
+        return irregular.get(name) if irregular else None
+
+    def voter_hash(self, row):
+        voter_hash = self._field(row, 'voter_hash')
+        return voter_hash if voter_hash is not None else self._voters[row * 32:(row + 1) * 32].hex()
+
+    def vote_hash(self, row):
+        vote_hash = self._field(row, 'vote_hash')
+        return vote_hash if vote_hash is not None else self._hashes[row * 32:(row + 1) * 32].hex()
+
+    def signature(self, row):
+        signature = self._signatures[row]
+        return base64.b64encode(signature).decode('ascii') if isinstance(signature, bytes) else signature
+
+    def candidate_id(self, row):
+        return self._candidates[row]
+
+    def timestamp(self, row):
+        timestamp = self._field(row, 'timestamp')
+        return timestamp if timestamp is not None else _iso(self._timestamps[row])
+
+    def vote_message(self, row):
+        """Message d'origine s'il diffère du message du catalogue, sinon None"""
+        return self._field(row, 'vote_message')
+
+    def station(self, row):
+        """Bureau de vote du bulletin (None si non renseigné)"""
+        return self._station_names[self._stations[row]]
+
+    def candidate_ids(self):
+        """Colonne des IDs de candidats (copie)"""
+        return array('i', self._candidates)
+
+    def record(self, row):
+        """Bulletin compact (dict) au format de l'instantané JSON"""
+        vote_record = {
+            'voter_hash': self.voter_hash(row),
+            'vote_hash': self.vote_hash(row),
+            'signature': self.signature(row),
+            'timestamp': self.timestamp(row),
+            'candidate_id': self._candidates[row]
+        }
+        vote_message = self._field(row, 'vote_message')
+        if vote_message is not None:
+            vote_record['vote_message'] = vote_message
+        station = self.station(row)
+        if station is not None:
+            vote_record['station'] = station
+        return vote_record
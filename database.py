@@ -1,51 +1,369 @@
 import json
 import os
+import threading
 from datetime import datetime
+from signature import DEFAULT_SIGNATURE_SCHEME
+from merkle import MerkleTree, ballot_leaf_hash
+from candidates import CandidateCatalog
+from json_stream import iter_json_object
+from compact_store import BallotStore, VoterStore
+
+# Nombre de verrous de réservation (un électeur -> un verrou choisi par son hash)
+RESERVATION_STRIPES = 64
 
 class VotingDatabase:
     """Gestion de la base de données des votes"""
     
-    def __init__(self, db_file='votes.json'):
+    def __init__(self, db_file='votes.json', journal=False, compact_every=10000, progress=None):
+        """
+        Entrée:
+            - db_file (str): Fichier JSON de la base (instantané complet)
+            - journal (bool): Mode journal en ajout seul. Chaque modification est
+              ajoutée comme une ligne dans '<db_file>.journal' au lieu de réécrire
+              tout le fichier; l'état est reconstruit au chargement en rejouant
+              le journal par-dessus le dernier instantané.
+            - compact_every (int): Nombre d'entrées du journal avant compaction
+              (écriture d'un nouvel instantané et remise à zéro du journal)
+            - progress (callable): suivi du chargement, appelée avec
+              (octets lus, taille du fichier)
+        """
         self.db_file = db_file
-        self.data = {
-            'registered_voters': {},  # {hashed_id: {"public_key": "...", "has_voted": False}}
-            'votes': [],              # Liste des votes avec signatures
-            'candidates': []          # Liste des candidats
+        self.journal = journal
+        self.journal_file = db_file + '.journal'
+        self.compact_every = compact_every
+        self._journal_fp = None
+        self._journal_entries = 0
+        self._seq = 0
+        self._lock = threading.RLock()
+        self.data = self._empty_data()
+        # Compteurs incrémentaux (reconstruits une fois au chargement), indexés par ID de candidat
+        self._catalog = CandidateCatalog()
+        self._tally = []
+        # Arbre de Merkle des bulletins (feuille i = bulletin de la ligne i du BallotStore)
+        self._merkle = MerkleTree()
+        # Réservations en cours (en mémoire): électeurs dont le bulletin est en vérification
+        self._stripes = [threading.Lock() for _ in range(RESERVATION_STRIPES)]
+        self._reserved = set()
+        self.load_database(progress)
+        if self.journal and not os.path.exists(self.db_file):
+            self.save_database()
+    
+    @staticmethod
+    def _empty_data():
+        return {
+            'registered_voters': VoterStore(),  # Électeurs (colonnes compactes, voir compact_store)
+            'votes': BallotStore(),             # Bulletins dans l'ordre d'arrivée
+            'candidates': [],         # Liste des candidats
+            'candidate_catalog': [],  # Noms par ID de candidat (ajout seul)
+            'settings': {}            # Paramètres de l'élection (schéma de signature, ...)
         }
-        self.load_database()
     
-    def load_database(self):
-        """Charge la base de données depuis le fichier"""
+    def load_database(self, progress=None):
+        """
+        Charge la base de données depuis le fichier puis rejoue le journal
+        Le fichier est lu en flux (électeur par électeur, vote par vote): le pic
+        de mémoire ne dépend pas de la taille du fichier au-delà des données chargées.
+        Entrée: progress (callable): appelée avec (octets lus, taille du fichier)
+        """
+        legacy_votes = []
         if os.path.exists(self.db_file):
             try:
-                with open(self.db_file, 'r', encoding='utf-8') as f:
-                    self.data = json.load(f)
-            except:
+                self.data, legacy_votes = self._read_snapshot(progress)
+            except (OSError, ValueError):
                 pass
+        self._seq = self.data.pop('journal_seq', 0)
+        # Version du décompte (sauvegardée avec l'instantané; ancienne base: nombre de bulletins)
+        self.data.setdefault('tally_version', len(self.data['votes']) + len(legacy_votes))
+        self._rebuild_counters(legacy_votes)
+        self._replay_journal()
+    
+    def _read_snapshot(self, progress=None):
+        """
+        Lit l'instantané en flux directement dans les colonnes compactes
+        Retourne: (données, bulletins au format complet d'une ancienne base, à compacter)
+        """
+        data = self._empty_data()
+        voters = data['registered_voters']
+        votes = data['votes']
+        legacy_votes = []
+        with open(self.db_file, 'rb') as f:
+            for key, item_key, value in iter_json_object(f, ('registered_voters', 'votes'),
+                                                         progress=progress):
+                if key == 'registered_voters':
+                    voters.add(item_key, value['public_key'], value.get('registration_date'),
+                               value.get('signature_scheme', DEFAULT_SIGNATURE_SCHEME),
+                               value.get('has_voted', False))
+                elif key == 'votes':
+                    if 'candidate_id' in value:
+                        votes.append(value)
+                    else:
+                        legacy_votes.append(value)
+                else:
+                    data[key] = value
+        return data, legacy_votes
+    
+    def _rebuild_counters(self, legacy_votes=()):
+        """
+        Recalcule les compteurs et l'arbre de Merkle par un parcours complet
+        (au chargement uniquement)
+        Entrée: legacy_votes (list): bulletins au format complet, compactés à l'ajout
+        """
+        self._catalog = CandidateCatalog(self.data['candidate_catalog'], self.data['candidates'])
+        # Même liste: le catalogue sauvegardé suit les ajouts
+        self.data['candidate_catalog'] = self._catalog.names
+        self._tally = [0] * len(self._catalog)
+        self._merkle = MerkleTree()
+        for row in range(len(self.data['votes'])):
+            self._count_vote(row)
+        for vote in legacy_votes:
+            self._append_vote(vote)
+    
+    def _count_vote(self, row):
+        """Ajoute le bulletin de la ligne row au décompte et à l'arbre de Merkle"""
+        votes = self.data['votes']
+        candidate_id = votes.candidate_id(row)
+        if candidate_id >= len(self._tally):
+            self._tally.extend([0] * (len(self._catalog) - len(self._tally)))
+        self._tally[candidate_id] += 1
+        self._merkle.append(ballot_leaf_hash(votes.voter_hash(row), votes.vote_hash(row), votes.signature(row)))
+    
+    def _recount(self):
+        """Décompte complet des votes et des électeurs ayant voté"""
+        results = {}
+        for candidate_id in self.data['votes'].candidate_ids():
+            candidate = self._catalog.name_of(candidate_id)
+            results[candidate] = results.get(candidate, 0) + 1
+        return {'results': results, 'total_voted': self.data['registered_voters'].count_voted()}
+    
+    def _replay_journal(self):
+        """
+        Rejoue les entrées du journal postérieures au dernier instantané.
+        Une dernière ligne tronquée (arrêt brutal pendant l'écriture) est
+        ignorée puis coupée du fichier pour que les ajouts suivants restent lisibles.
+        """
+        self._journal_entries = 0
+        if not os.path.exists(self.journal_file):
+            return
+        valid_end = 0
+        with open(self.journal_file, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                valid_end += len(line)
+                self._journal_entries += 1
+                if entry['seq'] <= self._seq:
+                    continue
+                self._apply(entry)
+                self._seq = entry['seq']
+        if valid_end < os.path.getsize(self.journal_file):
+            with open(self.journal_file, 'r+b') as f:
+                f.truncate(valid_end)
+    
+    def save_database(self, sync=False):
+        """
+        Sauvegarde la base de données dans le fichier (instantané complet).
+        L'écriture passe par un fichier temporaire pour rester atomique, puis
+        le journal, désormais inclus dans l'instantané, est vidé.
+        Entrée: sync (bool): force l'écriture sur disque (fsync) avant de rendre la main
+        """
+        tmp_file = self.db_file + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            self._write_snapshot(f)
+            if sync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_file, self.db_file)
+        self._truncate_journal()
     
-    def save_database(self):
-        """Sauvegarde la base de données dans le fichier"""
-        with open(self.db_file, 'w', encoding='utf-8') as f:
-            json.dump(self.data, f, indent=4, ensure_ascii=False)
+    def _write_snapshot(self, f):
+        """
+        Écrit l'instantané en flux: un électeur / un bulletin par ligne, sans construire
+        le document complet en mémoire. Les petites sections viennent en tête pour
+        qu'un lecteur en flux les ait avant les électeurs et les votes.
+        """
+        voters = self.data['registered_voters']
+        votes = self.data['votes']
+        header = {key: value for key, value in self.data.items() if key not in ('registered_voters', 'votes')}
+        if self.journal:
+            header['journal_seq'] = self._seq
+        f.write('{')
+        for key, value in header.items():
+            f.write(f'\n{json.dumps(key)}: {json.dumps(value, ensure_ascii=False)},')
+        f.write('\n"registered_voters": {')
+        separator = '\n'
+        for hashed_id, voter in voters.items():
+            f.write(f'{separator}{json.dumps(hashed_id)}: {json.dumps(voter, ensure_ascii=False)}')
+            separator = ',\n'
+        f.write('\n},\n"votes": [')
+        separator = '\n'
+        for row in range(len(votes)):
+            f.write(separator + json.dumps(votes.record(row), ensure_ascii=False))
+            separator = ',\n'
+        f.write('\n]}\n')
+    
+    def compact(self):
+        """Écrit un nouvel instantané et remet le journal à zéro"""
+        self.save_database()
+    
+    def _truncate_journal(self):
+        if self._journal_fp is not None:
+            self._journal_fp.close()
+            self._journal_fp = None
+        if os.path.exists(self.journal_file):
+            os.remove(self.journal_file)
+        self._journal_entries = 0
+    
+    def close(self):
+        """Ferme le journal ouvert (s'il y en a un)"""
+        if self._journal_fp is not None:
+            self._journal_fp.close()
+            self._journal_fp = None
+    
+    def _commit(self, *entries, sync=False):
+        """
+        Applique une ou plusieurs modifications puis les rend persistantes
+        en une seule écriture:
+        - mode journal: les lignes sont ajoutées au journal (coût constant)
+        - sinon: réécriture complète du fichier
+        Entrée: sync (bool): fsync unique pour tout le groupe avant de rendre la main
+        """
+        with self._lock:
+            lines = []
+            for entry in entries:
+                self._seq += 1
+                entry['seq'] = self._seq
+                if self.journal:
+                    # Sérialisée avant _apply, qui compacte le bulletin (nom du candidat -> ID):
+                    # le rejeu doit refaire l'ajout au catalogue d'un candidat inconnu
+                    lines.append(json.dumps(entry, ensure_ascii=False) + '\n')
+                self._apply(entry)
+            if not self.journal:
+                self.save_database(sync=sync)
+                return
+            if self._journal_fp is None:
+                self._journal_fp = open(self.journal_file, 'a', encoding='utf-8')
+            self._journal_fp.write(''.join(lines))
+            self._journal_fp.flush()
+            if sync:
+                os.fsync(self._journal_fp.fileno())
+            self._journal_entries += len(entries)
+            if self._journal_entries >= self.compact_every:
+                self.compact()
+    
+    def _apply(self, entry):
+        """Applique une entrée du journal à l'état en mémoire"""
+        op = entry['op']
+        if op == 'register_voter':
+            self.data['registered_voters'].add(
+                entry['hashed_id'], entry['public_key'], entry['registration_date'],
+                entry.get('signature_scheme', DEFAULT_SIGNATURE_SCHEME)
+            )
+        elif op == 'mark_as_voted':
+            self._set_voted(entry['hashed_id'])
+        elif op == 'add_vote':
+            self._append_vote(entry['vote'])
+            self.data['tally_version'] += 1
+        elif op == 'record_ballot':
+            self._set_voted(entry['vote']['voter_hash'])
+            self._append_vote(entry['vote'])
+            self.data['tally_version'] += 1
+        elif op == 'initialize_candidates':
+            self.data['candidates'] = entry['candidates']
+            self._catalog.set_active(entry['candidates'])
+            self.data['tally_version'] += 1
+        elif op == 'set_setting':
+            self.data['settings'][entry['name']] = entry['value']
+        else:
+            raise ValueError(f"Opération de journal inconnue: {op}")
+    
+    def _set_voted(self, hashed_id):
+        voters = self.data['registered_voters']
+        voters.set_voted(voters.row(hashed_id))
+        # has_voted est positionné avant de libérer: reserve_voter voit l'un ou l'autre
+        self._reserved.discard(hashed_id)
+    
+    def _append_vote(self, vote_record):
+        if 'candidate' in vote_record:
+            # Bulletin complet (ancienne base ou candidat hors catalogue): compacté ici,
+            # de façon déterministe au rejeu du journal
+            self._compact_vote(vote_record, self._catalog.add(vote_record.pop('candidate')))
+        self._count_vote(self.data['votes'].append(vote_record))
     
-    def register_voter(self, hashed_id, public_key_pem):
+    def _compact_vote(self, vote_record, candidate_id):
+        """L'ID remplace le nom du candidat; le message n'est gardé que s'il diffère du message attendu"""
+        vote_record['candidate_id'] = candidate_id
+        if vote_record.get('vote_message') == self._catalog.vote_message(candidate_id):
+            del vote_record['vote_message']
+        return vote_record
+    
+    def _expand_vote(self, row):
+        """Bulletin complet (nom du candidat et message) de la ligne row"""
+        votes = self.data['votes']
+        candidate_id = votes.candidate_id(row)
+        vote_message = votes.vote_message(row)
+        return {
+            'voter_hash': votes.voter_hash(row),
+            'vote_message': vote_message if vote_message is not None else self._catalog.vote_message(candidate_id),
+            'vote_hash': votes.vote_hash(row),
+            'signature': votes.signature(row),
+            'candidate': self._catalog.name_of(candidate_id),
+            'timestamp': votes.timestamp(row)
+        }
+    
+    def register_voter(self, hashed_id, public_key_pem, signature_scheme=DEFAULT_SIGNATURE_SCHEME):
         """
         Enregistre un électeur avec sa clé publique
         Entrée: 
             - hashed_id (str): Hash de l'ID de l'électeur
             - public_key_pem (str): Clé publique au format PEM
+            - signature_scheme (str): Schéma de signature de la clé
         Retourne: True si enregistré, False si déjà existant
         """
-        if hashed_id in self.data['registered_voters']:
-            return False
-        
-        self.data['registered_voters'][hashed_id] = {
-            'public_key': public_key_pem,
-            'has_voted': False,
-            'registration_date': datetime.now().isoformat()
-        }
-        self.save_database()
-        return True
+        return self.register_voters([(hashed_id, public_key_pem, signature_scheme)])[0]
+    
+    def register_voters(self, voters):
+        """
+        Enregistre un lot d'électeurs en une seule écriture
+        Entrée: voters (list): tuples (hashed_id, public_key_pem[, signature_scheme])
+        Retourne: liste de booléens (False si déjà existant)
+        """
+        with self._lock:
+            registration_date = datetime.now().isoformat()
+            entries = []
+            results = []
+            seen = set()
+            for hashed_id, public_key_pem, *scheme in voters:
+                if hashed_id in self.data['registered_voters'] or hashed_id in seen:
+                    results.append(False)
+                    continue
+                seen.add(hashed_id)
+                entries.append({
+                    'op': 'register_voter',
+                    'hashed_id': hashed_id,
+                    'public_key': public_key_pem,
+                    'registration_date': registration_date,
+                    'signature_scheme': scheme[0] if scheme else DEFAULT_SIGNATURE_SCHEME
+                })
+                results.append(True)
+            if entries:
+                self._commit(*entries)
+            return results
+    
+    def iter_voters(self):
+        """Parcourt les électeurs: tuples (hashed_id, has_voted, registration_date)"""
+        voters = self.data['registered_voters']
+        for row in range(len(voters)):
+            yield voters.hashed_id(row), voters.has_voted(row), voters.registration_date(row)
+    
+    def get_voter(self, hashed_id):
+        """Retourne la vue d'un électeur (compact_store.VoterView, PEM compris) ou None"""
+        voters = self.data['registered_voters']
+        row = voters.row(hashed_id)
+        return None if row is None else voters.view(row)
     
     def is_voter_registered(self, hashed_id):
         """
@@ -57,27 +375,69 @@ class VotingDatabase:
         """
         Vérifie si un électeur a déjà voté
         """
-        if hashed_id not in self.data['registered_voters']:
-            return False
-        return self.data['registered_voters'][hashed_id]['has_voted']
+        voters = self.data['registered_voters']
+        row = voters.row(hashed_id)
+        return row is not None and voters.has_voted(row)
     
     def mark_as_voted(self, hashed_id):
         """
         Marque un électeur comme ayant voté
         """
         if hashed_id in self.data['registered_voters']:
-            self.data['registered_voters'][hashed_id]['has_voted'] = True
-            self.save_database()
+            self._commit({'op': 'mark_as_voted', 'hashed_id': hashed_id})
             return True
         return False
     
+    def reserve_voter(self, hashed_id):
+        """
+        Réserve atomiquement le droit de vote d'un électeur, avant toute vérification
+        cryptographique. Deux soumissions concurrentes du même électeur ne peuvent
+        pas être réservées ensemble; des électeurs différents ne se bloquent pas
+        (verrous répartis par électeur). La réservation est consommée par
+        record_ballot(s) ou annulée par release_voter.
+        Retourne: (réservé, raison) avec raison parmi 'ok', 'not_registered',
+                  'already_voted', 'in_progress'
+        """
+        with self._stripes[hash(hashed_id) % RESERVATION_STRIPES]:
+            voters = self.data['registered_voters']
+            row = voters.row(hashed_id)
+            if row is None:
+                return False, 'not_registered'
+            if voters.has_voted(row):
+                return False, 'already_voted'
+            if hashed_id in self._reserved:
+                return False, 'in_progress'
+            self._reserved.add(hashed_id)
+            return True, 'ok'
+    
+    def release_voter(self, hashed_id):
+        """Annule la réservation d'un électeur (bulletin rejeté ou erreur)"""
+        with self._stripes[hash(hashed_id) % RESERVATION_STRIPES]:
+            self._reserved.discard(hashed_id)
+    
     def get_public_key(self, hashed_id):
         """
         Récupère la clé publique d'un électeur
         """
-        if hashed_id in self.data['registered_voters']:
-            return self.data['registered_voters'][hashed_id]['public_key']
-        return None
+        voters = self.data['registered_voters']
+        row = voters.row(hashed_id)
+        return None if row is None else voters.public_key(row)
+    
+    def get_signature_scheme(self, hashed_id):
+        """
+        Retourne le schéma de signature enregistré pour un électeur (None si inconnu)
+        """
+        voters = self.data['registered_voters']
+        row = voters.row(hashed_id)
+        return None if row is None else voters.signature_scheme(row)
+    
+    def set_setting(self, name, value):
+        """Enregistre un paramètre de l'élection (ex: 'signature_scheme')"""
+        self._commit({'op': 'set_setting', 'name': name, 'value': value})
+    
+    def get_setting(self, name, default=None):
+        """Retourne un paramètre de l'élection"""
+        return self.data['settings'].get(name, default)
     
     def add_vote(self, hashed_id, vote_message, vote_hash, signature_b64, candidate):
         """
@@ -89,16 +449,111 @@ class VotingDatabase:
             - signature_b64 (str): Signature en base64
             - candidate (str): Nom du candidat
         """
+        with self._lock:
+            vote_record = self._vote_record(hashed_id, vote_message, vote_hash, signature_b64, candidate)
+            self._commit({'op': 'add_vote', 'vote': vote_record})
+    
+    def _vote_record(self, hashed_id, vote_message, vote_hash, signature_b64, candidate):
         vote_record = {
             'voter_hash': hashed_id,
             'vote_message': vote_message,
             'vote_hash': vote_hash,
             'signature': signature_b64,
-            'candidate': candidate,
             'timestamp': datetime.now().isoformat()
         }
-        self.data['votes'].append(vote_record)
-        self.save_database()
+        station = self.data['settings'].get('station')
+        if station is not None:
+            # Bureau de vote de la base (paramètre 'station' de l'élection), pour le dépouillement
+            vote_record['station'] = station
+        candidate_id = self._catalog.ids.get(candidate)
+        if candidate_id is None:
+            # Candidat encore inconnu: l'ID sera attribué à l'application de l'entrée
+            vote_record['candidate'] = candidate
+            return vote_record
+        return self._compact_vote(vote_record, candidate_id)
+    
+    def record_ballot(self, hashed_id, vote_message, vote_hash, signature_b64, candidate, sync=False):
+        """
+        Marque l'électeur comme ayant voté ET enregistre son vote en une seule écriture
+        (pas de fenêtre entre les deux modifications en cas d'arrêt brutal)
+        Retourne: True si enregistré, False si non enregistré ou a déjà voté
+        """
+        return self.record_ballots(
+            [(hashed_id, vote_message, vote_hash, signature_b64, candidate)], sync=sync
+        )[0]
+    
+    def record_ballots(self, ballots, sync=True):
+        """
+        Enregistre un groupe de bulletins vérifiés en une seule écriture durable
+        Entrée:
+            - ballots (list): tuples (hashed_id, vote_message, vote_hash, signature_b64, candidate)
+            - sync (bool): fsync unique pour tout le groupe
+        Retourne: liste de booléens (False pour un électeur inconnu ou ayant déjà voté)
+        """
+        with self._lock:
+            entries = []
+            results = []
+            seen = set()
+            voters = self.data['registered_voters']
+            for hashed_id, vote_message, vote_hash, signature_b64, candidate in ballots:
+                row = voters.row(hashed_id)
+                if row is None or voters.has_voted(row) or hashed_id in seen:
+                    results.append(False)
+                    continue
+                seen.add(hashed_id)
+                entries.append({
+                    'op': 'record_ballot',
+                    'vote': self._vote_record(hashed_id, vote_message, vote_hash, signature_b64, candidate)
+                })
+                results.append(True)
+            if entries:
+                self._commit(*entries, sync=sync)
+            return results
+    
+    def iter_votes(self):
+        """Parcourt les votes enregistrés dans l'ordre d'arrivée (bulletins complets)"""
+        return (self._expand_vote(row) for row in range(len(self.data['votes'])))
+    
+    def iter_voted_voters(self):
+        """Parcourt les IDs hachés des électeurs ayant voté"""
+        voters = self.data['registered_voters']
+        return (voters.hashed_id(row) for row in range(len(voters)) if voters.has_voted(row))
+    
+    def iter_tally_rows(self):
+        """Parcourt (candidat, horodatage, bureau ou None) de chaque vote, sans développer les bulletins"""
+        names = self._catalog.names
+        votes = self.data['votes']
+        for row in range(len(votes)):
+            yield names[votes.candidate_id(row)], votes.timestamp(row), votes.station(row)
+    
+    def get_merkle_root(self):
+        """Racine de l'arbre de Merkle des bulletins (None si aucun vote)"""
+        return self._merkle.root()
+    
+    def get_inclusion_proof(self, hashed_id):
+        """
+        Preuve d'inclusion du bulletin d'un électeur dans l'arbre de Merkle
+        Retourne: reçu (dict) vérifiable hors ligne avec merkle.verify_receipt, ou None
+        """
+        with self._lock:
+            votes = self.data['votes']
+            index = votes.row_of(hashed_id)
+            if index is None:
+                return None
+            return {
+                'voter_hash': hashed_id,
+                'vote_hash': votes.vote_hash(index),
+                'signature': votes.signature(index),
+                'index': index,
+                'leaf_hash': self._merkle.nodes.get(0, index),
+                'proof': self._merkle.inclusion_proof(index),
+                'tree_size': self._merkle.size(),
+                'root': self._merkle.root()
+            }
+    
+    def get_tally_version(self):
+        """Version du décompte: change à chaque bulletin validé"""
+        return self.data['tally_version']
     
     def get_vote_count(self):
         """Retourne le nombre total de votes"""
@@ -106,39 +561,56 @@ class VotingDatabase:
     
     def get_results(self):
         """
-        Calcule et retourne les résultats du vote
+        Retourne les résultats du vote (compteurs tenus à jour à chaque écriture)
         Retourne: dict {candidat: nombre_votes}
         """
-        results = {}
-        for vote in self.data['votes']:
-            candidate = vote['candidate']
-            results[candidate] = results.get(candidate, 0) + 1
-        return results
+        names = self._catalog.names
+        return {names[candidate_id]: count for candidate_id, count in enumerate(self._tally) if count}
     
     def initialize_candidates(self, candidates):
         """
         Initialise la liste des candidats
         """
-        self.data['candidates'] = candidates
-        self.save_database()
+        self._commit({'op': 'initialize_candidates', 'candidates': candidates})
+    
+    def add_candidate(self, name):
+        """
+        Ajoute un candidat à l'élection en cours
+        Retourne: False si le candidat figure déjà dans la liste
+        """
+        with self._lock:
+            if name in self.data['candidates']:
+                return False
+            self._commit({'op': 'initialize_candidates', 'candidates': self.data['candidates'] + [name]})
+            return True
     
     def get_candidates(self):
         """Retourne la liste des candidats"""
         return self.data['candidates']
     
+    def get_candidate_catalog(self):
+        """Retourne le catalogue des candidats (IDs stables, messages et hashs précalculés)"""
+        return self._catalog
+    
+    def refresh_candidate_catalog(self):
+        """Rien à relire: le catalogue en mémoire suit chaque modification"""
+        return self._catalog
+    
     def reset_database(self):
         """Réinitialise complètement la base de données"""
-        self.data = {
-            'registered_voters': {},
-            'votes': [],
-            'candidates': []
-        }
-        self.save_database()
+        with self._lock:
+            # La version du décompte continue de croître: un ETag d'avant la réinitialisation reste périmé
+            tally_version = self.data['tally_version'] + 1
+            self.data = self._empty_data()
+            self.data['tally_version'] = tally_version
+            self._reserved.clear()
+            self._rebuild_counters()
+            self.save_database()
     
     def get_statistics(self):
-        """Retourne les statistiques du vote"""
+        """Retourne les statistiques du vote (temps constant)"""
         total_registered = len(self.data['registered_voters'])
-        total_voted = sum(1 for v in self.data['registered_voters'].values() if v['has_voted'])
+        total_voted = self.data['registered_voters'].voted_count
         
         return {
             'total_registered': total_registered,
@@ -146,4 +618,38 @@ class VotingDatabase:
             'total_votes': len(self.data['votes']),
             'participation_rate': (total_voted / total_registered * 100) if total_registered > 0 else 0,
             'results': self.get_results()
-        }
\ No newline at end of file
+        }
+    
+    def check_consistency(self):
+        """
+        Compare les compteurs incrémentaux à un décompte complet
+        Retourne: dict {'consistent': bool, 'counters': {...}, 'recount': {...}}
+        """
+        with self._lock:
+            counters = {'results': self.get_results(), 'total_voted': self.data['registered_voters'].voted_count}
+            recount = self._recount()
+        return {
+            'consistent': counters == recount,
+            'counters': counters,
+            'recount': recount
+        }
+
+
+def open_database(db_file='votes.json', backend=None, journal=False, progress=None):
+    """
+    Ouvre la base de données avec le backend demandé
+    Entrée:
+        - db_file (str): Fichier de la base
+        - backend (str): 'json' ou 'sqlite' (déduit de l'extension si None)
+        - journal (bool): Mode journal du backend JSON
+        - progress (callable): suivi du chargement du backend JSON (octets lus, taille)
+    Retourne: VotingDatabase ou SQLiteVotingDatabase
+    """
+    if backend is None:
+        backend = 'sqlite' if db_file.endswith(('.db', '.sqlite', '.sqlite3')) else 'json'
+    if backend == 'json':
+        return VotingDatabase(db_file, journal=journal, progress=progress)
+    if backend == 'sqlite':
+        from sqlite_database import SQLiteVotingDatabase
+        return SQLiteVotingDatabase(db_file)
+    raise ValueError(f"Backend non supporté: {backend}. Utilisez 'json' ou 'sqlite'")
@@ -0,0 +1,288 @@
+"""
+Index d'éligibilité pour les très grandes listes électorales
+Fichier en lecture seule, chargé par mmap (quelques millisecondes quelle que
+soit sa taille):
+- un filtre de Bloom écarte la plupart des IDs inconnus sans consulter la liste
+- les IDs hachés (32 octets) triés sont ensuite cherchés par dichotomie
+L'index est construit en une passe sur la liste: les IDs sont triés par
+tranches écrites dans des fichiers temporaires, puis fusionnés.
+
+Usage:
+    python eligibility_index.py build liste.csv -o liste.idx (--hash sha256 | --db votes.json)
+    python eligibility_index.py build --from-db votes.json -o inscrits.idx
+    python eligibility_index.py check liste.idx ID [ID ...]
+"""
+
+import argparse
+import heapq
+import itertools
+import math
+import mmap
+import os
+import struct
+import tempfile
+
+from hash import DEFAULT_HASH_ALGORITHM, HashFunctions
+
+MAGIC = b'ELIGIDX\x01'
+# magic, algorithme de hachage, nombre d'IDs, bits du filtre de Bloom, nombre de fonctions
+_HEADER = struct.Struct('<8s16sQQB')
+HEADER_SIZE = 64
+DIGEST_SIZE = 32
+
+
+def _digest(hashed_id):
+    """ID haché (hexadécimal ou octets) -> 32 octets (None si invalide)"""
+    if isinstance(hashed_id, (bytes, bytearray)):
+        return bytes(hashed_id) if len(hashed_id) == DIGEST_SIZE else None
+    try:
+        digest = bytes.fromhex(hashed_id)
+    except (TypeError, ValueError):
+        return None
+    return digest if len(digest) == DIGEST_SIZE else None
+
+
+def _bloom_positions(digest, bits, hashes):
+    """
+    Positions du filtre de Bloom (double hachage). Les IDs hachés étant déjà
+    des empreintes cryptographiques, leurs octets servent directement de hashs.
+    """
+    h1 = int.from_bytes(digest[:8], 'little')
+    h2 = int.from_bytes(digest[8:16], 'little') | 1
+    return [(h1 + i * h2) % bits for i in range(hashes)]
+
+
+def _bloom_size(count, false_positive_rate):
+    """(bits, fonctions de hachage) optimaux pour count éléments"""
+    count = max(count, 1)
+    bits = max(64, math.ceil(-count * math.log(false_positive_rate) / math.log(2) ** 2))
+    bits = (bits + 63) // 64 * 64
+    return bits, max(1, round(bits / count * math.log(2)))
+
+
+def _write_run(digests):
+    """Trie une tranche d'IDs et l'écrit dans un fichier temporaire"""
+    digests.sort()
+    run = tempfile.TemporaryFile()
+    run.write(b''.join(digests))
+    run.seek(0)
+    return run
+
+
+def _read_run(run, block=4096):
+    while True:
+        data = run.read(DIGEST_SIZE * block)
+        if not data:
+            return
+        for offset in range(0, len(data), DIGEST_SIZE):
+            yield data[offset:offset + DIGEST_SIZE]
+
+
+def build_index(hashed_ids, index_file, hash_algorithm='sha256', false_positive_rate=0.01,
+                run_size=1 << 20):
+    """
+    Construit un index d'éligibilité
+    Entrée:
+        - hashed_ids (iterable): IDs hachés en hexadécimal (lus en flux)
+        - index_file (str): fichier de l'index (remplacé atomiquement)
+        - hash_algorithm (str): algorithme qui a produit les IDs hachés
+        - false_positive_rate (float): taux de faux positifs visé pour le filtre de Bloom
+        - run_size (int): IDs triés en mémoire avant d'écrire une tranche temporaire
+    Retourne: nombre d'IDs distincts indexés
+    Lève: ValueError si un ID haché ne fait pas 32 octets
+    """
+    runs = []
+    chunk = []
+    total = 0
+    try:
+        for hashed_id in hashed_ids:
+            digest = _digest(hashed_id)
+            if digest is None:
+                raise ValueError(f"ID haché invalide (32 octets attendus): {str(hashed_id)[:64]}")
+            chunk.append(digest)
+            total += 1
+            if len(chunk) >= run_size:
+                runs.append(_write_run(chunk))
+                chunk = []
+        chunk.sort()
+
+        bits, hashes = _bloom_size(total, false_positive_rate)
+        bloom = bytearray(bits // 8)
+        count = 0
+        previous = None
+        tmp_file = index_file + '.tmp'
+        with open(tmp_file, 'wb') as f:
+            f.write(bytes(HEADER_SIZE + len(bloom)))
+            for digest in heapq.merge(*(_read_run(run) for run in runs), chunk):
+                if digest == previous:
+                    continue
+                previous = digest
+                f.write(digest)
+                count += 1
+                for position in _bloom_positions(digest, bits, hashes):
+                    bloom[position >> 3] |= 1 << (position & 7)
+            f.seek(0)
+            f.write(_HEADER.pack(MAGIC, hash_algorithm.encode('ascii'), count, bits, hashes))
+            f.seek(HEADER_SIZE)
+            f.write(bloom)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, index_file)
+    finally:
+        for run in runs:
+            run.close()
+    return count
+
+
+def build_index_from_roster(roster_file, index_file, hash_algorithm='sha256', false_positive_rate=0.01):
+    """Construit l'index d'une liste électorale (CSV ou un ID par ligne, voir enrollment.read_roster)"""
+    from enrollment import read_roster
+    roster = read_roster(roster_file)
+    batches = iter(lambda: list(itertools.islice(roster, 4096)), [])
+    hashed_ids = itertools.chain.from_iterable(HashFunctions.hash_many(batch, hash_algorithm) for batch in batches)
+    return build_index(hashed_ids, index_file, hash_algorithm, false_positive_rate)
+
+
+def build_index_from_database(db, index_file, hash_algorithm='sha256', false_positive_rate=0.01):
+    """Construit l'index des électeurs inscrits dans une base"""
+    hashed_ids = (hashed_id for hashed_id, _, _ in db.iter_voters())
+    return build_index(hashed_ids, index_file, hash_algorithm, false_positive_rate)
+
+
+class EligibilityIndex:
+    """Index d'éligibilité projeté en mémoire (mmap, lecture seule)"""
+
+    def __init__(self, index_file):
+        """
+        Entrée: index_file (str): fichier produit par build_index
+        Lève: ValueError si le fichier n'est pas un index valide
+        """
+        self.index_file = index_file
+        self._file = open(index_file, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"Index d'éligibilité vide: {index_file}")
+        magic, algorithm, count, bits, hashes = _HEADER.unpack_from(self._map, 0)
+        expected_size = HEADER_SIZE + bits // 8 + count * DIGEST_SIZE
+        if magic != MAGIC or len(self._map) != expected_size:
+            self.close()
+            raise ValueError(f"Index d'éligibilité invalide: {index_file}")
+        self.hash_algorithm = algorithm.rstrip(b'\0').decode('ascii')
+        self.count = count
+        self._bits = bits
+        self._hashes = hashes
+        self._digests_offset = HEADER_SIZE + bits // 8
+        self.lookups = 0
+        self.bloom_rejections = 0
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, hashed_id):
+        digest = _digest(hashed_id)
+        if digest is None:
+            return False
+        self.lookups += 1
+        if not self.might_contain(digest):
+            self.bloom_rejections += 1
+            return False
+        return self._search(digest)
+
+    def might_contain(self, digest):
+        """Filtre de Bloom seul: False = absent à coup sûr, True = à vérifier"""
+        index_map = self._map
+        for position in _bloom_positions(digest, self._bits, self._hashes):
+            if not index_map[HEADER_SIZE + (position >> 3)] & (1 << (position & 7)):
+                return False
+        return True
+
+    def _search(self, digest):
+        """Recherche dichotomique dans le tableau trié des IDs"""
+        index_map = self._map
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            offset = self._digests_offset + middle * DIGEST_SIZE
+            value = index_map[offset:offset + DIGEST_SIZE]
+            if value < digest:
+                low = middle + 1
+            elif value > digest:
+                high = middle
+            else:
+                return True
+        return False
+
+    def get_stats(self):
+        return {
+            'count': self.count,
+            'hash_algorithm': self.hash_algorithm,
+            'bloom_bits': self._bits,
+            'bloom_hashes': self._hashes,
+            'lookups': self.lookups,
+            'bloom_rejections': self.bloom_rejections
+        }
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index d'éligibilité (filtre de Bloom + IDs triés)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build = subparsers.add_parser('build', help="Construire un index")
+    build.add_argument('roster', nargs='?', help="Liste électorale (CSV ou un ID par ligne)")
+    build.add_argument('--from-db', default=None, help="Indexer les électeurs inscrits d'une base")
+    build.add_argument('-o', '--output', required=True, help="Fichier de l'index")
+    build.add_argument('--db', default=None, help="Base de l'élection dont l'algorithme de hachage est utilisé")
+    build.add_argument('--hash', default=None, help="Algorithme de hachage des IDs (défaut: celui de l'élection)")
+    build.add_argument('--fp-rate', type=float, default=0.01, help="Taux de faux positifs du filtre")
+
+    check = subparsers.add_parser('check', help="Vérifier des IDs d'électeurs")
+    check.add_argument('index_file')
+    check.add_argument('voter_ids', nargs='+')
+
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        from database import open_database
+        if args.from_db:
+            db = open_database(args.from_db)
+            hash_algorithm = args.hash or db.get_setting('hash_algorithm', DEFAULT_HASH_ALGORITHM)
+            count = build_index_from_database(db, args.output, hash_algorithm, args.fp_rate)
+            db.close()
+        elif args.roster:
+            hash_algorithm = args.hash
+            if hash_algorithm is None:
+                if not args.db:
+                    parser.error("--hash ou --db requis pour indexer une liste électorale")
+                if not os.path.exists(args.db):
+                    parser.error(f"base introuvable: {args.db}")
+                db = open_database(args.db)
+                hash_algorithm = db.get_setting('hash_algorithm', DEFAULT_HASH_ALGORITHM)
+                db.close()
+            count = build_index_from_roster(args.roster, args.output, hash_algorithm, args.fp_rate)
+        else:
+            parser.error("liste électorale ou --from-db requis")
+        print(f"✓ {count} électeurs indexés -> {args.output} ({os.path.getsize(args.output) // 1024} Ko)")
+        return
+
+    with EligibilityIndex(args.index_file) as index:
+        for voter_id in args.voter_ids:
+            eligible = HashFunctions.hash_voter_id(voter_id, index.hash_algorithm) in index
+            print(f"{'✓' if eligible else '❌'} {voter_id}")
+
+
+if __name__ == '__main__':
+    main()
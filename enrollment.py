@@ -0,0 +1,183 @@
+"""
+Enregistrement en masse des électeurs à partir d'une liste électorale
+La liste est un fichier CSV (colonne 'voter_id' ou première colonne) ou un
+fichier texte avec un ID par ligne. Les clés sont générées en parallèle, les
+enregistrements validés en une seule transaction et les clés privées écrites
+dans un keystore SQLite indexé au lieu d'un fichier .pem par électeur.
+
+Usage: python enrollment.py liste.csv --db votes.json --keystore keystore.db [--workers N]
+"""
+
+import argparse
+import csv
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from database import open_database
+from hash import DEFAULT_HASH_ALGORITHM, HashFunctions
+from key_pool import generate_key_pair
+from signature import DEFAULT_SIGNATURE_SCHEME
+
+
+def read_roster(roster_file):
+    """
+    Lit la liste électorale en flux
+    CSV: colonne 'voter_id' si l'en-tête la contient, sinon première colonne
+    (la première ligne est alors une donnée). Texte: un ID par ligne.
+    Retourne: générateur d'IDs d'électeurs (str), lignes vides ignorées
+    """
+    with open(roster_file, 'r', encoding='utf-8', newline='') as f:
+        first_line = f.readline()
+        f.seek(0)
+        if roster_file.endswith('.csv') or ',' in first_line or ';' in first_line:
+            delimiter = ';' if ';' in first_line and ',' not in first_line else ','
+            reader = csv.reader(f, delimiter=delimiter)
+            header = next(reader, None)
+            column = 0
+            if header and 'voter_id' in [h.strip().lower() for h in header]:
+                column = [h.strip().lower() for h in header].index('voter_id')
+            elif header and header[0].strip():
+                yield header[0].strip()
+            for row in reader:
+                if len(row) > column and row[column].strip():
+                    yield row[column].strip()
+        else:
+            for line in f:
+                if line.strip():
+                    yield line.strip()
+
+
+class Keystore:
+    """Keystore SQLite des clés privées, indexé par ID haché et par ID d'électeur"""
+
+    def __init__(self, keystore_file):
+        self.keystore_file = keystore_file
+        self.conn = sqlite3.connect(keystore_file)
+        with self.conn:
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS private_keys ('
+                'hashed_id TEXT PRIMARY KEY, voter_id TEXT NOT NULL UNIQUE, private_key TEXT NOT NULL)'
+            )
+
+    def add_many(self, entries):
+        """
+        Ajoute des clés privées en une seule transaction
+        Entrée: entries (list): tuples (hashed_id, voter_id, private_key_pem)
+        """
+        with self.conn:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO private_keys (hashed_id, voter_id, private_key) VALUES (?, ?, ?)',
+                entries
+            )
+
+    def get_private_key(self, voter_id):
+        """Retourne la clé privée PEM d'un électeur (None si absente)"""
+        row = self.conn.execute(
+            'SELECT private_key FROM private_keys WHERE voter_id = ?', (voter_id,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def count(self):
+        """Nombre de clés dans le keystore"""
+        return self.conn.execute('SELECT COUNT(*) FROM private_keys').fetchone()[0]
+
+    def close(self):
+        self.conn.close()
+
+
+def bulk_register(db, roster, keystore_file, hash_algorithm='sha256', workers=None,
+                  signature_scheme=DEFAULT_SIGNATURE_SCHEME):
+    """
+    Enregistre en masse les électeurs d'une liste
+    Entrée:
+        - db: base de données (VotingDatabase ou SQLiteVotingDatabase)
+        - roster (iterable): IDs des électeurs (voir read_roster)
+        - keystore_file (str): Keystore SQLite où écrire les clés privées
+        - hash_algorithm (str): Algorithme de hachage des IDs
+        - workers (int): Processus de génération de clés (défaut: tous les cœurs)
+        - signature_scheme (str): Schéma de signature des clés générées
+    Retourne: dict {'registered', 'already_registered', 'duplicates', 'duration_seconds'}
+    """
+    start_time = time.perf_counter()
+
+    # Étape 1: hachage en lot et élimination des doublons / déjà enregistrés
+    pending = {}
+    duplicates = 0
+    already_registered = 0
+    roster = iter(roster)
+    while True:
+        batch = list(islice(roster, 4096))
+        if not batch:
+            break
+        for voter_id, hashed_id in zip(batch, HashFunctions.hash_many(batch, hash_algorithm)):
+            if hashed_id in pending:
+                duplicates += 1
+            elif db.is_voter_registered(hashed_id):
+                already_registered += 1
+            else:
+                pending[hashed_id] = voter_id
+    print(f"✓ {len(pending)} électeurs à enregistrer "
+          f"({already_registered} déjà enregistrés, {duplicates} doublons)")
+
+    # Étape 2: génération parallèle des paires de clés
+    workers = workers or os.cpu_count() or 1
+    print(f"🔐 Génération de {len(pending)} paires de clés sur {workers} processus...")
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        key_pairs = list(pool.map(generate_key_pair, [signature_scheme] * len(pending),
+                                  chunksize=max(1, len(pending) // (workers * 8))))
+
+    # Étape 3: enregistrement en une transaction, puis clés privées dans le keystore
+    # pour les seuls électeurs acceptés (un électeur enregistré entre-temps garde sa clé)
+    entries = list(zip(pending.keys(), pending.values(), key_pairs))
+    results = db.register_voters(
+        [(hashed_id, public_key_pem, signature_scheme)
+         for hashed_id, _, (_, public_key_pem) in entries]
+    )
+    keystore = Keystore(keystore_file)
+    try:
+        keystore.add_many(
+            (hashed_id, voter_id, private_key_pem)
+            for (hashed_id, voter_id, (private_key_pem, _)), accepted in zip(entries, results)
+            if accepted
+        )
+    finally:
+        keystore.close()
+
+    registered = sum(results)
+    print(f"✓ {registered} électeurs enregistrés, clés privées dans {keystore_file}")
+    return {
+        'registered': registered,
+        'already_registered': already_registered + len(results) - registered,
+        'duplicates': duplicates,
+        'duration_seconds': round(time.perf_counter() - start_time, 3)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Enregistrement en masse des électeurs")
+    parser.add_argument('roster', help="Liste électorale (CSV ou un ID par ligne)")
+    parser.add_argument('--db', default='votes.json', help="Base de données des votes")
+    parser.add_argument('--keystore', default='keystore.db', help="Keystore SQLite des clés privées")
+    parser.add_argument('--workers', type=int, default=None, help="Processus de génération de clés")
+    parser.add_argument('--hash', default=None, help="Algorithme de hachage des IDs (défaut: celui de l'élection)")
+    parser.add_argument('--scheme', default=None, help="Schéma de signature (défaut: celui de l'élection)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.roster):
+        print(f"❌ Liste introuvable: {args.roster}")
+        sys.exit(1)
+
+    db = open_database(args.db)
+    scheme = args.scheme or db.get_setting('signature_scheme', DEFAULT_SIGNATURE_SCHEME)
+    hash_algorithm = args.hash or db.get_setting('hash_algorithm', DEFAULT_HASH_ALGORITHM)
+    summary = bulk_register(db, read_roster(args.roster), args.keystore, hash_algorithm, args.workers, scheme)
+    db.close()
+    print(f"⏱️  Terminé en {summary['duration_seconds']} s")
+
+
+if __name__ == '__main__':
+    main()
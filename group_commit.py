@@ -0,0 +1,123 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class GroupCommitter:
+    """
+    Validation groupée des bulletins vérifiés
+    Les soumissions concurrentes sont mises en file; un thread unique les écrit
+    par groupes (toutes les max_delay_ms ou dès max_batch bulletins) avec un seul
+    fsync par groupe. Chaque appelant n'obtient sa réponse qu'une fois son groupe
+    sur disque.
+    """
+
+    def __init__(self, db, max_delay_ms=5, max_batch=64):
+        """
+        Entrée:
+            - db: VotingDatabase ou SQLiteVotingDatabase (doit fournir record_ballots)
+            - max_delay_ms (float): Attente maximale avant d'écrire un groupe incomplet
+            - max_batch (int): Taille maximale d'un groupe
+        """
+        self.db = db
+        self.max_delay = max_delay_ms / 1000.0
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        # Protège _closed et la mise en file: aucun bulletin n'entre après la sentinelle
+        self._lock = threading.Lock()
+        self._closed = False
+        self.groups_committed = 0
+        self.ballots_committed = 0
+        self._thread = threading.Thread(target=self._run, name='group-commit', daemon=True)
+        self._thread.start()
+
+    def submit(self, hashed_id, vote_message, vote_hash, signature_b64, candidate):
+        """
+        Met un bulletin vérifié en file pour la prochaine validation groupée
+        Retourne: Future dont le résultat est True (enregistré) ou False (déjà voté)
+        """
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("GroupCommitter arrêté")
+            self._queue.put(((hashed_id, vote_message, vote_hash, signature_b64, candidate), future))
+        return future
+
+    def commit(self, hashed_id, vote_message, vote_hash, signature_b64, candidate):
+        """
+        Soumet un bulletin et attend que son groupe soit durable
+        Retourne: True si enregistré, False si l'électeur a déjà voté
+        """
+        return self.submit(hashed_id, vote_message, vote_hash, signature_b64, candidate).result()
+
+    def get_stats(self):
+        """Retourne les compteurs de validation groupée"""
+        return {
+            'groups_committed': self.groups_committed,
+            'ballots_committed': self.ballots_committed,
+            'average_group_size': (self.ballots_committed / self.groups_committed)
+                                  if self.groups_committed else 0,
+            'pending': self._queue.qsize()
+        }
+
+    def close(self):
+        """Écrit les bulletins en attente puis arrête le thread de validation"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        try:
+            self._write_groups()
+        finally:
+            with self._lock:
+                self._closed = True
+            self._fail_pending()
+
+    def _fail_pending(self):
+        """Bulletins restés en file à l'arrêt du thread: l'appelant reçoit une erreur au lieu d'attendre"""
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not None and not item[1].done():
+                item[1].set_exception(RuntimeError("GroupCommitter arrêté"))
+
+    def _write_groups(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._write(batch)
+
+    def _write(self, batch):
+        try:
+            results = self.db.record_ballots([ballot for ballot, _ in batch], sync=True)
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        self.groups_committed += 1
+        self.ballots_committed += sum(1 for r in results if r)
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
@@ -86,12 +86,24 @@ class VotingSystemGUI:
     def init_system(self):
         """Initialise le système de vote"""
         try:
+            self._load_step = 0
             self.system = VotingSystem(db_file='votes_gui.json', 
-                                      hash_algorithm=self.hash_algorithm.get())
+                                      load_progress=self.log_load_progress)
+            # Algorithme enregistré pour l'élection
+            self.hash_algorithm.set(self.system.hash_algorithm)
             self.log_message("Système initialisé avec succès", "info")
         except Exception as e:
             self.log_message(f"Erreur d'initialisation: {e}", "error")
     
+    def log_load_progress(self, bytes_read, total_bytes):
+        """Affiche l'avancement du chargement de la base (par paliers de 25%)"""
+        if not total_bytes:
+            return
+        step = bytes_read * 4 // total_bytes
+        if step > self._load_step:
+            self._load_step = step
+            self.log_message(f"Chargement de la base: {step * 25}% ({bytes_read // 1024} Ko)", "info")
+    
     def create_election_tab(self):
         """Crée l'onglet de configuration de l'élection"""
         # Frame principale avec padding
@@ -112,6 +124,14 @@ class VotingSystemGUI:
                        variable=self.hash_algorithm, value="sha256",
                        command=self.update_algorithm).pack(anchor=tk.W, pady=5)
         
+        ttk.Radiobutton(algo_frame, text="SHA3-256", 
+                       variable=self.hash_algorithm, value="sha3_256",
+                       command=self.update_algorithm).pack(anchor=tk.W, pady=5)
+        
+        ttk.Radiobutton(algo_frame, text="BLAKE2b (256 bits, plus rapide)", 
+                       variable=self.hash_algorithm, value="blake2b",
+                       command=self.update_algorithm).pack(anchor=tk.W, pady=5)
+        
         
         # Configuration des candidats
         candidates_frame = ttk.LabelFrame(main_frame, text="Liste des Candidats", padding="10")
@@ -160,6 +180,9 @@ class VotingSystemGUI:
                   command=self.register_voter,
                   style="Primary.TButton").grid(row=0, column=2, padx=(20, 0), pady=5)
         
+        ttk.Button(register_frame, text="📇 Charger la liste électorale",
+                  command=self.load_eligibility_index).grid(row=1, column=2, padx=(20, 0), pady=5)
+        
         # Frame d'affichage des électeurs
         voters_frame = ttk.LabelFrame(main_frame, text="Électeurs Enregistrés", padding="10")
         voters_frame.pack(fill=tk.BOTH, expand=True)
@@ -319,8 +342,13 @@ class VotingSystemGUI:
     def update_algorithm(self):
         """Met à jour l'algorithme de hachage"""
         if self.system:
-            self.system.hash_algorithm = self.hash_algorithm.get()
-            self.log_message(f"Algorithme changé en {self.hash_algorithm.get().upper()}", "info")
+            try:
+                self.system.set_hash_algorithm(self.hash_algorithm.get())
+                self.log_message(f"Algorithme changé en {self.hash_algorithm.get().upper()}", "info")
+            except ValueError as e:
+                self.hash_algorithm.set(self.system.hash_algorithm)
+                self.log_message(f"Changement d'algorithme refusé: {e}", "error")
+                messagebox.showerror("Erreur", str(e))
     
     def load_existing_candidates(self):
         """Charge les candidats existants depuis la base de données"""
@@ -405,6 +433,29 @@ class VotingSystemGUI:
             self.log_message(f"Erreur lors de l'enregistrement: {e}", "error")
             messagebox.showerror("Erreur", f"Erreur: {e}")
     
+    def load_eligibility_index(self):
+        """Charge un index d'éligibilité (.idx) ou le construit depuis une liste électorale"""
+        filename = filedialog.askopenfilename(
+            title="Sélectionner la liste électorale ou son index",
+            filetypes=[("Index d'éligibilité", "*.idx"), ("Listes électorales", "*.csv *.txt"),
+                       ("Tous les fichiers", "*.*")]
+        )
+        if not filename:
+            return
+        
+        try:
+            if not filename.endswith('.idx'):
+                from eligibility_index import build_index_from_roster
+                index_file = os.path.splitext(filename)[0] + '.idx'
+                count = build_index_from_roster(filename, index_file, self.system.hash_algorithm)
+                self.log_message(f"Index construit: {count} électeurs -> {index_file}", "info")
+                filename = index_file
+            index = self.system.load_eligibility_index(filename)
+            self.log_message(f"Liste électorale chargée: {len(index)} électeurs", "success")
+        except Exception as e:
+            self.log_message(f"Erreur lors du chargement de la liste électorale: {e}", "error")
+            messagebox.showerror("Erreur", f"Erreur: {e}")
+    
     def refresh_voters_list(self):
         """Rafraîchit la liste des électeurs"""
         if not self.system:
@@ -414,15 +465,11 @@ class VotingSystemGUI:
         for item in self.voters_tree.get_children():
             self.voters_tree.delete(item)
         
-        # Récupérer les données depuis la base de données
+        # Récupérer les électeurs depuis la base déjà chargée (sans relire le fichier)
         try:
-            with open(self.system.db.db_file, 'r') as f:
-                import json
-                data = json.load(f)
-            
-            for hashed_id, info in data.get('registered_voters', {}).items():
-                voted = "✓" if info.get('has_voted') else "✗"
-                date = info.get('registration_date', 'N/A')
+            for hashed_id, has_voted, registration_date in self.system.db.iter_voters():
+                voted = "✓" if has_voted else "✗"
+                date = registration_date or 'N/A'
                 self.voters_tree.insert('', tk.END, values=(hashed_id[:50] + "...", voted, date))
                 
         except Exception as e:
@@ -437,16 +484,15 @@ class VotingSystemGUI:
             return
         
         try:
-            # Vérifier l'enregistrement
-            voter = self.system.db
-            hashed_id = self.hash_voter_id(voter_id)
+            # Vérifier l'enregistrement (index d'éligibilité d'abord s'il est chargé)
+            eligible, reason = self.system.check_eligibility(voter_id)
             
-            if not voter.is_voter_registered(hashed_id):
+            if reason == 'not_registered':
                 self.vote_status.config(text="❌ Électeur non enregistré", foreground="red")
                 self.vote_button.config(state='disabled')
                 return
             
-            if voter.has_voted(hashed_id):
+            if reason == 'already_voted':
                 self.vote_status.config(text="❌ Vous avez déjà voté!", foreground="red")
                 self.vote_button.config(state='disabled')
                 return
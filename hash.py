@@ -1,8 +1,41 @@
 import hashlib
+from functools import lru_cache, partial
+
+# Algorithmes de hachage disponibles (empreintes de 32 octets: les IDs hachés gardent
+# la même taille quel que soit l'algorithme de l'élection)
+HASH_ALGORITHMS = {
+    'sha256': hashlib.sha256,
+    'sha3_256': hashlib.sha3_256,
+    'blake2b': partial(hashlib.blake2b, digest_size=32),
+}
+
+DEFAULT_HASH_ALGORITHM = 'sha256'
+
+# Nombre d'IDs d'électeurs hachés gardés en mémoire (plusieurs hachages du même ID par vote)
+VOTER_ID_CACHE_SIZE = 65536
+
+
+def get_hash_function(name=None):
+    """
+    Retourne le constructeur hashlib d'un algorithme
+    Lève: ValueError si l'algorithme est inconnu
+    """
+    name = name or DEFAULT_HASH_ALGORITHM
+    try:
+        return HASH_ALGORITHMS[name]
+    except KeyError:
+        raise ValueError(f"Algorithme non supporté: {name}. "
+                         f"Choix possibles: {', '.join(HASH_ALGORITHMS)}") from None
+
+
+@lru_cache(maxsize=VOTER_ID_CACHE_SIZE)
+def _hash_voter_id(voter_id, algorithm):
+    return HashFunctions.hash(voter_id, algorithm)
+
 
 class HashFunctions:
     """Fonctions de hachage cryptographique"""
-    
+
     @staticmethod
     def sha256(data):
         """
@@ -13,29 +46,56 @@ class HashFunctions:
         if isinstance(data, str):
             data = data.encode('utf-8')
         return hashlib.sha256(data).hexdigest()
-    
-    
-    
+
+    @staticmethod
+    def hash(data, algorithm=DEFAULT_HASH_ALGORITHM):
+        """
+        Hachage avec l'algorithme choisi
+        Entrée: data (str ou bytes), algorithm (str): 'sha256', 'sha3_256' ou 'blake2b'
+        Sortie: hash en hexadécimal (str)
+        """
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        return get_hash_function(algorithm)(data).hexdigest()
+
     @staticmethod
-    def hash_voter_id(voter_id, algorithm='sha256'):
+    def hash_many(items, algorithm=DEFAULT_HASH_ALGORITHM):
         """
-        Hache l'ID d'un votant
+        Hache une série de valeurs (algorithme résolu une seule fois, sans passer par le cache)
+        Entrée: items (iterable de str ou bytes), algorithm (str)
+        Sortie: liste des hashs en hexadécimal, dans l'ordre
+        """
+        function = get_hash_function(algorithm)
+        return [
+            function(item.encode('utf-8') if isinstance(item, str) else item).hexdigest()
+            for item in items
+        ]
+
+    @staticmethod
+    def hash_voter_id(voter_id, algorithm=DEFAULT_HASH_ALGORITHM):
+        """
+        Hache l'ID d'un votant (résultat mémorisé dans un cache LRU borné)
         Entrée: voter_id (str), algorithm (str)
         Sortie: hash de l'ID
         """
-        if algorithm == 'sha256':
-            return HashFunctions.sha256(voter_id)
-        else:
-            raise ValueError("Algorithme non supporté. Utilisez 'sha256'")
-    
+        return _hash_voter_id(voter_id, algorithm)
+
     @staticmethod
-    def hash_vote(vote_message, algorithm='sha256'):
+    def hash_vote(vote_message, algorithm=DEFAULT_HASH_ALGORITHM):
         """
         Hache le message de vote (ex: "Je vote Candidat A")
         Entrée: vote_message (str), algorithm (str)
         Sortie: hash du vote
         """
-        if algorithm == 'sha256':
-            return HashFunctions.sha256(vote_message)
-        else:
-            raise ValueError("Algorithme non supporté. Utilisez 'sha256'")
\ No newline at end of file
+        return HashFunctions.hash(vote_message, algorithm)
+
+    @staticmethod
+    def clear_cache():
+        """Vide le cache des IDs hachés (réinitialisation de l'élection)"""
+        _hash_voter_id.cache_clear()
+
+    @staticmethod
+    def get_cache_stats():
+        """Retourne les compteurs du cache des IDs hachés"""
+        info = _hash_voter_id.cache_info()
+        return {'size': info.currsize, 'max_size': info.maxsize, 'hits': info.hits, 'misses': info.misses}
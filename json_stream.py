@@ -0,0 +1,141 @@
+"""
+Lecture en flux d'un document JSON (bibliothèque standard uniquement)
+Le fichier est lu par blocs et décodé élément par élément: seuls le bloc
+courant et l'élément en cours de décodage sont en mémoire, quelle que soit la
+taille du fichier.
+"""
+
+import codecs
+import json
+import os
+import re
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+# Caractères qui peuvent prolonger un nombre JSON
+_NUMBER_CHARS = frozenset('0123456789.eE+-')
+_decoder = json.JSONDecoder()
+
+
+class _Reader:
+    """Tampon de lecture par blocs avec décodage UTF-8 incrémental"""
+
+    def __init__(self, fp, chunk_size, progress=None):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        self.bytes_read = 0
+        try:
+            self.total_bytes = os.fstat(fp.fileno()).st_size
+        except (AttributeError, OSError, ValueError):
+            self.total_bytes = None
+
+    def fill(self):
+        """Ajoute un bloc au tampon; retourne False en fin de fichier"""
+        if self.eof:
+            return False
+        chunk = self.fp.read(self.chunk_size)
+        self.buffer = self.buffer[self.pos:] + self.decoder.decode(chunk, final=not chunk)
+        self.pos = 0
+        if not chunk:
+            self.eof = True
+            return False
+        self.bytes_read += len(chunk)
+        if self.progress:
+            self.progress(self.bytes_read, self.total_bytes)
+        return True
+
+    def peek(self):
+        """Premier caractère significatif ('' en fin de fichier)"""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer) or not self.fill():
+                return self.buffer[self.pos:self.pos + 1]
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"JSON invalide: '{char}' attendu à l'octet ~{self.bytes_read}")
+        self.pos += 1
+
+    def value(self):
+        """Décode la valeur JSON suivante (complétée bloc par bloc au besoin)"""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+                # Une valeur qui touche la fin du tampon peut être tronquée (nombre), de même
+                # qu'un nombre suivi d'un caractère de nombre ('12' puis '.5' au bloc suivant)
+                if self.eof or (end < len(self.buffer) and self.buffer[end] not in _NUMBER_CHARS):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.fill()
+
+
+def _members(reader):
+    """Parcourt les clés d'un objet; l'appelant lit la valeur avant de reprendre"""
+    reader.expect('{')
+    if reader.peek() == '}':
+        reader.pos += 1
+        return
+    while True:
+        key = reader.value()
+        reader.expect(':')
+        yield key
+        separator = reader.peek()
+        reader.pos += 1
+        if separator == '}':
+            return
+        if separator != ',':
+            raise ValueError(f"JSON invalide: ',' ou '}}' attendu à l'octet ~{reader.bytes_read}")
+
+
+def _elements(reader):
+    """Parcourt les positions d'un tableau; l'appelant lit l'élément avant de reprendre"""
+    reader.expect('[')
+    if reader.peek() == ']':
+        reader.pos += 1
+        return
+    index = 0
+    while True:
+        yield index
+        index += 1
+        separator = reader.peek()
+        reader.pos += 1
+        if separator == ']':
+            return
+        if separator != ',':
+            raise ValueError(f"JSON invalide: ',' ou ']' attendu à l'octet ~{reader.bytes_read}")
+
+
+def iter_json_object(fp, streamed=(), chunk_size=1 << 16, progress=None):
+    """
+    Parcourt un objet JSON de premier niveau sans le charger entièrement
+    Entrée:
+        - fp: fichier ouvert en mode binaire
+        - streamed (tuple): clés dont la valeur (objet ou tableau) est parcourue élément par élément
+        - chunk_size (int): taille des blocs lus
+        - progress (callable): appelée avec (octets lus, taille du fichier ou None)
+    Retourne: générateur de (clé, sous-clé, valeur)
+        - clé parcourue en flux: sous-clé = clé de l'élément (objet) ou son index (tableau)
+        - autre clé: sous-clé = None et valeur complète
+    Lève: ValueError si le document est invalide ou tronqué
+    """
+    reader = _Reader(fp, chunk_size, progress)
+    for key in _members(reader):
+        container = reader.peek() if key in streamed else None
+        if container == '{':
+            for item_key in _members(reader):
+                yield key, item_key, reader.value()
+        elif container == '[':
+            for index in _elements(reader):
+                yield key, index, reader.value()
+        else:
+            yield key, None, reader.value()
+    if reader.peek() != '':
+        raise ValueError("JSON invalide: données après l'objet principal")
@@ -0,0 +1,121 @@
+import multiprocessing
+import queue
+import threading
+
+from signature import DEFAULT_SIGNATURE_SCHEME, get_signature_scheme
+
+
+def generate_key_pair(signature_scheme=DEFAULT_SIGNATURE_SCHEME):
+    """Génère une paire de clés et la retourne au format PEM (private, public)"""
+    return get_signature_scheme(signature_scheme).generate_key_pair()
+
+
+def _worker(key_queue, depth, refill, stop, high_watermark, signature_scheme):
+    """
+    Boucle d'un processus générateur: remplit la file tant que la profondeur
+    n'a pas atteint le seuil haut, puis attend le signal de remplissage
+    """
+    while not stop.is_set():
+        if not refill.wait(timeout=0.5):
+            continue
+        key_pair = generate_key_pair(signature_scheme)
+        key_queue.put(key_pair)
+        with depth.get_lock():
+            depth.value += 1
+            if depth.value >= high_watermark:
+                refill.clear()
+
+
+class KeyPool:
+    """
+    Réserve de paires de clés pré-générées en arrière-plan
+    Des processus générateurs maintiennent la file entre un seuil bas et un
+    seuil haut; l'enregistrement d'un électeur prend simplement une paire
+    dans la file, avec repli sur une génération immédiate si elle est vide.
+    """
+
+    def __init__(self, workers=2, low_watermark=16, high_watermark=64,
+                 signature_scheme=DEFAULT_SIGNATURE_SCHEME):
+        """
+        Entrée:
+            - workers (int): Nombre de processus générateurs
+            - low_watermark (int): Profondeur sous laquelle la génération reprend
+            - high_watermark (int): Profondeur à laquelle la génération s'arrête
+            - signature_scheme (str): Schéma des clés générées
+        """
+        if not 0 <= low_watermark < high_watermark:
+            raise ValueError("Il faut 0 <= low_watermark < high_watermark")
+        self.workers = workers
+        self.low_watermark = low_watermark
+        self.high_watermark = high_watermark
+        get_signature_scheme(signature_scheme)
+        self.signature_scheme = signature_scheme
+
+        context = multiprocessing.get_context('spawn')
+        self._queue = context.Queue(maxsize=high_watermark + workers)
+        self._depth = context.Value('i', 0)
+        self._refill = context.Event()
+        self._stop = context.Event()
+        self._refill.set()
+        self._processes = [
+            context.Process(
+                target=_worker,
+                args=(self._queue, self._depth, self._refill, self._stop,
+                      high_watermark, signature_scheme),
+                daemon=True
+            )
+            for _ in range(workers)
+        ]
+        for process in self._processes:
+            process.start()
+
+        self._lock = threading.Lock()
+        self.taken = 0
+        self.fallbacks = 0
+
+    def take(self):
+        """
+        Retourne une paire de clés (private_key_pem, public_key_pem)
+        Génère la paire immédiatement si la réserve est vide.
+        """
+        try:
+            key_pair = self._queue.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                self.fallbacks += 1
+            self._refill.set()
+            return generate_key_pair(self.signature_scheme)
+
+        with self._depth.get_lock():
+            self._depth.value -= 1
+            if self._depth.value <= self.low_watermark:
+                self._refill.set()
+        with self._lock:
+            self.taken += 1
+        return key_pair
+
+    def get_metrics(self):
+        """Retourne les métriques de la réserve"""
+        with self._lock:
+            taken, fallbacks = self.taken, self.fallbacks
+        return {
+            'queue_depth': self._depth.value,
+            'low_watermark': self.low_watermark,
+            'high_watermark': self.high_watermark,
+            'refilling': self._refill.is_set(),
+            'workers': self.workers,
+            'signature_scheme': self.signature_scheme,
+            'taken_from_pool': taken,
+            'inline_fallbacks': fallbacks
+        }
+
+    def close(self):
+        """Arrête les processus générateurs"""
+        self._stop.set()
+        self._refill.set()
+        for process in self._processes:
+            process.join(timeout=2)
+            if process.is_alive():
+                process.terminate()
+        self._queue.cancel_join_thread()
+        self._queue.close()
@@ -0,0 +1,276 @@
+"""
+Résultats publiés en direct (tableaux de bord, soir d'élection)
+Le décompte porte un numéro de version (db.get_tally_version) qui ne change
+qu'à la validation d'un bulletin: les résultats sont calculés et sérialisés
+une seule fois par version, puis resservis tels quels. La version sert d'ETag,
+de sorte qu'un client à jour reçoit un 304 sans aucun calcul.
+
+Le flux Server-Sent Events diffuse l'écart du décompte à chaque nouvelle
+version (identifiant d'événement = version): un seul fil calcule et sérialise
+chaque écart, tous les abonnés reçoivent les mêmes octets.
+"""
+
+import json
+import threading
+from collections import deque, namedtuple
+from contextlib import contextmanager
+from datetime import datetime
+
+# Durée (secondes) pendant laquelle un client ou un proxy peut resservir les résultats
+RESULTS_MAX_AGE = 1
+# Flux en direct: diffusions par seconde au plus, événements gardés pour la reprise,
+# commentaire de maintien de connexion (secondes)
+STREAM_MAX_RATE = 2
+STREAM_HISTORY = 256
+STREAM_HEARTBEAT = 15
+
+# Commentaire SSE de maintien de connexion
+KEEPALIVE = b': keepalive\n\n'
+
+CachedResults = namedtuple('CachedResults', ['version', 'etag', 'payload', 'body'])
+
+
+def results_payload(system, version):
+    """Résultats publiés pour une version du décompte (candidats sans voix compris)"""
+    stats = system.db.get_statistics()
+    return {
+        'version': version,
+        'resultats': {candidate: stats['results'].get(candidate, 0) for candidate in system.get_candidates()},
+        'total': stats['total_votes'],
+        'timestamp': datetime.now().isoformat()
+    }
+
+
+def site_stats(system):
+    """Statistiques des pages du site et de /api/stats"""
+    stats = system.db.get_statistics()
+    candidates = system.get_candidates()
+    return {
+        'total_registered': stats['total_registered'],
+        'total_voted': stats['total_voted'],
+        'total_votes': stats['total_votes'],
+        'participation_rate': round(stats['participation_rate'], 1),
+        'results': {candidate: stats['results'].get(candidate, 0) for candidate in candidates},
+        'candidates': candidates,
+        'candidates_count': len(candidates)
+    }
+
+
+class ResultsCache:
+    """Résultats sérialisés, recalculés uniquement quand la version du décompte change"""
+
+    def __init__(self, system):
+        self.system = system
+        self._entry = None
+        self._lock = threading.Lock()
+        self.builds = 0
+
+    def current(self):
+        """
+        Retourne les résultats de la version courante (CachedResults)
+        Un seul thread recalcule une version nouvelle; les autres attendent son résultat.
+        """
+        version = self.system.db.get_tally_version()
+        entry = self._entry
+        if entry is not None and entry.version == version:
+            return entry
+        with self._lock:
+            entry = self._entry
+            if entry is None or entry.version != version:
+                # Version lue avant le calcul: au pire le contenu est plus récent que la version
+                payload = results_payload(self.system, version)
+                entry = CachedResults(version, f'"v{version}"', payload,
+                                      json.dumps(payload, ensure_ascii=False).encode('utf-8'))
+                self._entry = entry
+                self.builds += 1
+        return entry
+
+    @staticmethod
+    def not_modified(entry, if_none_match):
+        """True si l'en-tête If-None-Match désigne déjà cette version"""
+        if not if_none_match:
+            return False
+        tags = [tag.strip() for tag in if_none_match.split(',')]
+        return '*' in tags or entry.etag in tags or f'W/{entry.etag}' in tags
+
+    @staticmethod
+    def headers(entry):
+        """En-têtes HTTP de mise en cache d'une réponse (200 ou 304)"""
+        return {
+            'ETag': entry.etag,
+            'Cache-Control': f'public, max-age={RESULTS_MAX_AGE}, must-revalidate'
+        }
+
+
+def sse_event(event, event_id, data):
+    """Événement Server-Sent Events sérialisé (octets UTF-8)"""
+    return (f"id: {event_id}\nevent: {event}\n"
+            f"data: {json.dumps(data, ensure_ascii=False)}\n\n").encode('utf-8')
+
+
+class ResultsBroadcaster:
+    """
+    Diffusion en direct des résultats à tous les abonnés
+    Un fil lit la version du décompte à chaque tic (au plus max_rate par seconde,
+    les bulletins validés entre deux tics sont regroupés). Si elle a changé, l'écart
+    avec la diffusion précédente est calculé et sérialisé une seule fois, quel que
+    soit le nombre d'abonnés. Les derniers événements sont gardés pour qu'un client
+    qui se reconnecte avec Last-Event-ID reçoive ce qu'il a manqué.
+    """
+
+    def __init__(self, cache, max_rate=STREAM_MAX_RATE, history=STREAM_HISTORY, heartbeat=STREAM_HEARTBEAT):
+        """
+        Entrée:
+            - cache (ResultsCache): résultats par version du décompte
+            - max_rate (float): diffusions par seconde au plus
+            - history (int): événements gardés pour la reprise
+            - heartbeat (float): secondes sans événement avant un commentaire de maintien
+        """
+        self.cache = cache
+        self.interval = 1 / max_rate
+        self.heartbeat = heartbeat
+        self._events = deque(maxlen=history)  # (numéro, version, octets SSE)
+        self._seq = 0
+        self._last = None                     # CachedResults de la dernière diffusion
+        self._snapshot = None                 # (version, octets SSE) de l'état complet
+        self._changed = threading.Condition()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._listeners = []
+        self.ticks = 0
+        self.subscribers = 0
+
+    def start(self):
+        """Démarre le fil de diffusion (au premier abonné)"""
+        with self._changed:
+            if self._thread is None:
+                self._last = self.cache.current()
+                self._thread = threading.Thread(target=self._run, name='results-broadcaster', daemon=True)
+                self._thread.start()
+
+    def add_listener(self, callback):
+        """
+        Appelle callback() après chaque diffusion (depuis le fil de diffusion):
+        réveil d'abonnés qui n'attendent pas sur la condition, ex: boucle asyncio
+        """
+        self._listeners.append(callback)
+
+    @contextmanager
+    def subscription(self):
+        """Compte un abonné pendant la durée de son flux"""
+        with self._changed:
+            self.subscribers += 1
+        try:
+            yield
+        finally:
+            with self._changed:
+                self.subscribers -= 1
+
+    @property
+    def closed(self):
+        return self._stopped.is_set()
+
+    def close(self):
+        self._stopped.set()
+        with self._changed:
+            self._changed.notify_all()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                entry = self.cache.current()
+            except Exception as e:  # base momentanément indisponible: nouvel essai au tic suivant
+                print(f"⚠️  Diffusion des résultats: {e}")
+                continue
+            self.ticks += 1
+            if entry.version != self._last.version:
+                self._publish(entry)
+
+    def _publish(self, entry):
+        """Diffuse l'écart entre la dernière diffusion et entry"""
+        previous = self._last.payload['resultats']
+        current = entry.payload['resultats']
+        delta = {
+            candidate: current.get(candidate, 0) - previous.get(candidate, 0)
+            for candidate in {**previous, **current}
+            if current.get(candidate, 0) != previous.get(candidate, 0)
+        }
+        chunk = sse_event('delta', entry.version,
+                          {'version': entry.version, 'delta': delta, 'total': entry.payload['total']})
+        with self._changed:
+            self._seq += 1
+            self._events.append((self._seq, entry.version, chunk))
+            self._last = entry
+            self._changed.notify_all()
+        for callback in list(self._listeners):
+            try:
+                callback()
+            except Exception as e:  # abonné défaillant retiré: les autres sont toujours réveillés
+                print(f"⚠️  Abonné aux résultats retiré: {e}")
+                self._listeners.remove(callback)
+
+    def _snapshot_event(self):
+        """État complet de la dernière diffusion (sérialisé une fois par version)"""
+        entry = self._last
+        snapshot = self._snapshot
+        if snapshot is None or snapshot[0] != entry.version:
+            snapshot = self._snapshot = (entry.version, sse_event('snapshot', entry.version, entry.payload))
+        return snapshot[1]
+
+    def resume(self, last_event_id=None):
+        """
+        Point de départ d'un abonné
+        Entrée: last_event_id (str): dernier événement reçu (en-tête Last-Event-ID)
+        Retourne: (numéro du dernier événement couvert, octets à envoyer d'abord)
+            - événement encore en mémoire: seuls les événements suivants seront envoyés
+            - sinon (premier abonnement, reprise trop ancienne): état complet
+        """
+        self.start()
+        with self._changed:
+            if last_event_id is not None:
+                for number, version, _ in self._events:
+                    if str(version) == last_event_id.strip():
+                        return number, []
+            return self._seq, [self._snapshot_event()]
+
+    def pending(self, cursor):
+        """
+        Événements postérieurs à cursor
+        Retourne: (nouveau curseur, octets à envoyer) - l'état complet si des
+        événements ont déjà quitté l'historique
+        """
+        with self._changed:
+            if self._seq == cursor:
+                return cursor, []
+            if self._events and self._events[0][0] > cursor + 1:
+                return self._seq, [self._snapshot_event()]
+            chunks = []
+            for number, _, chunk in reversed(self._events):
+                if number <= cursor:
+                    break
+                chunks.append(chunk)
+            chunks.reverse()
+            return self._seq, chunks
+
+    def stream(self, last_event_id=None):
+        """
+        Flux SSE bloquant pour un abonné (générateur d'octets, serveur WSGI)
+        Attend les nouvelles diffusions; commentaire de maintien toutes les heartbeat secondes.
+        """
+        cursor, backlog = self.resume(last_event_id)
+        with self.subscription():
+            yield self.retry_field()
+            yield from backlog
+            while not self._stopped.is_set():
+                with self._changed:
+                    if self._seq == cursor:
+                        self._changed.wait(self.heartbeat)
+                cursor, chunks = self.pending(cursor)
+                if chunks:
+                    yield from chunks
+                else:
+                    yield KEEPALIVE
+
+    def retry_field(self):
+        """Délai de reconnexion conseillé au client (début de flux)"""
+        return f"retry: {int(self.interval * 1000) + 1000}\n\n".encode('utf-8')
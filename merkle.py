@@ -0,0 +1,124 @@
+from hash import HashFunctions
+
+# Séparation de domaine: une feuille ne peut pas être confondue avec un nœud interne
+LEAF_PREFIX = b'\x00'
+NODE_PREFIX = b'\x01'
+
+
+def ballot_leaf_hash(voter_hash, vote_hash, signature_b64):
+    """
+    Hash de feuille d'un bulletin (engage l'électeur, le vote et la signature)
+    Retourne: hash SHA-256 en hexadécimal
+    """
+    data = f"{voter_hash}|{vote_hash}|{signature_b64}".encode('utf-8')
+    return HashFunctions.sha256(LEAF_PREFIX + data)
+
+
+def node_hash(left, right):
+    """Hash d'un nœud interne à partir de ses deux enfants (hexadécimal)"""
+    return HashFunctions.sha256(NODE_PREFIX + bytes.fromhex(left) + bytes.fromhex(right))
+
+
+class ListNodes:
+    """Stockage en mémoire des nœuds: une liste de hashs par niveau"""
+
+    def __init__(self):
+        self.levels = [[]]
+
+    def depth(self):
+        return len(self.levels)
+
+    def size(self, level):
+        return len(self.levels[level]) if level < len(self.levels) else 0
+
+    def get(self, level, index):
+        return self.levels[level][index]
+
+    def put(self, level, index, value):
+        if level == len(self.levels):
+            self.levels.append([])
+        nodes = self.levels[level]
+        if index < len(nodes):
+            nodes[index] = value
+        else:
+            nodes.append(value)
+
+
+class MerkleTree:
+    """
+    Arbre de Merkle incrémental sur les bulletins enregistrés
+    Ajout d'une feuille en O(log n): seul le chemin le plus à droite est recalculé.
+    Un nœud sans frère est remonté tel quel au niveau supérieur.
+    """
+
+    def __init__(self, nodes=None):
+        self.nodes = nodes if nodes is not None else ListNodes()
+
+    def size(self):
+        """Nombre de feuilles"""
+        return self.nodes.size(0)
+
+    def append(self, leaf_hash):
+        """
+        Ajoute une feuille et met à jour le chemin jusqu'à la racine
+        Retourne: index de la feuille
+        """
+        index = self.size()
+        self.nodes.put(0, index, leaf_hash)
+        level, position = 0, index
+        while self.nodes.size(level) > 1:
+            parent = position // 2
+            left = self.nodes.get(level, parent * 2)
+            if parent * 2 + 1 < self.nodes.size(level):
+                value = node_hash(left, self.nodes.get(level, parent * 2 + 1))
+            else:
+                value = left
+            self.nodes.put(level + 1, parent, value)
+            level, position = level + 1, parent
+        return index
+
+    def root(self):
+        """Racine courante (engagement de 32 octets en hexadécimal, None si vide)"""
+        if self.size() == 0:
+            return None
+        return self.nodes.get(self.nodes.depth() - 1, 0)
+
+    def inclusion_proof(self, index):
+        """
+        Preuve d'inclusion de la feuille index: O(log n) hashs frères
+        Retourne: liste de [côté, hash] avec côté 'left' ou 'right'
+        """
+        if not 0 <= index < self.size():
+            raise IndexError("Index de feuille hors de l'arbre")
+        proof = []
+        position = index
+        for level in range(self.nodes.depth() - 1):
+            sibling = position ^ 1
+            if sibling < self.nodes.size(level):
+                side = 'left' if sibling < position else 'right'
+                proof.append([side, self.nodes.get(level, sibling)])
+            position //= 2
+        return proof
+
+    @staticmethod
+    def verify_inclusion(leaf_hash, proof, root):
+        """
+        Vérifie hors ligne qu'une feuille appartient à l'arbre de racine root
+        Retourne: True si la preuve est valide
+        """
+        current = leaf_hash
+        for side, sibling in proof:
+            current = node_hash(sibling, current) if side == 'left' else node_hash(current, sibling)
+        return current == root
+
+
+def verify_receipt(receipt, root=None):
+    """
+    Vérifie un reçu de vote (voir VotingSystem.get_vote_receipt)
+    Entrée: root (str): racine publiée; par défaut celle contenue dans le reçu
+    Retourne: True si le bulletin est bien inclus
+    """
+    leaf = ballot_leaf_hash(receipt['voter_hash'], receipt['vote_hash'], receipt['signature'])
+    if leaf != receipt['leaf_hash']:
+        return False
+    return MerkleTree.verify_inclusion(leaf, receipt['proof'], root or receipt['root'])
@@ -0,0 +1,193 @@
+"""
+Résultats partiels par bureau de vote, fusionnables sans les registres bruts
+Chaque bureau exporte un résultat partiel (décompte par candidat, compteurs,
+électeurs ayant voté et racine de Merkle de ses bulletins). La fusion est
+associative et commutative: les partiels peuvent être regroupés par région
+puis au niveau national dans n'importe quel ordre. Un électeur présent dans
+deux partiels (double vote entre bureaux) est détecté à la fusion.
+
+Usage:
+    python partial_tally.py export votes.json --station Nord -o nord.json
+    python partial_tally.py merge nord.json sud.json -o national.json
+"""
+
+import argparse
+import json
+import sys
+
+from database import open_database
+
+FORMAT = 'partial-tally/1'
+
+
+class OverlappingVotersError(ValueError):
+    """Des électeurs figurent dans plusieurs résultats partiels"""
+
+    def __init__(self, voters):
+        self.voters = sorted(voters)
+        super().__init__(f"{len(self.voters)} électeur(s) présent(s) dans plusieurs résultats partiels")
+
+
+class PartialTally:
+    """Résultat partiel d'un ou plusieurs bureaux de vote"""
+
+    def __init__(self, results=None, total_registered=0, ballots=None, voters=(), overlapping_voters=()):
+        """
+        Entrée:
+            - results (dict): {candidat: nombre de votes}
+            - total_registered (int): électeurs inscrits
+            - ballots (dict): {bureau: {'count': bulletins, 'merkle_root': racine}}
+            - voters (iterable): IDs hachés des électeurs ayant voté
+            - overlapping_voters (iterable): électeurs déjà vus dans plusieurs partiels
+        """
+        self.results = dict(results or {})
+        self.total_registered = total_registered
+        self.ballots = dict(ballots or {})
+        self.voters = set(voters)
+        self.overlapping_voters = set(overlapping_voters)
+
+    @classmethod
+    def from_database(cls, db, station=None):
+        """
+        Construit le partiel d'un bureau à partir de sa base (compteurs et racine de Merkle,
+        sans relire les bulletins)
+        Entrée: station (str): nom du bureau (défaut: paramètre 'station' de l'élection)
+        """
+        station = station or db.get_setting('station') or db.db_file
+        stats = db.get_statistics()
+        return cls(
+            results=stats['results'],
+            total_registered=stats['total_registered'],
+            ballots={station: {'count': stats['total_votes'], 'merkle_root': db.get_merkle_root()}},
+            voters=db.iter_voted_voters()
+        )
+
+    @property
+    def stations(self):
+        return sorted(self.ballots)
+
+    @property
+    def total_votes(self):
+        return sum(entry['count'] for entry in self.ballots.values())
+
+    def merge(self, other):
+        """
+        Fusionne deux partiels (opération associative et commutative)
+        Les électeurs communs sont ajoutés à overlapping_voters au lieu d'être comptés deux fois.
+        Lève: ValueError si un même bureau figure dans les deux partiels
+        """
+        shared_stations = set(self.ballots) & set(other.ballots)
+        if shared_stations:
+            raise ValueError(f"Bureau(x) déjà inclus dans la fusion: {', '.join(sorted(shared_stations))}")
+        results = dict(self.results)
+        for candidate, count in other.results.items():
+            results[candidate] = results.get(candidate, 0) + count
+        return PartialTally(
+            results=results,
+            total_registered=self.total_registered + other.total_registered,
+            ballots={**self.ballots, **other.ballots},
+            voters=self.voters | other.voters,
+            overlapping_voters=self.overlapping_voters | other.overlapping_voters | (self.voters & other.voters)
+        )
+
+    def get_statistics(self):
+        """Retourne les résultats dans la structure de db.get_statistics()"""
+        total_voted = len(self.voters)
+        return {
+            'total_registered': self.total_registered,
+            'total_voted': total_voted,
+            'total_votes': self.total_votes,
+            'participation_rate': (total_voted / self.total_registered * 100) if self.total_registered > 0 else 0,
+            'results': {candidate: count for candidate, count in self.results.items() if count}
+        }
+
+    def to_dict(self):
+        return {
+            'format': FORMAT,
+            'results': self.results,
+            'total_registered': self.total_registered,
+            'ballots': self.ballots,
+            'voters': sorted(self.voters),
+            'overlapping_voters': sorted(self.overlapping_voters)
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get('format') != FORMAT:
+            raise ValueError(f"Format de résultat partiel inconnu: {data.get('format')}")
+        return cls(data['results'], data['total_registered'], data['ballots'],
+                   data['voters'], data.get('overlapping_voters', ()))
+
+    def save(self, filename):
+        """Écrit le partiel dans un fichier JSON"""
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+    @classmethod
+    def load(cls, filename):
+        """Lit un partiel depuis un fichier JSON"""
+        with open(filename, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+
+def merge_partials(partials, allow_overlap=False):
+    """
+    Fusionne un nombre quelconque de partiels
+    Entrée: allow_overlap (bool): conserver le résultat malgré des électeurs communs
+    Retourne: PartialTally
+    Lève: OverlappingVotersError si des électeurs ont voté dans plusieurs bureaux
+    """
+    merged = PartialTally()
+    for partial in partials:
+        merged = merged.merge(partial)
+    if merged.overlapping_voters and not allow_overlap:
+        raise OverlappingVotersError(merged.overlapping_voters)
+    return merged
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Résultats partiels par bureau de vote")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    export = subparsers.add_parser('export', help="Exporter le partiel d'un bureau")
+    export.add_argument('db_file', help="Base de données du bureau (.json ou .db)")
+    export.add_argument('--station', default=None, help="Nom du bureau")
+    export.add_argument('-o', '--output', required=True, help="Fichier du partiel")
+
+    merge = subparsers.add_parser('merge', help="Fusionner des partiels")
+    merge.add_argument('partials', nargs='+', help="Fichiers de partiels")
+    merge.add_argument('-o', '--output', default=None, help="Fichier du partiel fusionné")
+    merge.add_argument('--allow-overlap', action='store_true',
+                       help="Produire le résultat malgré des électeurs communs")
+
+    args = parser.parse_args()
+
+    if args.command == 'export':
+        db = open_database(args.db_file)
+        partial = PartialTally.from_database(db, args.station)
+        db.close()
+        partial.save(args.output)
+        print(f"✓ Partiel du bureau {partial.stations[0]}: {partial.total_votes} bulletins -> {args.output}")
+        return
+
+    try:
+        merged = merge_partials([PartialTally.load(f) for f in args.partials], args.allow_overlap)
+    except OverlappingVotersError as e:
+        print(f"❌ {e}")
+        for voter in e.voters[:10]:
+            print(f"   {voter[:32]}...")
+        sys.exit(1)
+    if merged.overlapping_voters:
+        print(f"⚠️  {len(merged.overlapping_voters)} électeur(s) présent(s) dans plusieurs bureaux")
+    if args.output:
+        merged.save(args.output)
+    stats = merged.get_statistics()
+    print(f"📊 {len(merged.stations)} bureaux, {stats['total_votes']} bulletins, "
+          f"participation {stats['participation_rate']:.1f}%")
+    for candidate, votes in sorted(stats['results'].items(), key=lambda x: x[1], reverse=True):
+        percentage = (votes / stats['total_votes'] * 100) if stats['total_votes'] > 0 else 0
+        print(f"   {candidate}: {votes} votes ({percentage:.1f}%)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,322 @@
+import json
+import multiprocessing
+import os
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from group_commit import GroupCommitter
+from verification import REJECTION_MESSAGES, verify_ballot
+from voting_system import RESERVATION_MESSAGES
+
+# Champs d'un bulletin signé (une ligne NDJSON par bulletin)
+BALLOT_FIELDS = ('hashed_id', 'vote_message', 'vote_hash', 'signature')
+# Bulletins d'un envoi groupé en cours de traitement au plus (mémoire bornée)
+BATCH_WINDOW = 512
+
+
+class IngestionPipeline:
+    """
+    Chaîne d'ingestion asynchrone des bulletins signés
+    1. File d'entrée bornée (contre-pression: submit bloque ou échoue quand elle est pleine)
+    2. Pool de processus de vérification (hash + signature, limité par le CPU)
+    3. Étape unique de validation qui écrit les bulletins vérifiés par groupes
+    Chaque appelant reçoit un Future dont le résultat est (success, message).
+    """
+
+    def __init__(self, system, queue_size=1024, workers=None, max_in_flight=None,
+                 commit_delay_ms=5, commit_max_batch=256):
+        """
+        Entrée:
+            - system (VotingSystem): système dont la base reçoit les bulletins
+            - queue_size (int): Taille de la file d'entrée
+            - workers (int): Processus de vérification (défaut: tous les cœurs)
+            - max_in_flight (int): Bulletins en cours de vérification (défaut: 4 x workers)
+            - commit_delay_ms / commit_max_batch: paramètres de la validation groupée
+        """
+        self.system = system
+        self.db = system.db
+        self.workers = workers or os.cpu_count() or 1
+        self._intake = queue.Queue(maxsize=queue_size)
+        self._in_flight = threading.BoundedSemaphore(max_in_flight or self.workers * 4)
+        self._pool = self._new_pool()
+        self._committer = GroupCommitter(self.db, commit_delay_ms, commit_max_batch)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._idle = threading.Condition(self._lock)
+        self._closed = False
+        self._dispatcher_stopped = False
+        self.submitted = 0
+        self.accepted = 0
+        self.rejected = 0
+        self._dispatcher = threading.Thread(target=self._dispatch, name='ballot-dispatcher', daemon=True)
+        self._dispatcher.start()
+
+    def submit(self, hashed_id, vote_message, vote_hash, signature_b64, candidate=None, timeout=None):
+        """
+        Met un bulletin signé dans la file d'entrée
+        Entrée:
+            - candidate (str): candidat du bulletin (défaut: déduit du message de vote)
+            - timeout (float): attente maximale si la file est pleine (None: attendre)
+        Retourne: Future -> (success, message)
+        Lève: queue.Full si la file est restée pleine pendant timeout
+        """
+        if self._closed or self._dispatcher_stopped:
+            raise RuntimeError("Pipeline arrêté")
+        future = Future()
+        with self._lock:
+            self._pending += 1
+            self.submitted += 1
+        try:
+            self._intake.put(((hashed_id, vote_message, vote_hash, signature_b64, candidate), future),
+                             timeout=timeout)
+        except queue.Full:
+            self._finish(None)
+            with self._lock:
+                self.submitted -= 1
+            raise
+        if self._dispatcher_stopped:
+            # Fil de répartition arrêté pendant la mise en file: personne ne lira ce bulletin
+            self._fail_queued()
+        return future
+
+    def get_stats(self):
+        """Retourne les compteurs du pipeline"""
+        with self._lock:
+            return {
+                'submitted': self.submitted,
+                'accepted': self.accepted,
+                'rejected': self.rejected,
+                'pending': self._pending,
+                'queue_depth': self._intake.qsize(),
+                'workers': self.workers,
+                'commit': self._committer.get_stats()
+            }
+
+    def drain(self):
+        """Attend que tous les bulletins soumis aient reçu leur réponse"""
+        with self._idle:
+            self._idle.wait_for(lambda: self._pending == 0)
+
+    def close(self):
+        """Termine les bulletins en cours puis arrête les étapes du pipeline"""
+        if self._closed:
+            return
+        self._closed = True
+        while self._dispatcher.is_alive():
+            try:
+                self._intake.put(None, timeout=0.1)
+                break
+            except queue.Full:
+                continue
+        self._dispatcher.join()
+        self.drain()
+        self._pool.shutdown()
+        self._committer.close()
+
+    def _new_pool(self):
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'))
+
+    def _replace_pool(self, broken):
+        """Remplace le pool de vérification cassé (processus tué): les bulletins suivants sont vérifiés"""
+        with self._lock:
+            if self._pool is not broken:
+                return
+            self._pool = self._new_pool()
+        print("⚠️  Pool de vérification cassé: nouveaux processus démarrés")
+        # Sans attente: cet appel peut venir du fil de gestion de l'ancien pool
+        broken.shutdown(wait=False)
+
+    def _finish(self, result, future=None):
+        with self._lock:
+            self._pending -= 1
+            if result is not None:
+                if result[0]:
+                    self.accepted += 1
+                else:
+                    self.rejected += 1
+            self._idle.notify_all()
+        if future is not None:
+            future.set_result(result)
+
+    def _dispatch(self):
+        """Étape 1 -> 2: contrôles rapides puis envoi au pool de vérification"""
+        try:
+            while True:
+                item = self._intake.get()
+                if item is None:
+                    break
+                ballot, future = item
+                try:
+                    self._dispatch_ballot(ballot, future)
+                except Exception as e:
+                    # Un bulletin invalide ne doit pas arrêter le fil: rejet de ce seul bulletin
+                    if not future.done():
+                        self._finish((False, f"❌ Bulletin rejeté: {e}"), future)
+        finally:
+            self._dispatcher_stopped = True
+            self._fail_queued()
+
+    def _dispatch_ballot(self, ballot, future):
+        hashed_id, vote_message, vote_hash, signature_b64, candidate = ballot
+
+        if candidate is None:
+            candidate = self.system.candidate_for_message(vote_message)
+            ballot = (hashed_id, vote_message, vote_hash, signature_b64, candidate)
+        if candidate is None or self.system.find_candidate(name=candidate)[1] is None:
+            self._finish((False, "❌ Candidat invalide"), future)
+            return
+        # Inconnus et doublons rejetés en O(1), avant la vérification
+        if not self.system.is_on_roster(hashed_id):
+            self._finish((False, RESERVATION_MESSAGES['not_registered']), future)
+            return
+        reserved, reason = self.db.reserve_voter(hashed_id)
+        if not reserved:
+            self._finish((False, RESERVATION_MESSAGES[reason]), future)
+            return
+
+        # Réservation prise: toute erreur la libère
+        self._in_flight.acquire()
+        try:
+            self._verify(ballot, future)
+        except Exception as e:
+            self._in_flight.release()
+            self._reject(hashed_id, f"❌ Erreur de vérification: {e}", future)
+
+    def _verify(self, ballot, future, retry=True):
+        """Étape 2: envoi au pool de vérification (nouvel essai unique si le pool est cassé)"""
+        hashed_id, vote_message, vote_hash, signature_b64, _ = ballot
+        pool = self._pool
+        try:
+            verification = pool.submit(
+                verify_ballot, vote_message, vote_hash, signature_b64,
+                self.db.get_public_key(hashed_id), self.system.hash_algorithm,
+                self.db.get_signature_scheme(hashed_id)
+            )
+        except BrokenProcessPool:
+            if not retry:
+                raise
+            self._replace_pool(pool)
+            self._verify(ballot, future, retry=False)
+            return
+        verification.add_done_callback(
+            lambda done: self._verified(done, ballot, future, pool, retry)
+        )
+
+    def _fail_queued(self):
+        """Rejette les bulletins restés en file après l'arrêt du fil de répartition"""
+        while True:
+            try:
+                item = self._intake.get_nowait()
+            except queue.Empty:
+                return
+            if item is not None:
+                self._finish((False, "❌ Pipeline arrêté"), item[1])
+
+    def _verified(self, done, ballot, future, pool, retry):
+        """Étape 2 -> 3: bulletin vérifié transmis à la validation groupée"""
+        try:
+            valid, reason = done.result()
+        except BrokenProcessPool as e:
+            # Processus de vérification mort: le bulletin n'y est pour rien, nouvel essai unique
+            self._replace_pool(pool)
+            error = e
+            if retry:
+                try:
+                    self._verify(ballot, future, retry=False)
+                    return
+                except Exception as e:
+                    error = e
+            self._in_flight.release()
+            self._reject(ballot[0], f"❌ Erreur de vérification: {error}", future)
+            return
+        except Exception as e:
+            self._in_flight.release()
+            self._reject(ballot[0], f"❌ Erreur de vérification: {e}", future)
+            return
+        self._in_flight.release()
+        if not valid:
+            self._reject(ballot[0], REJECTION_MESSAGES[reason], future)
+            return
+        self._committer.submit(*ballot).add_done_callback(
+            lambda committed: self._committed(committed, ballot[0], future)
+        )
+
+    def _committed(self, committed, hashed_id, future):
+        """Étape 3: réponse à l'appelant une fois le groupe sur disque"""
+        try:
+            recorded = committed.result()
+        except Exception as e:
+            self._reject(hashed_id, f"❌ Erreur d'enregistrement: {e}", future)
+            return
+        if recorded:
+            self._finish((True, "✓ Vote accepté et enregistré"), future)
+        else:
+            self._reject(hashed_id, "❌ REJETÉ: Vous avez déjà voté!", future)
+
+    def _reject(self, hashed_id, message, future):
+        """Rejet d'un bulletin réservé: l'électeur peut soumettre à nouveau"""
+        self.db.release_voter(hashed_id)
+        self._finish((False, message), future)
+
+
+def parse_ballot_line(line):
+    """Ligne NDJSON -> (champs du bulletin, None) ou (None, message d'erreur)"""
+    try:
+        ballot = json.loads(line)
+    except (ValueError, UnicodeDecodeError):
+        return None, "❌ Ligne JSON invalide"
+    if not isinstance(ballot, dict):
+        return None, "❌ Objet JSON attendu"
+    invalid = [field for field in BALLOT_FIELDS if not isinstance(ballot.get(field), str) or not ballot[field]]
+    if invalid:
+        return None, f"❌ Champs manquants/invalides: {', '.join(invalid)}"
+    return [ballot[field] for field in BALLOT_FIELDS], None
+
+
+def ingest_ndjson(pipeline, lines, window=BATCH_WINDOW):
+    """
+    Envoi groupé de bulletins signés (bureaux de vote hors ligne)
+    Les lignes sont lues au fur et à mesure et confiées au pipeline: vérification
+    en parallèle, écriture par groupes. Au plus window bulletins sont en cours, de
+    sorte qu'un envoi de 100k bulletins n'est jamais gardé en mémoire.
+    Entrée:
+        - pipeline (IngestionPipeline)
+        - lines (iterable de str ou bytes): un bulletin JSON par ligne, lignes vides ignorées
+        - window (int): bulletins en cours au plus
+    Retourne: générateur de statuts dans l'ordre des lignes
+        {line, success, message}, puis {done, accepted, rejected}
+    """
+    in_flight = deque()
+    accepted = rejected = 0
+
+    def status(line_number, result):
+        nonlocal accepted, rejected
+        success, message = result
+        if success:
+            accepted += 1
+        else:
+            rejected += 1
+        return {'line': line_number, 'success': success, 'message': message}
+
+    for line_number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        ballot, error = parse_ballot_line(line)
+        if error:
+            result = Future()
+            result.set_result((False, error))
+        else:
+            result = pipeline.submit(*ballot)
+        in_flight.append((line_number, result))
+        # Statuts prêts envoyés sans attendre, le plus ancien attendu si la fenêtre est pleine
+        while in_flight and (in_flight[0][1].done() or len(in_flight) >= window):
+            line_number, result = in_flight.popleft()
+            yield status(line_number, result.result())
+
+    while in_flight:
+        line_number, result = in_flight.popleft()
+        yield status(line_number, result.result())
+    yield {'done': True, 'accepted': accepted, 'rejected': rejected}
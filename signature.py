@@ -1,10 +1,80 @@
 from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import rsa, padding
+from cryptography.hazmat.primitives.asymmetric import rsa, padding, ec, ed25519
 from cryptography.hazmat.backends import default_backend
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+import hashlib
+import threading
+
+class KeyCache:
+    """
+    Cache LRU borné des objets clés déjà chargés depuis leur PEM
+    Clé du cache: empreinte SHA-256 du PEM (une nouvelle clé pour le même
+    électeur ne peut donc jamais renvoyer un objet périmé).
+    """
+    
+    def __init__(self, max_size=1024):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    @staticmethod
+    def _to_bytes(pem):
+        return pem.encode('utf-8') if isinstance(pem, str) else pem
+    
+    def load(self, pem, loader):
+        """
+        Retourne l'objet clé correspondant au PEM, en le chargeant au besoin
+        Entrée:
+            - pem (str ou bytes): Clé au format PEM
+            - loader (callable): Fonction bytes -> objet clé (appelée en cas d'absence)
+        """
+        pem = self._to_bytes(pem)
+        digest = hashlib.sha256(pem).digest()
+        with self._lock:
+            key = self._entries.get(digest)
+            if key is not None:
+                self._entries.move_to_end(digest)
+                self.hits += 1
+                return key
+            self.misses += 1
+        
+        key = loader(pem)
+        
+        with self._lock:
+            self._entries[digest] = key
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return key
+    
+    def clear(self):
+        """Vide le cache (réinitialisation de l'élection)"""
+        with self._lock:
+            self._entries.clear()
+    
+    def get_stats(self):
+        """Retourne les compteurs du cache"""
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
 
 class RSASignature:
     """Gestion de la signature numérique RSA"""
     
+    # Caches partagés des clés chargées (le parsing PEM/ASN.1 coûte cher à chaque bulletin)
+    public_key_cache = KeyCache(max_size=4096)
+    private_key_cache = KeyCache(max_size=256)
+    
     def __init__(self, key_size=2048):
         self.private_key = None
         self.public_key = None
@@ -31,11 +101,10 @@ class RSASignature:
             - private_key_pem (str): Clé privée au format PEM
         Sortie: signature (bytes)
         """
-        # Charger la clé privée depuis le PEM
-        private_key = serialization.load_pem_private_key(
-            private_key_pem.encode('utf-8') if isinstance(private_key_pem, str) else private_key_pem,
-            password=None,
-            backend=default_backend()
+        # Charger la clé privée depuis le PEM (ou le cache)
+        private_key = self.private_key_cache.load(
+            private_key_pem,
+            lambda pem: serialization.load_pem_private_key(pem, password=None, backend=default_backend())
         )
         
         # Convertir le hash en bytes
@@ -63,10 +132,10 @@ class RSASignature:
         Sortie: True si valide, False sinon
         """
         try:
-            # Charger la clé publique depuis le PEM
-            public_key = serialization.load_pem_public_key(
-                public_key_pem.encode('utf-8') if isinstance(public_key_pem, str) else public_key_pem,
-                backend=default_backend()
+            # Charger la clé publique depuis le PEM (ou le cache)
+            public_key = self.public_key_cache.load(
+                public_key_pem,
+                lambda pem: serialization.load_pem_public_key(pem, backend=default_backend())
             )
             
             # Convertir le hash en bytes
@@ -105,6 +174,20 @@ class RSASignature:
         )
         return pem.decode('utf-8')
     
+    @classmethod
+    def clear_key_caches(cls):
+        """Vide les caches de clés (réinitialisation de la base)"""
+        cls.public_key_cache.clear()
+        cls.private_key_cache.clear()
+    
+    @classmethod
+    def get_cache_stats(cls):
+        """Retourne les compteurs hit/miss/éviction des caches de clés"""
+        return {
+            'public_keys': cls.public_key_cache.get_stats(),
+            'private_keys': cls.private_key_cache.get_stats()
+        }
+    
     def export_private_key_pem(self, private_key=None):
         """
         Exporte la clé privée en format PEM
@@ -121,4 +204,127 @@ class RSASignature:
             format=serialization.PrivateFormat.PKCS8,
             encryption_algorithm=serialization.NoEncryption()
         )
-        return pem.decode('utf-8')
\ No newline at end of file
+        return pem.decode('utf-8')
+
+
+class SignatureScheme(ABC):
+    """
+    Interface commune des schémas de signature
+    Les clés circulent au format PEM; le message signé est le hash du vote.
+    """
+    
+    name = None
+    
+    @abstractmethod
+    def generate_key_pair(self):
+        """Retourne: (private_key_pem, public_key_pem)"""
+    
+    @abstractmethod
+    def sign(self, message, private_key_pem):
+        """Retourne: signature (bytes)"""
+    
+    @abstractmethod
+    def verify(self, message, signature, public_key_pem):
+        """Retourne: True si valide, False sinon"""
+    
+    @staticmethod
+    def _to_bytes(message):
+        return message.encode('utf-8') if isinstance(message, str) else message
+    
+    @staticmethod
+    def _export(private_key):
+        rsa_signature = RSASignature()
+        return (rsa_signature.export_private_key_pem(private_key),
+                rsa_signature.export_public_key_pem(private_key.public_key()))
+    
+    @staticmethod
+    def _load_private_key(private_key_pem):
+        return RSASignature.private_key_cache.load(
+            private_key_pem,
+            lambda pem: serialization.load_pem_private_key(pem, password=None, backend=default_backend())
+        )
+    
+    @staticmethod
+    def _load_public_key(public_key_pem):
+        return RSASignature.public_key_cache.load(
+            public_key_pem,
+            lambda pem: serialization.load_pem_public_key(pem, backend=default_backend())
+        )
+
+class RSAPSSScheme(SignatureScheme):
+    """RSA-2048 avec remplissage PSS (schéma historique)"""
+    
+    name = 'rsa-pss'
+    
+    def __init__(self, key_size=2048):
+        self.key_size = key_size
+    
+    def generate_key_pair(self):
+        rsa_signature = RSASignature(self.key_size)
+        private_key, _ = rsa_signature.generate_keys()
+        return self._export(private_key)
+    
+    def sign(self, message, private_key_pem):
+        return RSASignature().sign_with_private_key(message, private_key_pem)
+    
+    def verify(self, message, signature, public_key_pem):
+        return RSASignature().verify_with_public_key(message, signature, public_key_pem)
+
+class Ed25519Scheme(SignatureScheme):
+    """Ed25519: génération et signature très rapides, clé de 32 octets, signature de 64 octets"""
+    
+    name = 'ed25519'
+    
+    def generate_key_pair(self):
+        return self._export(ed25519.Ed25519PrivateKey.generate())
+    
+    def sign(self, message, private_key_pem):
+        return self._load_private_key(private_key_pem).sign(self._to_bytes(message))
+    
+    def verify(self, message, signature, public_key_pem):
+        try:
+            self._load_public_key(public_key_pem).verify(signature, self._to_bytes(message))
+            return True
+        except Exception as e:
+            print(f"Erreur de vérification: {e}")
+            return False
+
+class ECDSAP256Scheme(SignatureScheme):
+    """ECDSA sur la courbe P-256 avec SHA-256"""
+    
+    name = 'ecdsa-p256'
+    
+    def generate_key_pair(self):
+        return self._export(ec.generate_private_key(ec.SECP256R1(), default_backend()))
+    
+    def sign(self, message, private_key_pem):
+        return self._load_private_key(private_key_pem).sign(
+            self._to_bytes(message), ec.ECDSA(hashes.SHA256())
+        )
+    
+    def verify(self, message, signature, public_key_pem):
+        try:
+            self._load_public_key(public_key_pem).verify(
+                signature, self._to_bytes(message), ec.ECDSA(hashes.SHA256())
+            )
+            return True
+        except Exception as e:
+            print(f"Erreur de vérification: {e}")
+            return False
+
+DEFAULT_SIGNATURE_SCHEME = RSAPSSScheme.name
+
+SIGNATURE_SCHEMES = {
+    scheme.name: scheme for scheme in (RSAPSSScheme, Ed25519Scheme, ECDSAP256Scheme)
+}
+
+def get_signature_scheme(name=None):
+    """
+    Retourne une instance du schéma de signature demandé
+    Entrée: name (str): 'rsa-pss', 'ed25519' ou 'ecdsa-p256' (None: schéma par défaut)
+    """
+    name = name or DEFAULT_SIGNATURE_SCHEME
+    if name not in SIGNATURE_SCHEMES:
+        raise ValueError(f"Schéma de signature non supporté: {name}. "
+                         f"Utilisez {', '.join(SIGNATURE_SCHEMES)}")
+    return SIGNATURE_SCHEMES[name]()
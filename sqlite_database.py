@@ -0,0 +1,684 @@
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+from database import VotingDatabase
+from signature import DEFAULT_SIGNATURE_SCHEME
+from merkle import ListNodes, MerkleTree, ballot_leaf_hash
+from candidates import CandidateCatalog
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS voters (
+    hashed_id TEXT PRIMARY KEY,
+    public_key TEXT NOT NULL,
+    has_voted INTEGER NOT NULL DEFAULT 0,
+    registration_date TEXT NOT NULL,
+    signature_scheme TEXT NOT NULL DEFAULT 'rsa-pss',
+    reserved_until REAL
+);
+CREATE TABLE IF NOT EXISTS votes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    voter_hash TEXT NOT NULL,
+    vote_message TEXT NOT NULL,
+    vote_hash TEXT NOT NULL,
+    signature TEXT NOT NULL,
+    candidate TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    leaf_index INTEGER,
+    station TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_votes_candidate ON votes(candidate);
+CREATE INDEX IF NOT EXISTS idx_votes_voter ON votes(voter_hash);
+CREATE TABLE IF NOT EXISTS merkle_nodes (
+    level INTEGER NOT NULL,
+    idx INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    PRIMARY KEY (level, idx)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS candidates (
+    position INTEGER PRIMARY KEY,
+    name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS candidate_catalog (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS tallies (
+    candidate TEXT PRIMARY KEY,
+    votes INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS settings (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+COUNTERS = ('total_registered', 'total_voted', 'total_votes')
+# Version du décompte (table counters, hors COUNTERS): croît à chaque bulletin validé,
+# changement de candidats ou réinitialisation, jamais remise à zéro
+TALLY_VERSION = 'tally_version'
+
+# Durée d'une réservation: un processus arrêté en pleine vérification ne bloque pas l'électeur
+RESERVATION_LEASE_SECONDS = 60.0
+
+
+class SQLiteNodes:
+    """Stockage des nœuds de l'arbre de Merkle dans la table merkle_nodes"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def depth(self):
+        return self.conn.execute('SELECT COALESCE(MAX(level) + 1, 1) FROM merkle_nodes').fetchone()[0]
+
+    def size(self, level):
+        return self.conn.execute(
+            'SELECT COALESCE(MAX(idx) + 1, 0) FROM merkle_nodes WHERE level = ?', (level,)
+        ).fetchone()[0]
+
+    def get(self, level, index):
+        return self.conn.execute(
+            'SELECT hash FROM merkle_nodes WHERE level = ? AND idx = ?', (level, index)
+        ).fetchone()[0]
+
+    def put(self, level, index, value):
+        self.conn.execute(
+            'INSERT OR REPLACE INTO merkle_nodes (level, idx, hash) VALUES (?, ?, ?)',
+            (level, index, value)
+        )
+
+
+class SQLiteVotingDatabase:
+    """
+    Base de données des votes sur SQLite (mode WAL)
+    Mêmes méthodes publiques que VotingDatabase, mais les données restent sur
+    disque: plusieurs processus (workers Flask) peuvent partager la même élection.
+    """
+
+    def __init__(self, db_file='votes.db', timeout=30.0):
+        self.db_file = db_file
+        self.timeout = timeout
+        self._local = threading.local()
+        conn = self._connection()
+        columns = [row[1] for row in conn.execute('PRAGMA table_info(voters)')]
+        if columns and 'signature_scheme' not in columns:
+            with conn:
+                conn.execute("ALTER TABLE voters ADD COLUMN signature_scheme TEXT NOT NULL DEFAULT 'rsa-pss'")
+        if columns and 'reserved_until' not in columns:
+            with conn:
+                conn.execute('ALTER TABLE voters ADD COLUMN reserved_until REAL')
+        columns = [row[1] for row in conn.execute('PRAGMA table_info(votes)')]
+        if columns and 'leaf_index' not in columns:
+            with conn:
+                conn.execute('ALTER TABLE votes ADD COLUMN leaf_index INTEGER')
+        if columns and 'station' not in columns:
+            with conn:
+                conn.execute('ALTER TABLE votes ADD COLUMN station TEXT')
+        conn.executescript(SCHEMA)
+        with conn:
+            conn.execute(
+                'INSERT OR IGNORE INTO candidate_catalog (name) '
+                'SELECT name FROM candidates ORDER BY position'
+            )
+        self._catalog = None
+        if len(self._counters(conn)) < len(COUNTERS):
+            self._rebuild_counters()
+        with conn:
+            conn.execute(
+                'INSERT OR IGNORE INTO counters (name, value) '
+                'SELECT ?, value FROM counters WHERE name = ?', (TALLY_VERSION, 'total_votes')
+            )
+        if SQLiteNodes(conn).size(0) != self._counters(conn)['total_votes']:
+            self._rebuild_merkle()
+
+    def _connection(self):
+        """Retourne la connexion propre au thread courant (créée au besoin)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_file, timeout=self.timeout)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        """Ferme la connexion du thread courant"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _rebuild_counters(self):
+        """Recalcule compteurs et décomptes par un parcours complet (une seule fois)"""
+        conn = self._connection()
+        recount = self._recount(conn)
+        with conn:
+            conn.execute('DELETE FROM tallies')
+            conn.executemany(
+                'INSERT INTO tallies (candidate, votes) VALUES (?, ?)',
+                recount['results'].items()
+            )
+            conn.executemany(
+                'INSERT OR REPLACE INTO counters (name, value) VALUES (?, ?)',
+                [(name, recount[name]) for name in COUNTERS]
+            )
+
+    def _rebuild_merkle(self):
+        """Reconstruit l'arbre de Merkle à partir des votes (une seule fois)"""
+        conn = self._connection()
+        tree = MerkleTree(ListNodes())
+        positions = []
+        for vote_id, voter_hash, vote_hash, signature in conn.execute(
+                'SELECT id, voter_hash, vote_hash, signature FROM votes ORDER BY id'):
+            positions.append((tree.append(ballot_leaf_hash(voter_hash, vote_hash, signature)), vote_id))
+        with conn:
+            conn.execute('DELETE FROM merkle_nodes')
+            conn.executemany(
+                'INSERT INTO merkle_nodes (level, idx, hash) VALUES (?, ?, ?)',
+                ((level, index, value)
+                 for level, nodes in enumerate(tree.nodes.levels)
+                 for index, value in enumerate(nodes))
+            )
+            conn.executemany('UPDATE votes SET leaf_index = ? WHERE id = ?', positions)
+
+    @staticmethod
+    def _recount(conn):
+        total_registered, total_voted = conn.execute(
+            'SELECT COUNT(*), COALESCE(SUM(has_voted), 0) FROM voters'
+        ).fetchone()
+        return {
+            'total_registered': total_registered,
+            'total_voted': total_voted,
+            'total_votes': conn.execute('SELECT COUNT(*) FROM votes').fetchone()[0],
+            'results': dict(conn.execute(
+                'SELECT candidate, COUNT(*) FROM votes GROUP BY candidate'
+            ).fetchall())
+        }
+
+    @staticmethod
+    def _increment(conn, name, delta=1):
+        conn.execute('UPDATE counters SET value = value + ? WHERE name = ?', (delta, name))
+
+    @staticmethod
+    def _insert_vote(conn, hashed_id, vote_message, vote_hash, signature_b64, candidate, station=None):
+        """
+        Insère un vote et sa feuille de Merkle (station: bureau de vote, paramètre de l'élection)
+        L'appelant doit tenir le verrou d'écriture (BEGIN IMMEDIATE): la taille de l'arbre
+        est lue avant toute écriture, deux transactions ne doivent pas lire la même.
+        """
+        # Ajout de la feuille: O(log n) nœuds réécrits dans la même transaction
+        leaf_index = MerkleTree(SQLiteNodes(conn)).append(
+            ballot_leaf_hash(hashed_id, vote_hash, signature_b64)
+        )
+        conn.execute(
+            'INSERT INTO votes '
+            '(voter_hash, vote_message, vote_hash, signature, candidate, timestamp, leaf_index, station) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            (hashed_id, vote_message, vote_hash, signature_b64, candidate,
+             datetime.now().isoformat(), leaf_index, station)
+        )
+        conn.execute(
+            'INSERT INTO tallies (candidate, votes) VALUES (?, 1) '
+            'ON CONFLICT(candidate) DO UPDATE SET votes = votes + 1',
+            (candidate,)
+        )
+        SQLiteVotingDatabase._increment(conn, 'total_votes')
+        SQLiteVotingDatabase._increment(conn, TALLY_VERSION)
+
+    def save_database(self):
+        """Rien à faire: chaque modification est validée dans sa transaction"""
+
+    def register_voter(self, hashed_id, public_key_pem, signature_scheme=DEFAULT_SIGNATURE_SCHEME):
+        """
+        Enregistre un électeur avec sa clé publique
+        Retourne: True si enregistré, False si déjà existant
+        """
+        return self.register_voters([(hashed_id, public_key_pem, signature_scheme)])[0]
+
+    def register_voters(self, voters):
+        """
+        Enregistre un lot d'électeurs dans une seule transaction
+        Entrée: voters (list): tuples (hashed_id, public_key_pem[, signature_scheme])
+        Retourne: liste de booléens (False si déjà existant)
+        """
+        registration_date = datetime.now().isoformat()
+        results = []
+        conn = self._connection()
+        with conn:
+            for hashed_id, public_key_pem, *scheme in voters:
+                cursor = conn.execute(
+                    'INSERT OR IGNORE INTO voters '
+                    '(hashed_id, public_key, has_voted, registration_date, signature_scheme) '
+                    'VALUES (?, ?, 0, ?, ?)',
+                    (hashed_id, public_key_pem, registration_date,
+                     scheme[0] if scheme else DEFAULT_SIGNATURE_SCHEME)
+                )
+                results.append(cursor.rowcount == 1)
+            self._increment(conn, 'total_registered', sum(results))
+        return results
+
+    def iter_voters(self):
+        """Parcourt les électeurs: tuples (hashed_id, has_voted, registration_date) (lecture en flux)"""
+        cursor = self._connection().execute(
+            'SELECT hashed_id, has_voted, registration_date FROM voters ORDER BY rowid'
+        )
+        for hashed_id, has_voted, registration_date in cursor:
+            yield hashed_id, bool(has_voted), registration_date
+
+    def is_voter_registered(self, hashed_id):
+        """Vérifie si un électeur est enregistré"""
+        row = self._connection().execute(
+            'SELECT 1 FROM voters WHERE hashed_id = ?', (hashed_id,)
+        ).fetchone()
+        return row is not None
+
+    def has_voted(self, hashed_id):
+        """Vérifie si un électeur a déjà voté"""
+        row = self._connection().execute(
+            'SELECT has_voted FROM voters WHERE hashed_id = ?', (hashed_id,)
+        ).fetchone()
+        return bool(row and row[0])
+
+    def mark_as_voted(self, hashed_id):
+        """Marque un électeur comme ayant voté"""
+        conn = self._connection()
+        with conn:
+            cursor = conn.execute(
+                'UPDATE voters SET has_voted = 1 WHERE hashed_id = ? AND has_voted = 0', (hashed_id,)
+            )
+            if cursor.rowcount == 1:
+                self._increment(conn, 'total_voted')
+                return True
+        return self.is_voter_registered(hashed_id)
+
+    def reserve_voter(self, hashed_id, lease_seconds=RESERVATION_LEASE_SECONDS):
+        """
+        Réserve atomiquement le droit de vote d'un électeur (une seule mise à jour
+        conditionnelle, valable entre processus). La réservation expire après
+        lease_seconds; elle est consommée par record_ballot(s) ou annulée par release_voter.
+        Retourne: (réservé, raison) avec raison parmi 'ok', 'not_registered',
+                  'already_voted', 'in_progress'
+        """
+        now = time.time()
+        conn = self._connection()
+        with conn:
+            cursor = conn.execute(
+                'UPDATE voters SET reserved_until = ? WHERE hashed_id = ? AND has_voted = 0 '
+                'AND (reserved_until IS NULL OR reserved_until < ?)',
+                (now + lease_seconds, hashed_id, now)
+            )
+        if cursor.rowcount == 1:
+            return True, 'ok'
+        row = conn.execute('SELECT has_voted FROM voters WHERE hashed_id = ?', (hashed_id,)).fetchone()
+        if row is None:
+            return False, 'not_registered'
+        return False, 'already_voted' if row[0] else 'in_progress'
+
+    def release_voter(self, hashed_id):
+        """Annule la réservation d'un électeur (bulletin rejeté ou erreur)"""
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                'UPDATE voters SET reserved_until = NULL WHERE hashed_id = ? AND has_voted = 0', (hashed_id,)
+            )
+
+    def get_public_key(self, hashed_id):
+        """Récupère la clé publique d'un électeur"""
+        row = self._connection().execute(
+            'SELECT public_key FROM voters WHERE hashed_id = ?', (hashed_id,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def get_signature_scheme(self, hashed_id):
+        """Retourne le schéma de signature enregistré pour un électeur (None si inconnu)"""
+        row = self._connection().execute(
+            'SELECT signature_scheme FROM voters WHERE hashed_id = ?', (hashed_id,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def set_setting(self, name, value):
+        """Enregistre un paramètre de l'élection (ex: 'signature_scheme')"""
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO settings (name, value) VALUES (?, ?)',
+                (name, json.dumps(value))
+            )
+
+    def get_setting(self, name, default=None):
+        """Retourne un paramètre de l'élection"""
+        row = self._connection().execute(
+            'SELECT value FROM settings WHERE name = ?', (name,)
+        ).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def add_vote(self, hashed_id, vote_message, vote_hash, signature_b64, candidate):
+        """Enregistre un vote dans la base de données"""
+        conn = self._connection()
+        with conn:
+            conn.execute('BEGIN IMMEDIATE')
+            self._insert_vote(conn, hashed_id, vote_message, vote_hash, signature_b64, candidate,
+                              self.get_setting('station'))
+
+    def record_ballot(self, hashed_id, vote_message, vote_hash, signature_b64, candidate, sync=False):
+        """
+        Marque l'électeur comme ayant voté ET enregistre son vote dans la même transaction
+        Retourne: True si enregistré, False si non enregistré ou a déjà voté
+        """
+        return self.record_ballots(
+            [(hashed_id, vote_message, vote_hash, signature_b64, candidate)], sync=sync
+        )[0]
+
+    def record_ballots(self, ballots, sync=True):
+        """
+        Enregistre un groupe de bulletins vérifiés en une seule transaction
+        Entrée:
+            - ballots (list): tuples (hashed_id, vote_message, vote_hash, signature_b64, candidate)
+            - sync (bool): synchronous=FULL pour que le commit soit durable (un seul fsync)
+        Retourne: liste de booléens (False pour un électeur inconnu ou ayant déjà voté)
+        """
+        conn = self._connection()
+        conn.execute('PRAGMA synchronous=FULL' if sync else 'PRAGMA synchronous=NORMAL')
+        results = []
+        with conn:
+            conn.execute('BEGIN IMMEDIATE')
+            station = self.get_setting('station')
+            for hashed_id, vote_message, vote_hash, signature_b64, candidate in ballots:
+                cursor = conn.execute(
+                    'UPDATE voters SET has_voted = 1, reserved_until = NULL '
+                    'WHERE hashed_id = ? AND has_voted = 0',
+                    (hashed_id,)
+                )
+                if cursor.rowcount != 1:
+                    results.append(False)
+                    continue
+                self._increment(conn, 'total_voted')
+                self._insert_vote(conn, hashed_id, vote_message, vote_hash, signature_b64, candidate, station)
+                results.append(True)
+        return results
+
+    def iter_votes(self):
+        """Parcourt les votes enregistrés dans l'ordre d'arrivée (lecture en flux)"""
+        cursor = self._connection().execute(
+            'SELECT voter_hash, vote_message, vote_hash, signature, candidate, timestamp '
+            'FROM votes ORDER BY id'
+        )
+        for voter_hash, vote_message, vote_hash, signature, candidate, timestamp in cursor:
+            yield {
+                'voter_hash': voter_hash,
+                'vote_message': vote_message,
+                'vote_hash': vote_hash,
+                'signature': signature,
+                'candidate': candidate,
+                'timestamp': timestamp
+            }
+
+    def iter_voted_voters(self):
+        """Parcourt les IDs hachés des électeurs ayant voté (lecture en flux)"""
+        for row in self._connection().execute('SELECT hashed_id FROM voters WHERE has_voted = 1'):
+            yield row[0]
+
+    def iter_tally_rows(self):
+        """Parcourt (candidat, horodatage, bureau ou None) de chaque vote (lecture en flux)"""
+        return self._connection().execute('SELECT candidate, timestamp, station FROM votes ORDER BY id')
+
+    def get_merkle_root(self):
+        """Racine de l'arbre de Merkle des bulletins (None si aucun vote)"""
+        return MerkleTree(SQLiteNodes(self._connection())).root()
+
+    def get_inclusion_proof(self, hashed_id):
+        """
+        Preuve d'inclusion du bulletin d'un électeur dans l'arbre de Merkle
+        Retourne: reçu (dict) vérifiable hors ligne avec merkle.verify_receipt, ou None
+        """
+        conn = self._connection()
+        conn.execute('BEGIN')
+        try:
+            row = conn.execute(
+                'SELECT vote_hash, signature, leaf_index FROM votes WHERE voter_hash = ?', (hashed_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            vote_hash, signature, index = row
+            tree = MerkleTree(SQLiteNodes(conn))
+            return {
+                'voter_hash': hashed_id,
+                'vote_hash': vote_hash,
+                'signature': signature,
+                'index': index,
+                'leaf_hash': tree.nodes.get(0, index),
+                'proof': tree.inclusion_proof(index),
+                'tree_size': tree.size(),
+                'root': tree.root()
+            }
+        finally:
+            conn.rollback()
+
+    def _counters(self, conn):
+        return dict(conn.execute(
+            f"SELECT name, value FROM counters WHERE name IN ({', '.join('?' * len(COUNTERS))})", COUNTERS
+        ).fetchall())
+
+    def get_tally_version(self):
+        """Version du décompte: change à chaque bulletin validé (partagée entre processus)"""
+        row = self._connection().execute(
+            'SELECT value FROM counters WHERE name = ?', (TALLY_VERSION,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def get_vote_count(self):
+        """Retourne le nombre total de votes"""
+        return self._counters(self._connection())['total_votes']
+
+    def get_results(self):
+        """
+        Retourne les résultats du vote (table tallies tenue à jour à chaque écriture)
+        Retourne: dict {candidat: nombre_votes}
+        """
+        rows = self._connection().execute(
+            'SELECT candidate, votes FROM tallies WHERE votes > 0'
+        ).fetchall()
+        return dict(rows)
+
+    def initialize_candidates(self, candidates):
+        """Initialise la liste des candidats (les IDs du catalogue sont conservés)"""
+        conn = self._connection()
+        with conn:
+            conn.execute('DELETE FROM candidates')
+            conn.executemany(
+                'INSERT INTO candidates (position, name) VALUES (?, ?)',
+                enumerate(candidates)
+            )
+            conn.executemany(
+                'INSERT OR IGNORE INTO candidate_catalog (name) VALUES (?)',
+                [(name,) for name in candidates]
+            )
+            self._increment(conn, TALLY_VERSION)
+        self._catalog = None
+
+    def add_candidate(self, name):
+        """
+        Ajoute un candidat à l'élection en cours (une seule instruction: atomique
+        même entre processus)
+        Retourne: False si le candidat figure déjà dans la liste
+        """
+        conn = self._connection()
+        with conn:
+            added = conn.execute(
+                'INSERT INTO candidates (position, name) '
+                'SELECT (SELECT COALESCE(MAX(position) + 1, 0) FROM candidates), ? '
+                'WHERE NOT EXISTS (SELECT 1 FROM candidates WHERE name = ?)',
+                (name, name)
+            ).rowcount
+            conn.execute('INSERT OR IGNORE INTO candidate_catalog (name) VALUES (?)', (name,))
+            if added:
+                self._increment(conn, TALLY_VERSION)
+        self._catalog = None
+        return added > 0
+
+    def get_candidate_catalog(self):
+        """
+        Retourne le catalogue des candidats (IDs stables, messages et hashs précalculés)
+        Gardé en mémoire; relu quand la liste a changé dans ce processus ou qu'un nom
+        inconnu est demandé (ajout par un autre processus, voir refresh_candidate_catalog)
+        """
+        if self._catalog is None:
+            self.refresh_candidate_catalog()
+        return self._catalog
+
+    def refresh_candidate_catalog(self):
+        """Relit le catalogue des candidats depuis la base"""
+        conn = self._connection()
+        names = [row[0] for row in conn.execute('SELECT name FROM candidate_catalog ORDER BY id')]
+        self._catalog = CandidateCatalog(names, self.get_candidates())
+        return self._catalog
+
+    def get_candidates(self):
+        """Retourne la liste des candidats"""
+        rows = self._connection().execute(
+            'SELECT name FROM candidates ORDER BY position'
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def reset_database(self):
+        """Réinitialise complètement la base de données"""
+        conn = self._connection()
+        with conn:
+            conn.execute('DELETE FROM voters')
+            conn.execute('DELETE FROM votes')
+            conn.execute('DELETE FROM candidates')
+            conn.execute('DELETE FROM candidate_catalog')
+            conn.execute('DELETE FROM tallies')
+            conn.execute('DELETE FROM settings')
+            conn.execute('DELETE FROM merkle_nodes')
+            conn.execute('UPDATE counters SET value = 0 WHERE name != ?', (TALLY_VERSION,))
+            self._increment(conn, TALLY_VERSION)
+        self._catalog = None
+
+    def get_statistics(self):
+        """Retourne les statistiques du vote (lecture des compteurs, temps constant)"""
+        conn = self._connection()
+        conn.execute('BEGIN')
+        try:
+            counters = self._counters(conn)
+            results = dict(conn.execute(
+                'SELECT candidate, votes FROM tallies WHERE votes > 0'
+            ).fetchall())
+        finally:
+            conn.rollback()
+        total_registered = counters['total_registered']
+        total_voted = counters['total_voted']
+
+        return {
+            'total_registered': total_registered,
+            'total_voted': total_voted,
+            'total_votes': counters['total_votes'],
+            'participation_rate': (total_voted / total_registered * 100) if total_registered > 0 else 0,
+            'results': results
+        }
+
+    def check_consistency(self):
+        """
+        Compare les compteurs incrémentaux à un décompte complet
+        Retourne: dict {'consistent': bool, 'counters': {...}, 'recount': {...}}
+        """
+        conn = self._connection()
+        conn.execute('BEGIN')
+        try:
+            counters = self._counters(conn)
+            counters['results'] = self.get_results()
+            recount = self._recount(conn)
+        finally:
+            conn.rollback()
+        return {
+            'consistent': counters == recount,
+            'counters': counters,
+            'recount': recount
+        }
+
+    def migrate_from_json(self, json_file):
+        """
+        Importe une base votes.json existante (journal compris) en une seule transaction
+        Les électeurs déjà présents sont conservés tels quels.
+        Retourne: (nombre d'électeurs importés, nombre de votes importés)
+        """
+        if self.get_vote_count() > 0:
+            raise ValueError("La base SQLite contient déjà des votes: migration refusée")
+
+        source = VotingDatabase(json_file)
+        data = source.data
+
+        voters = [
+            (hashed_id, info['public_key'], int(bool(info.get('has_voted'))),
+             info.get('registration_date', datetime.now().isoformat()),
+             info.get('signature_scheme', DEFAULT_SIGNATURE_SCHEME))
+            for hashed_id, info in data.get('registered_voters', {}).items()
+        ]
+        # Bureau de vote de chaque bulletin: hors des bulletins complets, lu avec le dépouillement
+        votes = [
+            (v['voter_hash'], v['vote_message'], v['vote_hash'], v['signature'],
+             v['candidate'], v.get('timestamp', ''), station)
+            for v, (_, _, station) in zip(source.iter_votes(), source.iter_tally_rows())
+        ]
+
+        conn = self._connection()
+        with conn:
+            before = conn.execute('SELECT COUNT(*) FROM voters').fetchone()[0]
+            conn.executemany(
+                'INSERT OR IGNORE INTO voters '
+                '(hashed_id, public_key, has_voted, registration_date, signature_scheme) '
+                'VALUES (?, ?, ?, ?, ?)',
+                voters
+            )
+            imported_voters = conn.execute('SELECT COUNT(*) FROM voters').fetchone()[0] - before
+            conn.executemany(
+                'INSERT INTO votes (voter_hash, vote_message, vote_hash, signature, candidate, timestamp, station) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                votes
+            )
+            conn.executemany(
+                'INSERT OR IGNORE INTO candidate_catalog (id, name) VALUES (?, ?)',
+                enumerate(data['candidate_catalog'])
+            )
+            if data.get('candidates'):
+                conn.execute('DELETE FROM candidates')
+                conn.executemany(
+                    'INSERT INTO candidates (position, name) VALUES (?, ?)',
+                    enumerate(data['candidates'])
+                )
+            conn.executemany(
+                'INSERT OR REPLACE INTO settings (name, value) VALUES (?, ?)',
+                [(name, json.dumps(value)) for name, value in data.get('settings', {}).items()]
+            )
+            self._increment(conn, TALLY_VERSION, len(votes) + 1)
+        self._catalog = None
+        self._rebuild_counters()
+        self._rebuild_merkle()
+        return imported_voters, len(votes)
+
+
+def main():
+    """Migration en ligne de commande: python sqlite_database.py votes.json votes.db"""
+    if len(sys.argv) != 3:
+        print("Usage: python sqlite_database.py <votes.json> <votes.db>")
+        sys.exit(1)
+
+    json_file, db_file = sys.argv[1], sys.argv[2]
+    if not os.path.exists(json_file):
+        print(f"❌ Fichier introuvable: {json_file}")
+        sys.exit(1)
+
+    db = SQLiteVotingDatabase(db_file)
+    voters, votes = db.migrate_from_json(json_file)
+    print(f"✓ Migration terminée: {voters} électeurs et {votes} votes importés dans {db_file}")
+
+
+if __name__ == '__main__':
+    main()
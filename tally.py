@@ -0,0 +1,167 @@
+"""
+Moteur de dépouillement pour les gros registres
+Les candidats, heures et bureaux de vote de chaque bulletin sont chargés en une
+passe dans des tableaux contigus, puis réduits par comptage vectorisé
+(numpy.bincount si NumPy est installé, boucle Python sinon): totaux,
+pourcentages, participation par heure et tableaux croisés.
+NumPy est optionnel (pip install -r requirements-tally.txt); les deux chemins
+donnent les mêmes résultats. Le bureau d'un bulletin est le paramètre 'station'
+de l'élection au moment du vote (VotingSystem.setup_election).
+
+Usage: python tally.py votes.json [--json]
+"""
+
+import argparse
+import json
+import sys
+from array import array
+
+from database import open_database
+
+try:
+    import numpy
+except ImportError:  # dépendance optionnelle
+    numpy = None
+
+# Bureau de vote attribué aux bulletins sans bureau (paramètre 'station' de l'élection sinon)
+DEFAULT_STATION = 'principal'
+
+
+class TallyColumns:
+    """Colonnes d'entiers d'un registre: un code par valeur distincte (candidat, heure, bureau)"""
+
+    def __init__(self):
+        self.candidates = []
+        self.hours = []
+        self.stations = []
+        self.candidate_codes = array('i')
+        self.hour_codes = array('i')
+        self.station_codes = array('i')
+
+    def __len__(self):
+        return len(self.candidate_codes)
+
+    @staticmethod
+    def _code(value, labels, index):
+        code = index.get(value)
+        if code is None:
+            code = index[value] = len(labels)
+            labels.append(value)
+        return code
+
+    @classmethod
+    def load(cls, rows, candidates=(), default_station=DEFAULT_STATION):
+        """
+        Charge les colonnes en une seule passe
+        Entrée:
+            - rows (iterable): tuples (candidat, horodatage ISO, bureau ou None)
+            - candidates (list): candidats de l'élection (présents même sans voix)
+        """
+        columns = cls()
+        candidate_index, hour_index, station_index = {}, {}, {}
+        for candidate in candidates:
+            cls._code(candidate, columns.candidates, candidate_index)
+        append_candidate = columns.candidate_codes.append
+        append_hour = columns.hour_codes.append
+        append_station = columns.station_codes.append
+        for candidate, timestamp, station in rows:
+            append_candidate(cls._code(candidate, columns.candidates, candidate_index))
+            # 'AAAA-MM-JJTHH': tranche horaire de l'horodatage ISO
+            append_hour(cls._code(timestamp[:13], columns.hours, hour_index))
+            append_station(cls._code(station or default_station, columns.stations, station_index))
+        return columns
+
+
+def _bincount(codes, size):
+    """Nombre d'occurrences de chaque code 0..size-1 (liste d'entiers)"""
+    if numpy is not None:
+        return numpy.bincount(numpy.frombuffer(codes, dtype=numpy.int32), minlength=size).tolist()
+    counts = [0] * size
+    for code in codes:
+        counts[code] += 1
+    return counts
+
+
+def _crosstab(rows, columns, row_labels, column_labels):
+    """Tableau croisé {ligne: {colonne: nombre}} par comptage des codes combinés"""
+    width = len(column_labels)
+    if numpy is not None:
+        combined = (numpy.frombuffer(rows, dtype=numpy.int32).astype(numpy.int64) * width
+                    + numpy.frombuffer(columns, dtype=numpy.int32))
+        counts = numpy.bincount(combined, minlength=len(row_labels) * width).tolist()
+    else:
+        counts = [0] * (len(row_labels) * width)
+        for row, column in zip(rows, columns):
+            counts[row * width + column] += 1
+    return {
+        label: {column_labels[j]: counts[i * width + j] for j in range(width)}
+        for i, label in enumerate(row_labels)
+    }
+
+
+def compute_statistics(db, default_station=None):
+    """
+    Dépouillement complet du registre
+    Entrée: db (VotingDatabase ou SQLiteVotingDatabase)
+    Retourne: même structure que db.get_statistics(), plus
+        - 'percentages': {candidat: % des votes exprimés}
+        - 'turnout_by_hour': {'AAAA-MM-JJTHH': nombre de bulletins}
+        - 'results_by_hour': {heure: {candidat: nombre}}
+        - 'results_by_station': {bureau: {candidat: nombre}}
+    """
+    counters = db.get_statistics()
+    station = default_station or db.get_setting('station', DEFAULT_STATION)
+    columns = TallyColumns.load(db.iter_tally_rows(), db.get_candidates(), station)
+
+    totals = _bincount(columns.candidate_codes, len(columns.candidates))
+    total_votes = len(columns)
+    hourly = _bincount(columns.hour_codes, len(columns.hours))
+    hour_order = sorted(range(len(columns.hours)), key=columns.hours.__getitem__)
+    by_hour = _crosstab(columns.hour_codes, columns.candidate_codes, columns.hours, columns.candidates)
+
+    return {
+        'total_registered': counters['total_registered'],
+        'total_voted': counters['total_voted'],
+        'total_votes': total_votes,
+        'participation_rate': counters['participation_rate'],
+        'results': {name: count for name, count in zip(columns.candidates, totals) if count},
+        'percentages': {
+            name: (count / total_votes * 100) if total_votes > 0 else 0
+            for name, count in zip(columns.candidates, totals)
+        },
+        'turnout_by_hour': {columns.hours[i]: hourly[i] for i in hour_order},
+        'results_by_hour': {columns.hours[i]: by_hour[columns.hours[i]] for i in hour_order},
+        'results_by_station': _crosstab(columns.station_codes, columns.candidate_codes,
+                                        columns.stations, columns.candidates)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dépouillement détaillé d'un registre de votes")
+    parser.add_argument('db_file', help="Base de données des votes (.json ou .db)")
+    parser.add_argument('--json', action='store_true', help="Afficher le résultat en JSON")
+    args = parser.parse_args()
+
+    db = open_database(args.db_file)
+    stats = compute_statistics(db)
+    db.close()
+
+    if args.json:
+        json.dump(stats, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+        return
+
+    print(f"📊 {stats['total_votes']} bulletins ({'NumPy' if numpy is not None else 'Python pur'})")
+    print(f"Taux de participation: {stats['participation_rate']:.1f}%")
+    for candidate, percentage in sorted(stats['percentages'].items(), key=lambda x: x[1], reverse=True):
+        print(f"   {candidate}: {stats['results'].get(candidate, 0)} votes ({percentage:.1f}%)")
+    print("\nParticipation par heure:")
+    for hour, count in stats['turnout_by_hour'].items():
+        print(f"   {hour.replace('T', ' ')}h: {count}")
+    print("\nRésultats par bureau:")
+    for station, results in stats['results_by_station'].items():
+        print(f"   {station}: " + ", ".join(f"{c}={n}" for c, n in results.items()))
+
+
+if __name__ == '__main__':
+    main()
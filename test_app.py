@@ -0,0 +1,26 @@
+"""Tests de validation des corps JSON de l'application Flask (python -m pytest test_app.py)"""
+
+import pytest
+
+from app import app
+
+BALLOT = {'hashed_id': 'a' * 64, 'vote_message': "Je vote A", 'vote_hash': 'b' * 64, 'signature': 'c2ln'}
+
+
+@pytest.mark.parametrize('path, body', [
+    ('/voter', {**BALLOT, 'hashed_id': ['x']}),
+    ('/voter', {**BALLOT, 'vote_message': ["Je vote A"]}),
+    ('/voter', {**BALLOT, 'signature': None}),
+    ('/api/register', {'voter_id': {'a': 1}}),
+    ('/api/add_candidate', {'candidate_name': 42}),
+    ('/api/vote', {'voter_id': 'v', 'private_key': 'k', 'candidate': ['A']}),
+])
+def test_non_string_fields_are_rejected(path, body):
+    response = app.test_client().post(path, json=body)
+    assert response.status_code == 400
+    assert "Champs manquants/invalides" in response.get_json()['message']
+
+
+def test_body_must_be_a_json_object():
+    response = app.test_client().post('/voter', json=[BALLOT])
+    assert response.status_code == 400
@@ -0,0 +1,60 @@
+"""Tests de validation des corps JSON du frontal ASGI (python -m pytest test_asgi_app.py)"""
+
+import asyncio
+import json
+
+import pytest
+
+import app as flask_app
+from asgi_app import app
+
+BALLOT = {'hashed_id': 'a' * 64, 'vote_message': "Je vote A", 'vote_hash': 'b' * 64, 'signature': 'c2ln'}
+
+
+def call(method, path, body=None):
+    """Appelle l'application ASGI sans serveur; retourne (statut, corps JSON)"""
+    scope = {'type': 'http', 'method': method, 'path': path, 'query_string': b'', 'headers': []}
+    payload = b'' if body is None else json.dumps(body).encode('utf-8')
+    messages = [{'type': 'http.request', 'body': payload, 'more_body': False}]
+    response = {'body': b''}
+
+    async def receive():
+        return messages.pop(0) if messages else {'type': 'http.disconnect'}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            response['status'] = message['status']
+        else:
+            response['body'] += message.get('body', b'')
+
+    asyncio.run(app(scope, receive, send))
+    return response['status'], json.loads(response['body'])
+
+
+def post(path, body):
+    return call('POST', path, body)
+
+
+@pytest.mark.parametrize('path, body', [
+    ('/voter', {**BALLOT, 'hashed_id': {'a': 1}}),
+    ('/voter', {**BALLOT, 'vote_message': ["Je vote A"]}),
+    ('/api/register', {'voter_id': ['v']}),
+    ('/api/add_candidate', {'candidate_name': 42}),
+    ('/api/vote', {'voter_id': 'v', 'private_key': 'k', 'candidate': ['A']}),
+])
+def test_non_string_fields_are_rejected(path, body):
+    status, data = post(path, body)
+    assert status == 400
+    assert "Champs manquants/invalides" in data['message']
+
+
+@pytest.mark.parametrize('method, path, body', [
+    ('POST', '/voter', {**BALLOT, 'signature': ''}),
+    ('POST', '/voter', [BALLOT]),
+    ('POST', '/api/register', {}),
+    ('GET', '/api/demonstration', None),
+])
+def test_responses_match_flask_app(method, path, body):
+    """Validation et réponses JSON partagées (web_api): mêmes réponses que app.py"""
+    response = flask_app.app.test_client().open(path, method=method, json=body)
+    assert call(method, path, body) == (response.status_code, response.get_json())
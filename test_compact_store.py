@@ -0,0 +1,53 @@
+"""Tests du stockage compact des électeurs et des bulletins (python -m pytest test_compact_store.py)"""
+
+from compact_store import BallotStore, VoterStore, der_to_pem, pem_to_der
+from signature import get_signature_scheme
+
+HEX_ID = 'ab' * 32
+
+
+def test_voters_round_trip_regular_and_irregular_values():
+    public_key = get_signature_scheme('ed25519').generate_key_pair()[1]
+    voters = {
+        HEX_ID: {'public_key': public_key, 'has_voted': True,
+                 'registration_date': '2026-01-02T03:04:05.678901', 'signature_scheme': 'rsa-pss'},
+        'ID-NON-HEX': {'public_key': 'clé non PEM', 'has_voted': False,
+                       'registration_date': 'hier', 'signature_scheme': 'ed25519'},
+        'AB' * 32: {'public_key': public_key.replace('\n', '\r\n'), 'has_voted': True,
+                    'registration_date': '2026-01-02T03:04:05', 'signature_scheme': 'rsa-pss'},
+    }
+    store = VoterStore()
+    for hashed_id, info in voters.items():
+        store.add(hashed_id, info['public_key'], info['registration_date'], info['signature_scheme'],
+                  info['has_voted'])
+
+    assert dict(store.items()) == voters
+    assert len(store) == 3 and store.voted_count == store.count_voted() == 2
+    assert 'ID-NON-HEX' in store and 'cd' * 32 not in store
+    assert pem_to_der(public_key) is not None and der_to_pem(pem_to_der(public_key)) == public_key
+
+    # Réinscription: même ligne, has_voted remis à zéro
+    row = store.row(HEX_ID)
+    assert store.add(HEX_ID, public_key, '2026-01-03T00:00:00', 'ecdsa-p256') == row
+    assert not store.has_voted(row) and store.voted_count == 1
+    assert store.view(row).signature_scheme == 'ecdsa-p256'
+
+
+def test_ballots_round_trip_regular_and_irregular_values():
+    records = [
+        {'voter_hash': HEX_ID, 'vote_hash': 'cd' * 32, 'signature': 'c2lnbmF0dXJl',
+         'timestamp': '2026-01-02T03:04:05.678901', 'candidate_id': 0},
+        {'voter_hash': 'non-hex', 'vote_hash': 'CD' * 32, 'signature': 'pas du base64!',
+         'timestamp': 'demain', 'candidate_id': 1, 'vote_message': "Je vote  B", 'station': 'Nord'},
+        {'voter_hash': 'ef' * 32, 'vote_hash': '01' * 32, 'signature': 'c2ln',
+         'timestamp': '2026-01-02T03:04:05', 'candidate_id': 0, 'station': 'Sud'},
+    ]
+    store = BallotStore()
+    for record in records:
+        store.append(dict(record))
+
+    assert [store.record(row) for row in range(len(store))] == records
+    assert store.row_of('non-hex') == 1 and store.row_of('ef' * 32) == 2 and store.row_of('00' * 32) is None
+    assert [store.station(row) for row in range(3)] == [None, 'Nord', 'Sud']
+    assert store.vote_message(0) is None and store.vote_message(1) == "Je vote  B"
+    assert list(store.candidate_ids()) == [0, 1, 0]
@@ -0,0 +1,46 @@
+"""Tests de la base de votes: écriture puis réouverture (python -m pytest test_database.py)"""
+
+import pytest
+
+from database import VotingDatabase
+
+
+@pytest.mark.parametrize('journal', [False, True])
+def test_vote_for_unknown_candidate_survives_reopen(tmp_path, journal):
+    db_file = str(tmp_path / 'votes.json')
+    db = VotingDatabase(db_file, journal=journal)
+    db.initialize_candidates(['A'])
+    db.register_voter('h1', 'cle-1')
+    db.register_voter('h2', 'cle-2')
+    db.add_vote('h1', "Je vote Z", 'hash-1', 'sig-1', 'Z')
+    db.record_ballot('h2', "Je vote A", 'hash-2', 'sig-2', 'A')
+    expected = (db.get_results(), list(db.iter_votes()), db.get_merkle_root())
+    db.close()
+
+    reopened = VotingDatabase(db_file, journal=journal)
+    assert (reopened.get_results(), list(reopened.iter_votes()), reopened.get_merkle_root()) == expected
+    assert reopened.get_results() == {'Z': 1, 'A': 1}
+    reopened.close()
+
+
+def test_journal_compaction_keeps_state_across_reopen(tmp_path):
+    db_file = str(tmp_path / 'votes.json')
+    db = VotingDatabase(db_file, journal=True, compact_every=4)
+    db.initialize_candidates(['A', 'B'])
+    for i in range(5):
+        db.register_voter(f'h{i}', f'cle-{i}')
+    # 6 entrées: compaction à la 4e, il en reste 2 dans le journal
+    with open(db.journal_file, encoding='utf-8') as f:
+        assert len(f.readlines()) == 2
+    db.record_ballot('h0', "Je vote A", 'hash-0', 'sig-0', 'A')
+    db.record_ballot('h1', "Je vote B", 'hash-1', 'sig-1', 'B')
+    db.set_setting('station', 'Nord')
+    expected = (db.get_results(), db.get_statistics(), list(db.iter_votes()), db.get_merkle_root())
+    db.close()
+
+    reopened = VotingDatabase(db_file, journal=True, compact_every=4)
+    assert (reopened.get_results(), reopened.get_statistics(), list(reopened.iter_votes()),
+            reopened.get_merkle_root()) == expected
+    assert reopened.get_setting('station') == 'Nord'
+    assert not reopened.record_ballot('h0', "Je vote B", 'hash-x', 'sig-x', 'B')
+    reopened.close()
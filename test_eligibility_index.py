@@ -0,0 +1,45 @@
+"""Tests de l'index d'éligibilité (python -m pytest test_eligibility_index.py)"""
+
+import pytest
+
+from eligibility_index import EligibilityIndex, build_index, build_index_from_roster
+from hash import HashFunctions
+
+
+def test_lookups_with_bloom_misses(tmp_path):
+    roster = [f'electeur-{i}' for i in range(1000)]
+    hashed_ids = HashFunctions.hash_many(roster, 'sha256')
+    index_file = str(tmp_path / 'roster.idx')
+    # Petites tranches: tri externe et fusion; doublons éliminés
+    assert build_index(hashed_ids + hashed_ids[:10], index_file, run_size=64) == 1000
+
+    with EligibilityIndex(index_file) as index:
+        assert len(index) == 1000 and index.hash_algorithm == 'sha256'
+        assert all(hashed_id in index for hashed_id in hashed_ids)
+        assert index.bloom_rejections == 0
+
+        absent = HashFunctions.hash_many([f'inconnu-{i}' for i in range(2000)], 'sha256')
+        assert not any(hashed_id in index for hashed_id in absent)
+        # Taux de faux positifs visé 1%: la plupart des absents sont écartés par le seul filtre
+        assert index.bloom_rejections > 1900
+        assert index.lookups == 3000
+        # ID mal formé: absent, sans recherche
+        assert 'pas-un-hash' not in index and None not in index
+        assert index.lookups == 3000
+
+
+def test_index_from_roster_and_invalid_input(tmp_path):
+    roster_file = tmp_path / 'liste.csv'
+    roster_file.write_text('nom,voter_id\nA,e1\nB,e2\n', encoding='utf-8')
+    index_file = str(tmp_path / 'roster.idx')
+    assert build_index_from_roster(str(roster_file), index_file, 'blake2b') == 2
+    with EligibilityIndex(index_file) as index:
+        assert index.hash_algorithm == 'blake2b'
+        assert HashFunctions.hash_voter_id('e2', 'blake2b') in index
+        assert HashFunctions.hash_voter_id('e2', 'sha256') not in index
+
+    with pytest.raises(ValueError):
+        build_index(['abc'], str(tmp_path / 'bad.idx'))
+    (tmp_path / 'empty.idx').write_bytes(b'')
+    with pytest.raises(ValueError):
+        EligibilityIndex(str(tmp_path / 'empty.idx'))
@@ -0,0 +1,27 @@
+"""Tests de l'enregistrement en masse (python -m pytest test_enrollment.py)"""
+
+from enrollment import Keystore, bulk_register
+from hash import HashFunctions
+from sqlite_database import SQLiteVotingDatabase
+
+
+def test_keystore_keeps_keys_of_voters_registered_meanwhile(tmp_path, monkeypatch):
+    db = SQLiteVotingDatabase(str(tmp_path / 'votes.db'))
+    keystore_file = str(tmp_path / 'keystore.db')
+    hashed_id = HashFunctions.hash_voter_id('electeur-1', 'sha256')
+    db.register_voter(hashed_id, 'cle-publique-existante')
+    keystore = Keystore(keystore_file)
+    keystore.add_many([(hashed_id, 'electeur-1', 'cle-privee-existante')])
+    keystore.close()
+
+    # Course: l'électeur est enregistré après le filtrage de l'étape 1
+    monkeypatch.setattr(db, 'is_voter_registered', lambda hashed_id: False)
+    summary = bulk_register(db, ['electeur-1', 'electeur-2'], keystore_file, workers=1)
+
+    assert summary['registered'] == 1 and summary['already_registered'] == 1
+    keystore = Keystore(keystore_file)
+    assert keystore.get_private_key('electeur-1') == 'cle-privee-existante'
+    assert keystore.get_private_key('electeur-2').startswith('-----BEGIN')
+    keystore.close()
+    assert db.get_public_key(hashed_id) == 'cle-publique-existante'
+    db.close()
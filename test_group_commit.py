@@ -0,0 +1,60 @@
+"""Tests de la validation groupée (python -m pytest test_group_commit.py)"""
+
+import queue
+import threading
+import time
+
+import pytest
+
+import group_commit
+from group_commit import GroupCommitter
+
+
+class RecordingDatabase:
+    """Base minimale: enregistre les bulletins reçus"""
+
+    def __init__(self):
+        self.ballots = []
+
+    def record_ballots(self, ballots, sync=True):
+        self.ballots.extend(ballots)
+        return [True] * len(ballots)
+
+
+class LateQueue(queue.Queue):
+    """File dont la mise en file d'un bulletin attend (au plus 0,5 s) que la sentinelle d'arrêt soit posée"""
+
+    def __init__(self):
+        super().__init__()
+        self.sentinel_queued = threading.Event()
+
+    def put(self, item, *args, **kwargs):
+        if item is None:
+            super().put(item, *args, **kwargs)
+            self.sentinel_queued.set()
+            return
+        self.sentinel_queued.wait(0.5)
+        super().put(item, *args, **kwargs)
+
+
+def test_submit_racing_close_never_hangs(monkeypatch):
+    monkeypatch.setattr(group_commit.queue, 'Queue', LateQueue)
+    committer = GroupCommitter(RecordingDatabase())
+    submitted = []
+    submitter = threading.Thread(target=lambda: submitted.append(committer.submit('h', 'm', 'v', 's', 'A')))
+    submitter.start()
+    time.sleep(0.05)
+    closer = threading.Thread(target=committer.close)
+    closer.start()
+    submitter.join()
+    closer.join()
+    # Le bulletin accepté par submit a été écrit avant l'arrêt
+    assert submitted[0].result(timeout=5) is True
+
+
+def test_submit_after_close_is_refused():
+    committer = GroupCommitter(RecordingDatabase())
+    assert committer.commit('h', 'm', 'v', 's', 'A') is True
+    committer.close()
+    with pytest.raises(RuntimeError):
+        committer.submit('h2', 'm', 'v', 's', 'A')
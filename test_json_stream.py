@@ -0,0 +1,53 @@
+"""Tests de la lecture en flux des bases JSON (python -m pytest test_json_stream.py)"""
+
+import io
+import json
+
+import pytest
+
+from database import VotingDatabase
+from json_stream import iter_json_object
+
+DOCUMENT = {
+    'candidates': ["Élodie", "Zoé"],
+    'registered_voters': {'h1': {'public_key': 'clé', 'has_voted': True}, 'h2': {}},
+    'votes': [{'candidate': "Zoé", 'n': 1234567890}, 12.5, None, "é" * 40],
+    'settings': {}
+}
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 7, 1 << 16])
+def test_streamed_items_match_json_load(chunk_size):
+    raw = json.dumps(DOCUMENT, ensure_ascii=False, indent=1).encode('utf-8')
+    items = list(iter_json_object(io.BytesIO(raw), ('registered_voters', 'votes'), chunk_size))
+    assert items == [
+        ('candidates', None, DOCUMENT['candidates']),
+        ('registered_voters', 'h1', DOCUMENT['registered_voters']['h1']),
+        ('registered_voters', 'h2', {}),
+        *(('votes', index, vote) for index, vote in enumerate(DOCUMENT['votes'])),
+        ('settings', None, {}),
+    ]
+
+
+@pytest.mark.parametrize('raw', [b'{"votes": [1, 2', b'{"votes": [1]} []', b'[1, 2]'])
+def test_invalid_documents_raise(raw):
+    with pytest.raises(ValueError):
+        list(iter_json_object(io.BytesIO(raw), ('votes',), chunk_size=4))
+
+
+def test_database_load_reports_progress(tmp_path):
+    db_file = str(tmp_path / 'votes.json')
+    db = VotingDatabase(db_file)
+    db.initialize_candidates(['A'])
+    for i in range(50):
+        db.register_voter(f'h{i}', f'cle-{i}')
+    db.record_ballot('h0', "Je vote A", 'hash-0', 'sig-0', 'A')
+    db.close()
+
+    progress = []
+    reopened = VotingDatabase(db_file, progress=lambda read, total: progress.append((read, total)))
+    assert reopened.get_statistics()['total_registered'] == 50
+    assert reopened.get_results() == {'A': 1}
+    size = (tmp_path / 'votes.json').stat().st_size
+    assert progress and progress[-1] == (size, size)
+    reopened.close()
@@ -0,0 +1,60 @@
+"""Tests de la diffusion des résultats en direct (python -m pytest test_live_results.py)"""
+
+import json
+
+import pytest
+
+from live_results import CachedResults, ResultsBroadcaster, ResultsCache
+from voting_system import VotingSystem
+from web_api import published_results
+
+
+def results(version, **counts):
+    payload = {'resultats': counts, 'total': sum(counts.values())}
+    return CachedResults(version, f'"v{version}"', payload, b'')
+
+
+def test_failing_listener_is_removed_and_others_still_notified():
+    broadcaster = ResultsBroadcaster(cache=None)
+    broadcaster._last = results(1)
+    calls = []
+
+    def failing():
+        raise RuntimeError("boucle fermée")
+
+    broadcaster.add_listener(failing)
+    broadcaster.add_listener(lambda: calls.append('ok'))
+    broadcaster._publish(results(2, A=1))
+    broadcaster._publish(results(3, A=2))
+
+    assert calls == ['ok', 'ok']
+    assert failing not in broadcaster._listeners
+    assert [version for _, version, _ in broadcaster._events] == [2, 3]
+
+
+@pytest.mark.parametrize('backend, db_name', [('json', 'votes.json'), ('sqlite', 'votes.db')])
+def test_etag_changes_after_a_new_ballot(tmp_path, backend, db_name):
+    db_file = str(tmp_path / db_name)
+    system = VotingSystem(db_file=db_file, backend=backend)
+    system.setup_election(['A', 'B'])
+    cache = ResultsCache(system)
+    status, body, headers = published_results(cache, None)
+    assert status == 200 and json.loads(body)['total'] == 0
+    etag = headers['ETag']
+    assert published_results(cache, etag) == (304, b'', headers)
+    assert published_results(cache, f'"autre", W/{etag}')[0] == 304
+
+    _, _, private_key, _ = system.register_voter('electeur-1')
+    assert system.submit_vote('electeur-1', 'A', private_key)[0]
+    status, body, headers = published_results(cache, etag)
+    assert status == 200 and json.loads(body)['resultats'] == {'A': 1, 'B': 0}
+    assert headers['ETag'] != etag
+    assert published_results(cache, headers['ETag'])[0] == 304
+    assert cache.builds == 2
+    system.close()
+
+    # Après redémarrage, un ETag antérieur au bulletin ne désigne pas les nouveaux résultats
+    system = VotingSystem(db_file=db_file, backend=backend)
+    status, body, _ = published_results(ResultsCache(system), etag)
+    assert status == 200 and json.loads(body)['resultats'] == {'A': 1, 'B': 0}
+    system.close()
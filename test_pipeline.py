@@ -0,0 +1,101 @@
+"""Tests du pipeline d'ingestion des bulletins signés (python -m pytest test_pipeline.py)"""
+
+import json
+
+import pytest
+
+from pipeline import ingest_ndjson
+from vote import Voter
+from voting_system import VotingSystem
+
+
+@pytest.fixture(scope='module')
+def election(tmp_path_factory):
+    """Élection SQLite à deux candidats et son pipeline (un processus de vérification)"""
+    system = VotingSystem(db_file=str(tmp_path_factory.mktemp('pipeline') / 'votes.db'), backend='sqlite')
+    system.setup_election(['A', 'B'])
+    pipeline = system.create_pipeline(workers=1)
+    yield system, pipeline
+    pipeline.close()
+    system.close()
+
+
+def signed_ballot(system, voter_id, candidate):
+    """Inscrit voter_id et retourne son bulletin signé (hashed_id, vote_message, vote_hash, signature)"""
+    success, message, private_key, _ = system.register_voter(voter_id)
+    assert success, message
+    voter = Voter(voter_id, system.hash_algorithm)
+    voter.private_key_pem = private_key
+    voter.hashed_id = voter.hash_id()
+    voter.signature_scheme = system.db.get_signature_scheme(voter.hashed_id)
+    ballot = voter.sign_vote(f"Je vote {candidate}")
+    return voter.hashed_id, ballot['vote_message'], ballot['vote_hash'], ballot['signature_b64']
+
+
+def test_invalid_ballot_does_not_stop_dispatcher(election):
+    system, pipeline = election
+    # Erreur de la base (ProgrammingError) pendant les contrôles rapides: bulletin rejeté seul
+    success, message = pipeline.submit(['x'], "Je vote A", "a", "b").result(timeout=10)
+    assert not success
+
+    success, message = pipeline.submit(*signed_ballot(system, 'electeur-1', 'A')).result(timeout=30)
+    assert success, message
+
+
+def test_dispatcher_errors_release_reservation(election, monkeypatch):
+    system, pipeline = election
+    ballot = signed_ballot(system, 'electeur-2', 'B')
+    monkeypatch.setattr(pipeline.db, 'get_public_key', lambda hashed_id: 1 / 0)
+    success, _ = pipeline.submit(*ballot).result(timeout=10)
+    assert not success
+    monkeypatch.undo()
+
+    # Réservation libérée: l'électeur peut soumettre à nouveau
+    success, message = pipeline.submit(*ballot).result(timeout=30)
+    assert success, message
+
+
+def test_close_does_not_wait_on_stopped_dispatcher(election):
+    system, _ = election
+    pipeline = system.create_pipeline(workers=1)
+    pipeline._intake.put(None)
+    pipeline._dispatcher.join(timeout=10)
+    with pytest.raises(RuntimeError):
+        pipeline.submit('id', "Je vote A", "a", "b")
+    pipeline.close()
+
+
+def test_batch_rejects_non_string_fields(election):
+    system, pipeline = election
+    hashed_id, vote_message, vote_hash, signature = signed_ballot(system, 'electeur-3', 'A')
+    lines = [
+        json.dumps({'hashed_id': ['x'], 'vote_message': "Je vote A", 'vote_hash': 'a', 'signature': 'b'}),
+        '{oops',
+        '',
+        json.dumps({'hashed_id': hashed_id, 'vote_message': vote_message,
+                    'vote_hash': vote_hash, 'signature': signature}),
+    ]
+    statuses = list(ingest_ndjson(pipeline, lines))
+    assert [status.get('line') for status in statuses] == [1, 2, 4, None]
+    assert "Champs manquants/invalides: hashed_id" in statuses[0]['message']
+    assert not statuses[1]['success'] and statuses[2]['success']
+    assert statuses[-1] == {'done': True, 'accepted': 1, 'rejected': 2}
+
+
+def test_killed_worker_is_replaced(election):
+    system, _ = election
+    pipeline = system.create_pipeline(workers=1)
+    success, message = pipeline.submit(*signed_ballot(system, 'electeur-4', 'A')).result(timeout=30)
+    assert success, message
+
+    broken = pipeline._pool
+    for process in list(broken._processes.values()):
+        process.kill()
+        process.join()
+    # Pool cassé ou non encore détecté: le bulletin est vérifié par le nouveau pool
+    success, message = pipeline.submit(*signed_ballot(system, 'electeur-5', 'B')).result(timeout=30)
+    assert success, message
+    assert pipeline._pool is not broken
+    success, message = pipeline.submit(*signed_ballot(system, 'electeur-6', 'A')).result(timeout=30)
+    assert success, message
+    pipeline.close()
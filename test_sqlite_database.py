@@ -0,0 +1,103 @@
+"""Tests du stockage SQLite (python -m pytest test_sqlite_database.py)"""
+
+import threading
+
+from database import VotingDatabase
+from merkle import MerkleTree, ballot_leaf_hash, verify_receipt
+from sqlite_database import SQLiteVotingDatabase
+
+
+def test_concurrent_votes_keep_the_merkle_tree_consistent(tmp_path):
+    db_file = str(tmp_path / 'votes.db')
+    db = SQLiteVotingDatabase(db_file)
+    db.initialize_candidates(['A', 'B'])
+    threads, per_thread = 8, 40
+    barrier = threading.Barrier(threads)
+    errors = []
+
+    def vote(thread):
+        barrier.wait()
+        try:
+            for i in range(per_thread):
+                hashed_id = f'h{thread}-{i}'
+                if i % 2:
+                    db.add_vote(hashed_id, "Je vote A", f'v{thread}-{i}', f's{thread}-{i}', 'A')
+                else:
+                    db.register_voter(hashed_id, 'cle')
+                    db.record_ballot(hashed_id, "Je vote B", f'v{thread}-{i}', f's{thread}-{i}', 'B')
+        except Exception as e:
+            errors.append(e)
+        finally:
+            db.close()
+
+    workers = [threading.Thread(target=vote, args=(thread,)) for thread in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert errors == []
+
+    total = threads * per_thread
+    conn = db._connection()
+    leaf_indexes = [row[0] for row in conn.execute('SELECT leaf_index FROM votes ORDER BY leaf_index')]
+    assert leaf_indexes == list(range(total))
+
+    expected = MerkleTree()
+    for voter_hash, vote_hash, signature in conn.execute(
+            'SELECT voter_hash, vote_hash, signature FROM votes ORDER BY leaf_index'):
+        expected.append(ballot_leaf_hash(voter_hash, vote_hash, signature))
+    assert db.get_merkle_root() == expected.root()
+    for hashed_id in ('h0-0', 'h3-17', f'h{threads - 1}-{per_thread - 1}'):
+        assert verify_receipt(db.get_inclusion_proof(hashed_id), db.get_merkle_root())
+    assert db.get_vote_count() == total
+    db.close()
+
+
+def snapshot(db):
+    return (db.get_results(), db.get_statistics(), list(db.iter_votes()), list(db.iter_voters()),
+            db.get_candidates(), db.get_merkle_root(), db.get_tally_version())
+
+
+def test_state_survives_reopen(tmp_path):
+    db_file = str(tmp_path / 'votes.db')
+    db = SQLiteVotingDatabase(db_file)
+    db.initialize_candidates(['A', 'B'])
+    db.set_setting('signature_scheme', 'ed25519')
+    assert db.register_voters([('h1', 'cle-1'), ('h2', 'cle-2', 'ed25519'), ('h1', 'cle-x')]) == [True, True, False]
+    assert db.record_ballot('h1', "Je vote A", 'hash-1', 'sig-1', 'A')
+    assert not db.record_ballot('h1', "Je vote B", 'hash-x', 'sig-x', 'B')
+    db.add_candidate('C')
+    expected = snapshot(db)
+    db.close()
+
+    reopened = SQLiteVotingDatabase(db_file)
+    assert snapshot(reopened) == expected
+    assert reopened.get_results() == {'A': 1} and reopened.get_candidates() == ['A', 'B', 'C']
+    assert reopened.has_voted('h1') and not reopened.has_voted('h2')
+    assert reopened.get_public_key('h2') == 'cle-2' and reopened.get_signature_scheme('h2') == 'ed25519'
+    assert reopened.get_setting('signature_scheme') == 'ed25519'
+    assert verify_receipt(reopened.get_inclusion_proof('h1'), reopened.get_merkle_root())
+    assert reopened.check_consistency()['consistent']
+    reopened.close()
+
+
+def test_migration_from_json_keeps_ballots(tmp_path):
+    source = VotingDatabase(str(tmp_path / 'votes.json'), journal=True)
+    source.initialize_candidates(['A', 'B'])
+    source.set_setting('station', 'Nord')
+    for i, candidate in enumerate(['A', 'B', 'A']):
+        source.register_voter(f'h{i}', f'cle-{i}')
+        source.record_ballot(f'h{i}', f"Je vote {candidate}", f'hash-{i}', f'sig-{i}', candidate)
+    source.register_voter('h3', 'cle-3')
+    source.close()
+
+    db = SQLiteVotingDatabase(str(tmp_path / 'votes.db'))
+    assert db.migrate_from_json(str(tmp_path / 'votes.json')) == (4, 3)
+    source = VotingDatabase(str(tmp_path / 'votes.json'), journal=True)
+    assert db.get_results() == source.get_results() == {'A': 2, 'B': 1}
+    assert list(db.iter_votes()) == list(source.iter_votes())
+    assert list(db.iter_tally_rows()) == list(source.iter_tally_rows())
+    assert db.get_merkle_root() == source.get_merkle_root()
+    assert db.check_consistency()['consistent']
+    source.close()
+    db.close()
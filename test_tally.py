@@ -0,0 +1,49 @@
+"""Tests du dépouillement détaillé (python -m pytest test_tally.py)"""
+
+import pytest
+
+import tally
+from database import VotingDatabase
+from sqlite_database import SQLiteVotingDatabase
+
+
+def backends(tmp_path):
+    return [VotingDatabase(str(tmp_path / 'votes.json')), SQLiteVotingDatabase(str(tmp_path / 'votes.db'))]
+
+
+def fill(db):
+    """Deux bulletins au bureau Nord, un au bureau Sud"""
+    db.initialize_candidates(['A', 'B'])
+    for i, (station, candidate) in enumerate([('Nord', 'A'), ('Nord', 'B'), ('Sud', 'A')]):
+        db.set_setting('station', station)
+        db.register_voter(f'h{i}', 'cle')
+        assert db.record_ballot(f'h{i}', f"Je vote {candidate}", f'v{i}', f's{i}', candidate)
+
+
+@pytest.fixture(params=['python', 'numpy'])
+def counting(request, monkeypatch):
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+        assert tally.numpy is not None
+    else:
+        monkeypatch.setattr(tally, 'numpy', None)
+    return request.param
+
+
+def test_results_by_station_uses_recorded_station(tmp_path, counting):
+    for db in backends(tmp_path):
+        fill(db)
+        stats = tally.compute_statistics(db)
+        assert stats['results_by_station'] == {'Nord': {'A': 1, 'B': 1}, 'Sud': {'A': 1, 'B': 0}}
+        assert stats['results'] == {'A': 2, 'B': 1}
+        assert sum(stats['turnout_by_hour'].values()) == 3
+        db.close()
+
+
+def test_station_survives_reopen(tmp_path):
+    for db in backends(tmp_path):
+        fill(db)
+        db.close()
+    for db in backends(tmp_path):
+        assert [station for _, _, station in db.iter_tally_rows()] == ['Nord', 'Nord', 'Sud']
+        db.close()
@@ -0,0 +1,31 @@
+"""Tests de vérification des bulletins par VotingSystem (python -m pytest test_voting_system.py)"""
+
+from verification import REJECTION_MESSAGES
+from vote import Voter
+from voting_system import VotingSystem
+
+
+def test_submit_signed_vote_uses_shared_rejection_messages(tmp_path):
+    system = VotingSystem(db_file=str(tmp_path / 'votes.db'), backend='sqlite')
+    system.setup_election(['A', 'B'])
+    success, message, private_key, _ = system.register_voter('electeur-1')
+    assert success, message
+    voter = Voter('electeur-1', system.hash_algorithm)
+    voter.private_key_pem = private_key
+    voter.hashed_id = voter.hash_id()
+    voter.signature_scheme = system.db.get_signature_scheme(voter.hashed_id)
+    ballot = voter.sign_vote("Je vote A")
+
+    success, message = system.submit_signed_vote(voter.hashed_id, "Je vote B",
+                                                 ballot['vote_hash'], ballot['signature_b64'])
+    assert (success, message) == (False, REJECTION_MESSAGES['hash_mismatch'])
+    success, message = system.submit_signed_vote(voter.hashed_id, ballot['vote_message'],
+                                                 ballot['vote_hash'], '@@@')
+    assert (success, message) == (False, REJECTION_MESSAGES['bad_signature_encoding'])
+
+    # Réservation libérée après chaque rejet: le bulletin authentique est accepté
+    success, message = system.submit_signed_vote(voter.hashed_id, ballot['vote_message'],
+                                                 ballot['vote_hash'], ballot['signature_b64'])
+    assert success, message
+    assert system.db.get_results()['A'] == 1
+    system.close()
@@ -0,0 +1,46 @@
+from hash import HashFunctions
+from signature import DEFAULT_SIGNATURE_SCHEME, get_signature_scheme
+import base64
+import binascii
+
+# Message renvoyé à l'électeur pour chaque motif de rejet
+REJECTION_MESSAGES = {
+    'missing_public_key': "❌ Clé publique introuvable",
+    'hash_mismatch': "❌ INTÉGRITÉ COMPROMISE: Le message a été modifié!",
+    'bad_signature_encoding': "❌ SIGNATURE INVALIDE: Vote rejeté!",
+    'invalid_signature': "❌ SIGNATURE INVALIDE: Vote rejeté!"
+}
+
+def verify_ballot(vote_message, vote_hash, signature_b64, public_key_pem, hash_algorithm='sha256',
+                  signature_scheme=DEFAULT_SIGNATURE_SCHEME, expected_hash=None):
+    """
+    Vérifie un bulletin signé sans toucher à la base de données
+    (fonction de module: utilisable dans un pool de processus)
+    Entrée:
+        - vote_message (str): Message du vote en clair
+        - vote_hash (str): Hash reçu du message
+        - signature_b64 (str): Signature en base64
+        - public_key_pem (str): Clé publique de l'électeur (None si inconnue)
+        - hash_algorithm (str): Algorithme de hachage de l'élection
+        - signature_scheme (str): Schéma de signature de l'électeur
+        - expected_hash (str): Hash du message s'il est déjà connu (catalogue des candidats)
+    Retourne: (valide, raison) avec raison parmi 'ok', 'missing_public_key',
+              'hash_mismatch', 'bad_signature_encoding', 'invalid_signature'
+    """
+    if not public_key_pem:
+        return False, 'missing_public_key'
+
+    if expected_hash is None:
+        expected_hash = HashFunctions.hash_vote(vote_message, hash_algorithm)
+    if expected_hash != vote_hash:
+        return False, 'hash_mismatch'
+
+    try:
+        signature = base64.b64decode(signature_b64, validate=True)
+    except (binascii.Error, ValueError, TypeError):
+        return False, 'bad_signature_encoding'
+
+    if not get_signature_scheme(signature_scheme).verify(vote_hash, signature, public_key_pem):
+        return False, 'invalid_signature'
+
+    return True, 'ok'
@@ -1,13 +1,14 @@
 from hash import HashFunctions
-from signature import RSASignature
+from signature import DEFAULT_SIGNATURE_SCHEME, get_signature_scheme
 import base64
 
 class Voter:
     """Classe représentant un électeur"""
     
-    def __init__(self, voter_id, hash_algorithm='sha256'):
+    def __init__(self, voter_id, hash_algorithm='sha256', signature_scheme=DEFAULT_SIGNATURE_SCHEME):
         self.voter_id = voter_id
         self.hash_algorithm = hash_algorithm
+        self.signature_scheme = signature_scheme  # 'rsa-pss', 'ed25519' ou 'ecdsa-p256'
         self.hashed_id = None
         self.private_key_pem = None  # Clé privée de l'électeur (à conserver secrète)
         self.public_key_pem = None   # Clé publique (à partager avec l'autorité)
@@ -20,17 +21,19 @@ class Voter:
         self.hashed_id = HashFunctions.hash_voter_id(self.voter_id, self.hash_algorithm)
         return self.hashed_id
     
-    def generate_keys(self):
+    def generate_keys(self, key_pool=None):
         """
         Génère la paire de clés cryptographiques pour l'électeur
         IMPORTANT: La clé privée doit être conservée par l'électeur
+        Entrée: key_pool (KeyPool): réserve de clés pré-générées (optionnel)
         """
-        rsa = RSASignature()
-        private_key, public_key = rsa.generate_keys()
+        if key_pool is not None and key_pool.signature_scheme == self.signature_scheme:
+            self.private_key_pem, self.public_key_pem = key_pool.take()
+            return self.private_key_pem, self.public_key_pem
         
-        # Exporter les clés en format PEM
-        self.private_key_pem = rsa.export_private_key_pem(private_key)
-        self.public_key_pem = rsa.export_public_key_pem(public_key)
+        # Générer la paire et l'exporter en format PEM
+        scheme = get_signature_scheme(self.signature_scheme)
+        self.private_key_pem, self.public_key_pem = scheme.generate_key_pair()
         
         return self.private_key_pem, self.public_key_pem
     
@@ -47,7 +50,8 @@ class Voter:
         
         return self.hashed_id, self.public_key_pem
     
-    def create_vote_message(self, candidate):
+    @staticmethod
+    def create_vote_message(candidate):
         """
         Crée le message de vote
         Entrée: candidate (str)
@@ -55,12 +59,13 @@ class Voter:
         """
         return f"Je vote {candidate}"
     
-    def sign_vote(self, vote_message, private_key_pem=None):
+    def sign_vote(self, vote_message, private_key_pem=None, vote_hash=None):
         """
         Signe un vote avec la clé privée de l'électeur
         Entrée: 
             - vote_message (str): Message du vote
             - private_key_pem (str): Clé privée (optionnel si déjà dans l'objet)
+            - vote_hash (str): Hash du message s'il est déjà connu (optionnel)
         Retourne: dict avec toutes les informations du vote signé
         """
         if private_key_pem is None:
@@ -70,11 +75,12 @@ class Voter:
             raise ValueError("Clé privée non disponible.")
         
         # Étape 1: Hacher le message du vote
-        vote_hash = HashFunctions.hash_vote(vote_message, self.hash_algorithm)
+        if vote_hash is None:
+            vote_hash = HashFunctions.hash_vote(vote_message, self.hash_algorithm)
         
         # Étape 2: Signer le hash avec la clé privée
-        rsa = RSASignature()
-        signature = rsa.sign_with_private_key(vote_hash, private_key_pem)
+        scheme = get_signature_scheme(self.signature_scheme)
+        signature = scheme.sign(vote_hash, private_key_pem)
         signature_b64 = base64.b64encode(signature).decode('utf-8')
         
         return {
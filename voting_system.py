@@ -1,23 +1,129 @@
-from database import VotingDatabase
+from database import open_database
+from group_commit import GroupCommitter
 from vote import Voter
-from hash import HashFunctions
-from signature import RSASignature
-import base64
+from hash import HashFunctions, DEFAULT_HASH_ALGORITHM, get_hash_function
+from signature import RSASignature, DEFAULT_SIGNATURE_SCHEME, get_signature_scheme
+from verification import verify_ballot, REJECTION_MESSAGES
+
+# Message renvoyé quand la réservation du droit de vote échoue (voir db.reserve_voter)
+RESERVATION_MESSAGES = {
+    'not_registered': "❌ Électeur non enregistré",
+    'already_voted': "❌ REJETÉ: Vous avez déjà voté!",
+    'in_progress': "❌ REJETÉ: Un vote est déjà en cours pour cet électeur!"
+}
 
 class VotingSystem:
     """Système de vote électronique sécurisé avec signature numérique"""
     
-    def __init__(self, db_file='votes.json', hash_algorithm='sha256'):
-        self.db = VotingDatabase(db_file)
-        self.hash_algorithm = hash_algorithm
+    def __init__(self, db_file='votes.json', hash_algorithm=None, journal=False, backend=None,
+                 group_commit=False, group_commit_delay_ms=5, group_commit_max_batch=64,
+                 key_pool=None, signature_scheme=None, load_progress=None, eligibility_index=None):
+        # load_progress(octets lus, taille): suivi du chargement d'une base JSON volumineuse
+        self.db = open_database(db_file, backend=backend, journal=journal, progress=load_progress)
+        # Index d'éligibilité optionnel (liste électorale): écarte les inconnus sans consulter la base
+        self.eligibility_index = None
+        # Algorithme de hachage des IDs et des votes (celui enregistré pour l'élection par défaut)
+        self.hash_algorithm = self.db.get_setting('hash_algorithm', DEFAULT_HASH_ALGORITHM)
+        if hash_algorithm:
+            self.set_hash_algorithm(hash_algorithm, save=False)
+        # Schéma de signature des nouveaux électeurs (celui enregistré pour l'élection par défaut)
+        self.signature_scheme = signature_scheme or self.db.get_setting(
+            'signature_scheme', DEFAULT_SIGNATURE_SCHEME
+        )
+        get_signature_scheme(self.signature_scheme)
+        # Réserve optionnelle de paires de clés pré-générées (KeyPool)
+        self.key_pool = key_pool
+        # Validation groupée: un fsync par groupe de bulletins au lieu d'une écriture par bulletin
+        self.committer = None
+        if group_commit:
+            self.committer = GroupCommitter(self.db, group_commit_delay_ms, group_commit_max_batch)
+        if eligibility_index:
+            self.load_eligibility_index(eligibility_index)
+    
+    def load_eligibility_index(self, index_file):
+        """
+        Charge un index d'éligibilité (voir eligibility_index.build_index)
+        Lève: ValueError si l'index a été construit avec un autre algorithme de hachage
+        """
+        from eligibility_index import EligibilityIndex
+        index = EligibilityIndex(index_file)
+        if index.hash_algorithm != self.hash_algorithm:
+            index.close()
+            raise ValueError(f"Index construit avec {index.hash_algorithm}, "
+                             f"l'élection utilise {self.hash_algorithm}")
+        if self.eligibility_index is not None:
+            self.eligibility_index.close()
+        self.eligibility_index = index
+        print(f"✓ Index d'éligibilité chargé ({len(index)} électeurs)")
+        return index
+    
+    def is_on_roster(self, hashed_id):
+        """True si l'électeur figure dans l'index d'éligibilité (ou en l'absence d'index)"""
+        return self.eligibility_index is None or hashed_id in self.eligibility_index
+    
+    def check_eligibility(self, voter_id):
+        """
+        Vérifie qu'un électeur peut voter (sans réserver son droit de vote)
+        Retourne: (eligible, raison) avec raison None, 'not_registered' ou 'already_voted'
+        """
+        hashed_id = HashFunctions.hash_voter_id(voter_id, self.hash_algorithm)
+        if not self.is_on_roster(hashed_id) or not self.db.is_voter_registered(hashed_id):
+            return False, 'not_registered'
+        if self.db.has_voted(hashed_id):
+            return False, 'already_voted'
+        return True, None
     
-    def setup_election(self, candidates):
+    def setup_election(self, candidates, signature_scheme=None, hash_algorithm=None, station=None):
         """
         Configure une élection avec la liste des candidats
+        Entrée:
+            - signature_scheme (str): 'rsa-pss', 'ed25519' ou 'ecdsa-p256' (optionnel)
+            - hash_algorithm (str): 'sha256', 'sha3_256' ou 'blake2b' (optionnel)
+            - station (str): bureau de vote de cette base, inscrit sur chaque bulletin (optionnel)
+        Les électeurs déjà enregistrés gardent le schéma de leur clé.
         """
+        if signature_scheme:
+            get_signature_scheme(signature_scheme)
+            self.signature_scheme = signature_scheme
+        if hash_algorithm:
+            self.set_hash_algorithm(hash_algorithm, save=False)
         self.db.initialize_candidates(candidates)
+        self.db.set_setting('signature_scheme', self.signature_scheme)
+        self.db.set_setting('hash_algorithm', self.hash_algorithm)
+        if station:
+            self.db.set_setting('station', station)
         print(f"✓ Élection configurée avec {len(candidates)} candidats")
     
+    def add_candidate(self, name):
+        """
+        Ajoute un candidat à l'élection en cours
+        Retourne: (success, message)
+        """
+        name = (name or '').strip()
+        if not name:
+            return False, "❌ Nom de candidat vide"
+        if not self.db.add_candidate(name):
+            return False, f"❌ Le candidat {name} existe déjà"
+        return True, f"✓ Candidat {name} ajouté"
+    
+    def set_hash_algorithm(self, hash_algorithm, save=True):
+        """
+        Change l'algorithme de hachage de l'élection
+        Entrée: save (bool): enregistrer le choix dans les paramètres de l'élection
+        Lève: ValueError si l'algorithme est inconnu, ou si des électeurs sont déjà
+              enregistrés avec un autre algorithme (leurs IDs hachés ne correspondraient plus)
+        """
+        get_hash_function(hash_algorithm)
+        stored = self.db.get_setting('hash_algorithm', DEFAULT_HASH_ALGORITHM)
+        if hash_algorithm != stored and self.db.get_statistics()['total_registered'] > 0:
+            raise ValueError(f"Des électeurs sont déjà enregistrés avec {stored}: "
+                             f"algorithme {hash_algorithm} refusé")
+        if self.eligibility_index is not None and self.eligibility_index.hash_algorithm != hash_algorithm:
+            raise ValueError(f"L'index d'éligibilité chargé utilise {self.eligibility_index.hash_algorithm}")
+        self.hash_algorithm = hash_algorithm
+        if save:
+            self.db.set_setting('hash_algorithm', hash_algorithm)
+    
     def register_voter(self, voter_id):
         """
         PHASE 1: ENREGISTREMENT D'UN ÉLECTEUR
@@ -32,23 +138,25 @@ class VotingSystem:
         print("="*60)
         
         # Créer l'objet électeur
-        voter = Voter(voter_id, self.hash_algorithm)
+        voter = Voter(voter_id, self.hash_algorithm, self.signature_scheme)
         
         # Hacher l'ID
         hashed_id = voter.hash_id()
         print(f"✓ ID haché: {hashed_id[:32]}...")
         
-        # Vérifier si déjà enregistré
+        # Vérifier l'inscription sur la liste électorale, puis si déjà enregistré
+        if not self.is_on_roster(hashed_id):
+            return False, "❌ Électeur absent de la liste électorale", None, None
         if self.db.is_voter_registered(hashed_id):
             return False, "❌ Cet électeur est déjà enregistré!", None, None
         
         # Générer la paire de clés
-        print("\n🔐 Génération de la paire de clés RSA...")
-        private_key_pem, public_key_pem = voter.generate_keys()
+        print(f"\n🔐 Génération de la paire de clés ({self.signature_scheme})...")
+        private_key_pem, public_key_pem = voter.generate_keys(self.key_pool)
         print("✓ Paire de clés générée")
         
         # Stocker la clé publique dans la base de données
-        self.db.register_voter(hashed_id, public_key_pem)
+        self.db.register_voter(hashed_id, public_key_pem, self.signature_scheme)
         print("✓ Clé publique stockée dans la base de données")
         
         print("\n📋 IMPORTANT:")
@@ -72,39 +180,51 @@ class VotingSystem:
         print("PHASE 2: SOUMISSION DU VOTE")
         print("="*60)
         
-        # Vérifier que le candidat existe
-        if candidate not in self.db.get_candidates():
+        # Vérifier que le candidat existe (recherche dans le catalogue)
+        catalog, candidate_id = self.find_candidate(name=candidate)
+        if candidate_id is None:
             return False, "❌ Candidat invalide"
         
         # Créer l'objet électeur
         voter = Voter(voter_id, self.hash_algorithm)
         hashed_id = voter.hash_id()
+        if not self.is_on_roster(hashed_id):
+            return False, RESERVATION_MESSAGES['not_registered']
         
-        # Vérifier que l'électeur est enregistré
-        if not self.db.is_voter_registered(hashed_id):
-            return False, "❌ Électeur non enregistré"
-        
-        # Vérifier s'il a déjà voté
-        if self.db.has_voted(hashed_id):
-            return False, "❌ REJETÉ: Vous avez déjà voté!"
+        # Réserver le droit de vote (enregistré, n'a pas voté, aucun vote en cours)
+        # avant tout calcul cryptographique
+        reserved, reason = self.db.reserve_voter(hashed_id)
+        if not reserved:
+            return False, RESERVATION_MESSAGES[reason]
         
         print(f"✓ Électeur vérifié (ID haché: {hashed_id[:32]}...)")
         
-        # Créer le message de vote
-        vote_message = voter.create_vote_message(candidate)
+        result = (False, "❌ Vote interrompu")
+        try:
+            result = self._sign_and_submit(voter, hashed_id, catalog, candidate_id, private_key_pem)
+            return result
+        finally:
+            if not result[0]:
+                self.db.release_voter(hashed_id)
+    
+    def _sign_and_submit(self, voter, hashed_id, catalog, candidate_id, private_key_pem):
+        """Signe le vote pour l'électeur (réservé) puis le soumet à la vérification"""
+        # Signer avec le schéma de la clé enregistrée pour cet électeur
+        voter.signature_scheme = self.db.get_signature_scheme(hashed_id)
+        
+        # Message de vote et empreinte précalculés par le catalogue
+        vote_message = catalog.vote_message(candidate_id)
+        vote_hash = catalog.vote_hash(candidate_id, self.hash_algorithm)
         print(f"\n📝 Message de vote: \"{vote_message}\"")
         
-        # Hacher le message
-        vote_hash = HashFunctions.hash_vote(vote_message, self.hash_algorithm)
-        print(f"✓ Empreinte numérique (hash): {vote_hash[:32]}...")
-        
-        # Signer avec la clé privée de l'électeur
+        # Hacher le message et signer l'empreinte avec la clé privée de l'électeur
         print("\n🔏 Signature du vote avec votre clé privée...")
         voter.private_key_pem = private_key_pem
         voter.hashed_id = hashed_id
         
         try:
-            signed_vote = voter.sign_vote(vote_message)
+            signed_vote = voter.sign_vote(vote_message, vote_hash=vote_hash)
+            print(f"✓ Empreinte numérique (hash): {signed_vote['vote_hash'][:32]}...")
             print("✓ Vote signé")
         except Exception as e:
             return False, f"❌ Erreur lors de la signature: {e}"
@@ -117,56 +237,104 @@ class VotingSystem:
         return self._verify_and_record_vote(
             hashed_id, 
             vote_message, 
-            vote_hash, 
-            signed_vote['signature'], 
+            signed_vote['vote_hash'], 
             signed_vote['signature_b64'],
-            candidate
+            catalog.name_of(candidate_id)
         )
     
-    def _verify_and_record_vote(self, hashed_id, vote_message, vote_hash, signature, signature_b64, candidate):
+    def submit_signed_vote(self, hashed_id, vote_message, vote_hash, signature_b64):
+        """
+        SOUMISSION D'UN BULLETIN SIGNÉ PAR LE CLIENT (API serveur)
+        Le serveur ne voit jamais la clé privée: il vérifie seulement le
+        bulletin (hash + signature) puis l'enregistre.
+        Entrée:
+            - hashed_id (str): ID haché de l'électeur
+            - vote_message (str): Message du vote en clair ("Je vote <candidat>")
+            - vote_hash (str): Hash du message calculé par le client
+            - signature_b64 (str): Signature du hash en base64
+        Retourne: (success, message)
+        """
+        catalog, candidate_id = self.find_candidate(vote_message=vote_message)
+        if candidate_id is None:
+            return False, "❌ Candidat invalide"
+        
+        if not self.is_on_roster(hashed_id):
+            return False, RESERVATION_MESSAGES['not_registered']
+        reserved, reason = self.db.reserve_voter(hashed_id)
+        if not reserved:
+            return False, RESERVATION_MESSAGES[reason]
+        
+        result = (False, "❌ Vote interrompu")
+        try:
+            result = self._verify_and_record_vote(hashed_id, vote_message, vote_hash, signature_b64,
+                                                  catalog.name_of(candidate_id))
+            return result
+        finally:
+            if not result[0]:
+                self.db.release_voter(hashed_id)
+    
+    def candidate_for_message(self, vote_message):
+        """
+        Retrouve le candidat désigné par un message de vote
+        Retourne: nom du candidat ou None si le message ne correspond à aucun candidat
+        """
+        catalog, candidate_id = self.find_candidate(vote_message=vote_message)
+        return None if candidate_id is None else catalog.name_of(candidate_id)
+    
+    def find_candidate(self, name=None, vote_message=None):
+        """
+        Cherche un candidat de l'élection par nom ou par message de vote
+        (catalogue relu une fois si absent: candidat ajouté par un autre processus)
+        Retourne: (catalogue, ID du candidat ou None)
+        """
+        def lookup(catalog):
+            return catalog.id_of(name) if name is not None else catalog.id_for_message(vote_message)
+        
+        catalog = self.db.get_candidate_catalog()
+        candidate_id = lookup(catalog)
+        if candidate_id is None:
+            catalog = self.db.refresh_candidate_catalog()
+            candidate_id = lookup(catalog)
+        return catalog, candidate_id
+    
+    def _verify_and_record_vote(self, hashed_id, vote_message, vote_hash, signature_b64, candidate):
         """
         PHASE 3: VÉRIFICATION ET ENREGISTREMENT (CÔTÉ SERVEUR)
-        - Recalcule le hash du message reçu
         - Récupère la clé publique de l'électeur
-        - Déchiffre la signature avec la clé publique
-        - Compare les deux hash
-        - Si identiques: vote valide
+        - Recalcule le hash du message reçu et le compare au hash signé
+        - Vérifie la signature avec la clé publique (verification.verify_ballot)
+        - Si tout concorde: vote valide
         """
-        # Récupérer la clé publique depuis la base de données
+        # Clé publique et schéma de signature enregistrés pour l'électeur
         public_key_pem = self.db.get_public_key(hashed_id)
-        if not public_key_pem:
-            return False, "❌ Clé publique introuvable"
+        signature_scheme = self.db.get_signature_scheme(hashed_id) or DEFAULT_SIGNATURE_SCHEME
         
-        print("✓ Clé publique de l'électeur récupérée")
+        # Hash attendu précalculé par le catalogue quand le message désigne un candidat
+        catalog, candidate_id = self.find_candidate(vote_message=vote_message)
+        expected_hash = None if candidate_id is None else catalog.vote_hash(candidate_id, self.hash_algorithm)
         
-        # Recalculer le hash localement
-        print("\n🔍 Vérification de l'intégrité...")
-        local_hash = HashFunctions.hash_vote(vote_message, self.hash_algorithm)
+        print(f"\n🔍 Vérification de l'intégrité et de la signature ({signature_scheme})...")
         print(f"   Hash reçu    : {vote_hash[:32]}...")
-        print(f"   Hash calculé : {local_hash[:32]}...")
-        
-        if local_hash != vote_hash:
-            return False, "❌ INTÉGRITÉ COMPROMISE: Le message a été modifié!"
+        valid, reason = verify_ballot(vote_message, vote_hash, signature_b64, public_key_pem,
+                                      self.hash_algorithm, signature_scheme, expected_hash)
+        if not valid:
+            return False, REJECTION_MESSAGES[reason]
         
         print("✓ Intégrité vérifiée (hashs identiques)")
-        
-        # Vérifier la signature avec la clé publique
-        print("\n🔓 Vérification de la signature...")
-        rsa = RSASignature()
-        is_valid = rsa.verify_with_public_key(vote_hash, signature, public_key_pem)
-        
-        if not is_valid:
-            return False, "❌ SIGNATURE INVALIDE: Vote rejeté!"
-        
         print("✓ Signature valide")
         print("\n✅ AUTHENTIFICATION RÉUSSIE:")
         print("   • Authenticité: Le vote provient bien de cet électeur")
         print("   • Intégrité: Le bulletin n'a pas été modifié")
         print("   • Non-répudiation: L'électeur ne peut nier avoir voté")
         
-        # Enregistrer le vote
-        self.db.mark_as_voted(hashed_id)
-        self.db.add_vote(hashed_id, vote_message, vote_hash, signature_b64, candidate)
+        # Enregistrer le vote (électeur marqué + bulletin ajouté en une seule écriture)
+        if self.committer:
+            recorded = self.committer.commit(hashed_id, vote_message, vote_hash, signature_b64, candidate)
+        else:
+            recorded = self.db.record_ballot(hashed_id, vote_message, vote_hash, signature_b64, candidate)
+        
+        if not recorded:
+            return False, "❌ REJETÉ: Vous avez déjà voté!"
         
         print("\n✓ Vote enregistré avec succès!")
         
@@ -197,11 +365,96 @@ class VotingSystem:
         
         print("="*60)
     
+    def get_detailed_statistics(self):
+        """
+        Dépouillement vectorisé: statistiques de db.get_statistics() plus pourcentages,
+        participation par heure et résultats par heure / par bureau (voir tally.py)
+        """
+        from tally import compute_statistics
+        return compute_statistics(self.db)
+    
+    def export_partial_tally(self, filename, station=None):
+        """
+        Exporte le résultat partiel de ce bureau (fusionnable avec partial_tally.merge_partials)
+        Retourne: PartialTally
+        """
+        from partial_tally import PartialTally
+        partial = PartialTally.from_database(self.db, station)
+        partial.save(filename)
+        return partial
+    
     def get_candidates(self):
         """Retourne la liste des candidats"""
         return self.db.get_candidates()
     
+    def verify_integrity(self):
+        """
+        Contrôle rapide d'intégrité: compteurs égaux au décompte complet et
+        un bulletin par électeur ayant voté (le contrôle des signatures est audit_votes)
+        Retourne: dict {'integrity_ok', 'consistent', 'total_votes', 'total_voted', 'merkle_root'}
+        """
+        consistency = self.db.check_consistency()
+        stats = self.db.get_statistics()
+        return {
+            'integrity_ok': consistency['consistent'] and stats['total_votes'] == stats['total_voted'],
+            'consistent': consistency['consistent'],
+            'total_votes': stats['total_votes'],
+            'total_voted': stats['total_voted'],
+            'merkle_root': self.db.get_merkle_root()
+        }
+    
+    def get_merkle_root(self):
+        """Engagement publié sur l'ensemble des bulletins (racine de Merkle)"""
+        return self.db.get_merkle_root()
+    
+    def get_vote_receipt(self, voter_id):
+        """
+        Reçu de vote: preuve d'inclusion O(log n) du bulletin de l'électeur,
+        vérifiable hors ligne avec merkle.verify_receipt(reçu, racine_publiée)
+        Retourne: dict ou None si l'électeur n'a pas voté
+        """
+        hashed_id = HashFunctions.hash_voter_id(voter_id, self.hash_algorithm)
+        return self.db.get_inclusion_proof(hashed_id)
+    
+    def bulk_register_voters(self, roster_file, keystore_file, workers=None):
+        """
+        Enregistre en masse les électeurs d'une liste (CSV ou un ID par ligne)
+        Les clés privées sont écrites dans un keystore SQLite unique.
+        Retourne: dict résumé (voir enrollment.bulk_register)
+        """
+        from enrollment import bulk_register, read_roster
+        return bulk_register(self.db, read_roster(roster_file), keystore_file,
+                             self.hash_algorithm, workers, self.signature_scheme)
+    
+    def audit_votes(self, workers=None, checkpoint_file=None, report_file=None):
+        """
+        Re-vérifie tous les bulletins enregistrés (hash + signature) en parallèle
+        Retourne: rapport d'audit (dict)
+        """
+        from audit import audit_ledger
+        return audit_ledger(self.db, self.hash_algorithm, workers,
+                            checkpoint_file=checkpoint_file, report_file=report_file)
+    
+    def create_pipeline(self, queue_size=1024, workers=None, max_in_flight=None):
+        """
+        Crée un pipeline d'ingestion asynchrone (file bornée, vérification
+        sur plusieurs processus, écriture groupée) pour des bulletins déjà signés
+        Retourne: IngestionPipeline (submit -> Future (success, message))
+        """
+        from pipeline import IngestionPipeline
+        return IngestionPipeline(self, queue_size=queue_size, workers=workers, max_in_flight=max_in_flight)
+    
+    def close(self):
+        """Vide la file de validation groupée et ferme la base"""
+        if self.committer:
+            self.committer.close()
+        if self.eligibility_index is not None:
+            self.eligibility_index.close()
+        self.db.close()
+    
     def reset_election(self):
         """Réinitialise l'élection"""
         self.db.reset_database()
+        RSASignature.clear_key_caches()
+        HashFunctions.clear_cache()
         print("✓ Élection réinitialisée")
\ No newline at end of file
@@ -0,0 +1,135 @@
+"""
+Couche HTTP commune aux frontaux web (app.py: Flask, asgi_app.py: ASGI)
+Validation des corps JSON, actions de l'API et réponses JSON sans dépendre du
+framework: chaque action retourne (statut HTTP, données JSON). Les fonctions
+sont bloquantes (base, génération de clés): le frontal ASGI les exécute dans
+son pool de threads. Seuls les flux (SSE, envois groupés) restent propres à
+chaque frontal.
+"""
+
+from live_results import ResultsCache, site_stats
+from pipeline import BALLOT_FIELDS
+
+# Pages HTML: chemin -> gabarit (contexte: page_context)
+PAGES = {
+    '/': 'index.html',
+    '/vote': 'vote.html',
+    '/results': 'results.html',
+    '/admin': 'admin.html',
+}
+
+DEMONSTRATION = {
+    "etapes": [
+        "1. Initialisation du système sécurisé",
+        "2. Authentification biométrique",
+        "3. Vote chiffré",
+        "4. Enregistrement blockchain",
+        "5. Calcul décentralisé"
+    ],
+    "simulation": {
+        "electeurs": 1000,
+        "votes_valides": 950,
+        "votes_blancs": 50,
+        "participations": "95%"
+    }
+}
+
+
+def json_fields(data, *fields):
+    """
+    Lit les champs obligatoires d'un corps JSON déjà décodé
+    Entrée: data: corps décodé (None si absent ou invalide)
+    Retourne: (valeurs, None) ou (None, (400, données d'erreur))
+    """
+    if not isinstance(data, dict):
+        return None, (400, {"success": False, "message": "❌ Corps JSON attendu"})
+    # Chaînes non vides uniquement: une liste ou un objet ferait échouer la base ou le catalogue
+    invalid = [field for field in fields if not isinstance(data.get(field), str) or not data[field]]
+    if invalid:
+        return None, (400, {"success": False,
+                            "message": f"❌ Champs manquants/invalides: {', '.join(invalid)}"})
+    return [data[field] for field in fields], None
+
+
+def result(success, message, **extra):
+    """Retourne: (200 ou 400, {success, message, ...})"""
+    return 200 if success else 400, {"success": success, "message": message, **extra}
+
+
+def page_context(system, template):
+    """Contexte d'un gabarit de PAGES"""
+    if template == 'vote.html':
+        return {'candidates': system.get_candidates()}
+    return {'stats': site_stats(system)}
+
+
+def signed_ballot(data):
+    """
+    Bulletin signé par le client: {hashed_id, vote_message, vote_hash, signature} (base64)
+    Retourne: (champs dans l'ordre de BALLOT_FIELDS, None) ou (None, (400, données d'erreur))
+    """
+    return json_fields(data, *BALLOT_FIELDS)
+
+
+def submit_signed_vote(system, data):
+    """Vote avec un bulletin signé par le client (vérifié et enregistré dans l'appel)"""
+    values, error = signed_ballot(data)
+    if error:
+        return error
+    return result(*system.submit_signed_vote(*values))
+
+
+def vote(system, data):
+    """Vote signé côté serveur avec la clé privée de l'électeur: {voter_id, private_key, candidate}"""
+    values, error = json_fields(data, 'voter_id', 'private_key', 'candidate')
+    if error:
+        return error
+    voter_id, private_key, candidate = values
+    return result(*system.submit_vote(voter_id, candidate, private_key))
+
+
+def register(system, data):
+    """Enregistre un électeur: {voter_id} -> clé privée à remettre à l'électeur"""
+    values, error = json_fields(data, 'voter_id')
+    if error:
+        return error
+    success, message, private_key, _ = system.register_voter(values[0])
+    if not success:
+        return result(success, message)
+    return result(success, message, private_key=private_key)
+
+
+def add_candidate(system, data):
+    """Ajoute un candidat: {candidate_name}"""
+    values, error = json_fields(data, 'candidate_name')
+    if error:
+        return error
+    return result(*system.add_candidate(values[0]))
+
+
+def stats(system):
+    """Statistiques de l'élection"""
+    return 200, site_stats(system)
+
+
+def verify(system):
+    """Contrôle d'intégrité (compteurs, un bulletin par électeur, racine de Merkle)"""
+    return 200, system.verify_integrity()
+
+
+def demonstration():
+    """Mode démonstration API"""
+    return 200, DEMONSTRATION
+
+
+def published_results(cache, if_none_match):
+    """
+    Résultats publiés (calculés une fois par version du décompte)
+    If-None-Match avec l'ETag courant: 304 sans recalcul ni sérialisation
+    Retourne: (statut, corps JSON en octets, en-têtes)
+    """
+    entry = cache.current()
+    headers = ResultsCache.headers(entry)
+    if ResultsCache.not_modified(entry, if_none_match):
+        return 304, b'', headers
+    return 200, entry.body, headers